@@ -5,6 +5,7 @@
 # ╚═════════════════════════════════════════════════════════════╝
 # Python Cross-Platform Edition by jackb898
 
+import asyncio
 import os
 import sys
 import shutil
@@ -26,6 +27,26 @@ except ImportError:
     def colored(text, *args, **kwargs):
         return text
 
+# Compact hostname set from the REK tree (one directory up); permutation
+# merges can run into millions of names.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+try:
+    from rek_hostset import HostnameSet
+except ImportError:
+    class HostnameSet(set):
+        """Plain-set stand-in when rek_hostset.py is not available."""
+        def __iter__(self):
+            return iter(sorted(set.__iter__(self)))
+
+# In-process permutation engine and async resolver (need dnspython).
+try:
+    from rek_dns import AsyncDNSResolver
+    from rek_dns_cache import open_cache
+    from rek_permutations import extract_tokens, unique_permutations, resolve_permutations
+    _NATIVE_PERMUTATIONS = True
+except ImportError:
+    _NATIVE_PERMUTATIONS = False
+
 # ─────────────────────────────────────────────
 # Global state
 # ─────────────────────────────────────────────
@@ -134,7 +155,9 @@ def run_piped(cmds, cwd=None):
 
 
 def write_lines(path, lines):
-    Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    with open(path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(f"{line}\n")
 
 
 def read_lines(path) -> list:
@@ -144,6 +167,18 @@ def read_lines(path) -> list:
     return [l.strip() for l in p.read_text(encoding="utf-8").splitlines() if l.strip()]
 
 
+def iter_lines(path):
+    """Stream the non-empty stripped lines of a file without loading it whole."""
+    p = Path(path)
+    if not p.exists():
+        return
+    with open(p, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
 def count_lines(path) -> int:
     return len(read_lines(path))
 
@@ -496,14 +531,13 @@ def subdomain_enumeration():
 
     # Consolidate
     print(colored("[*] Consolidating and deduplicating results...", "yellow"))
-    all_subs = set()
+    all_subs = HostnameSet()
     for txt in subs_dir.glob("*.txt"):
-        all_subs.update(read_lines(txt))
+        all_subs.update(iter_lines(txt))
 
-    sorted_subs = sorted(all_subs)
-    write_lines(subs_dir / "sorted-subdomains.txt", sorted_subs)
+    write_lines(subs_dir / "sorted-subdomains.txt", all_subs)
 
-    print(colored(f"[+] Subdomain enumeration completed. Found {len(sorted_subs)} unique subdomains", "green"))
+    print(colored(f"[+] Subdomain enumeration completed. Found {len(all_subs)} unique subdomains", "green"))
 
 
 # ─────────────────────────────────────────────
@@ -516,106 +550,36 @@ def subdomain_permutation():
     sorted_subs = read_lines(sorted_file)
 
     # Build perms wordlist (split on dots and hyphens)
-    perms = set()
-    for sub in sorted_subs:
-        for part in re.split(r'[.\-]', sub):
-            if part:
-                perms.add(part)
-    write_lines(subs_dir / "perm", sorted(perms))
-
-    print(colored("[*] Running dnsgen...", "yellow"))
-    out = run_piped([
-        [sys.executable, "-m", "dnsgen", "-"],
-    ])
-    # dnsgen reads from stdin so feed it via Popen
-    merged_env = os.environ.copy()
-    merged_env["PATH"] = os.pathsep.join([str(TOOLS_DIR), str(Path.home() / "go" / "bin"), merged_env.get("PATH","")])
-    p = subprocess.Popen(
-        [sys.executable, "-m", "dnsgen", "-"],
-        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-        stderr=subprocess.DEVNULL, env=merged_env
-    )
-    dnsgen_out, _ = p.communicate(input="\n".join(sorted_subs).encode())
-    (subs_dir / "output-dnsgen.txt").write_bytes(dnsgen_out)
-
-    print(colored("[*] Running goaltdns...", "yellow"))
-    if command_exists("goaltdns"):
-        run(["goaltdns",
-             "-w", str(subs_dir / "perm"),
-             "-l", str(sorted_file),
-             "-o", str(subs_dir / "output-goaltdns.txt")])
+    if _NATIVE_PERMUTATIONS:
+        perms = extract_tokens(sorted_subs, TARGET_DOMAIN)
     else:
-        print(colored("[!] goaltdns not found, skipping...", "red"))
-
-    print(colored("[*] Running gotator...", "yellow"))
-
-    if command_exists("gotator"):
-        merged_env2 = os.environ.copy()
-        merged_env2["PATH"] = os.pathsep.join([
-            str(TOOLS_DIR),
-            str(Path.home() / "go" / "bin"),
-            merged_env2.get("PATH", "")
-        ])
-
-        output_path = subs_dir / "output-gotator.txt"
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            subprocess.run(
-                ["gotator",
-                "-sub", str(sorted_file),
-                "-perm", str(subs_dir / "perm"),
-                "-depth", "1",
-                "-numbers", "1"],
-                stdout=f,
-                stderr=subprocess.DEVNULL,
-                env=merged_env2,
-                timeout=300
-            )
+        perms = set()
+        for sub in sorted_subs:
+            for part in re.split(r'[.\-]', sub):
+                if part:
+                    perms.add(part)
+    write_lines(subs_dir / "perm", sorted(perms))
 
+    # Permutations are generated lazily, deduplicated with a Bloom filter and
+    # resolved as they are produced; only resolved names reach the disk.
+    if _NATIVE_PERMUTATIONS:
+        print(colored(f"[*] Generating and resolving permutations from {len(perms)} tokens...", "yellow"))
+        resolver = AsyncDNSResolver.from_files(resolvers_file=str(RESOLVERS_FILE), cache=open_cache())
+        candidates = unique_permutations(sorted_subs, TARGET_DOMAIN, perms)
+        with open(subs_dir / "subdomains-permutated.txt", "w", encoding="utf-8") as out:
+            resolved = asyncio.run(resolve_permutations(TARGET_DOMAIN, candidates, resolver, out, silent=True))
+        print(colored(f"[*] {len(resolved)} permutations resolved "
+                      f"({resolver.stats['queries']} DNS queries)", "yellow"))
     else:
-        print(colored("[!] gotator not found, skipping...", "red"))
-
-    print(colored("[*] Running ripgen...", "yellow"))
-    if command_exists("ripgen"):
-        merged_env3 = os.environ.copy()
-        merged_env3["PATH"] = os.pathsep.join([str(TOOLS_DIR), str(Path.home() / "go" / "bin"), merged_env3.get("PATH","")])
-        p2 = subprocess.Popen(
-            ["ripgen"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL, env=merged_env3
-        )
-        ripgen_out, _ = p2.communicate(input="\n".join(sorted_subs).encode())
-        (subs_dir / "output-ripgen.txt").write_bytes(ripgen_out)
-    else:
-        print(colored("[!] ripgen not found, skipping...", "red"))
-
-    # Merge permutation outputs
-    print(colored("[*] Merging permutation results...", "yellow"))
-    merged = set()
-    for txt in subs_dir.glob("output*.txt"):
-        merged.update(read_lines(txt))
-    write_lines(subs_dir / "output.txt", sorted(merged))
-
-    # Resolve with puredns
-    print(colored("[*] Resolving permutated subdomains...", "yellow"))
-    if command_exists("puredns"):
-        merged_env4 = os.environ.copy()
-        merged_env4["PATH"] = os.pathsep.join([str(TOOLS_DIR), str(Path.home() / "go" / "bin"), merged_env4.get("PATH","")])
-        p3 = subprocess.Popen(
-            ["puredns", "resolve", "--resolvers", str(RESOLVERS_FILE),
-             "--write", str(subs_dir / "subdomains-permutated.txt")],
-            stdin=subprocess.PIPE, stderr=subprocess.DEVNULL, env=merged_env4
-        )
-        p3.communicate(input="\n".join(sorted(merged)).encode())
-    else:
-        print(colored("[!] puredns not found, skipping resolution...", "red"))
+        print(colored("[!] REK DNS modules not available (pip install dnspython), skipping permutations...", "red"))
 
     # Final merge
     print(colored("[*] Merging all subdomains...", "yellow"))
-    final = set(sorted_subs)
+    final = HostnameSet(sorted_subs)
     perm_file = subs_dir / "subdomains-permutated.txt"
     if perm_file.exists():
-        final.update(read_lines(perm_file))
-    write_lines(subs_dir / "final-subdomains.txt", sorted(final))
+        final.update(iter_lines(perm_file))
+    write_lines(subs_dir / "final-subdomains.txt", final)
 
     print(colored(f"[+] Subdomain permutation completed. Found {len(final)} total unique subdomains", "green"))
 
@@ -4,7 +4,6 @@
 import warnings
 from urllib3.exceptions import NotOpenSSLWarning
 warnings.filterwarnings("ignore", category=NotOpenSSLWarning)
-import dns.resolver
 import httpx
 import asyncio
 import argparse
@@ -12,21 +11,38 @@ import logging
 import pandas as pd
 import os
 import json
-from typing import List, Set, Dict
+import hashlib
+import itertools
+import html
+from collections import deque
+from typing import Deque, List, Set, Dict, Iterable, Iterator, Optional, Sequence, TextIO, Tuple
 from urllib.parse import urlparse
 import sys
 import time
 import re
 from termcolor import colored
 import requests
-from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import shlex
-import csv
 import threading
 from rek_email_search import EmailSearcher
 from rek_wordlist_generator import REKWordlistGenerator
+from rek_dns import (
+    AsyncDNSResolver, WildcardDetector, RESOLVERS_FILE, TRUSTED_RESOLVERS_FILE,
+    host_addresses, host_records_path, load_host_records
+)
+from rek_cluster import SAMPLE_BYTES, HostClusterer, clusters_path, drop_cluster_duplicates, representatives_path, text_features
+from rek_dns_cache import DNS_CACHE_FILE, open_cache
+from rek_http_meta import BODY_HASH_BYTES, HTTP_META_FILE, HTTPMetaStore, open_meta_store
+from rek_hostset import HostnameSet
+from rek_http import CACHEABLE, DEFAULT_USER_AGENT, create_client, disable_response_cache, enable_response_cache, set_http2_default
+from rek_parse import parse_body, parse_response, set_parse_workers, warm_workers
+from rek_passive import run_passive_sources
+from rek_results import HTTPResultWriter, ProbeJournal, external_sort_csv, jsonl_path
+from rek_scheduler import HostScheduler
+from rek_screenshots import ScreenshotPool
+from rek_soft404 import SoftNotFoundDetector
+from rek_tech import analyze_page, warm_ruleset
+from rek_wordlist import open_wordlist
 import subprocess
 import glob
 from tldextract import extract
@@ -100,27 +116,23 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 class SubdomainScanner:
-    def __init__(self, timeout: int = 30, wordlist_path: str = None, concurrency: int = 50, retries: int = 3, silent: bool = False):
+    def __init__(self, timeout: int = 30, wordlist_path: str = None, concurrency: int = 50, retries: int = 3, silent: bool = False,
+                 dns_concurrency: int = 1000, dns_timeout: float = 2.0, resolvers_file: str = RESOLVERS_FILE,
+                 trusted_resolvers_file: str = TRUSTED_RESOLVERS_FILE, dns_cache_file: str = DNS_CACHE_FILE):
         self.timeout = timeout
         self.wordlist_path = wordlist_path
         self.concurrency = concurrency
         self.retries = retries
         self.silent = silent
-        self.subdomains: Set[str] = set()
-        self.validated_subdomains: Set[str] = set()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"]
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        self.dns_concurrency = dns_concurrency
+        self.dns_timeout = dns_timeout
+        self.resolvers_file = resolvers_file
+        self.trusted_resolvers_file = trusted_resolvers_file
+        self.dns_cache_file = dns_cache_file
+        self.subdomains = HostnameSet()
+        self.validated_subdomains = HostnameSet()
+        self.wildcard_filtered = 0
+        self.host_records: Dict[str, Dict] = {}
         self.default_wordlist = [
             'www', 'api', 'app', 'blog', 'dev', 'staging', 'test', 'mail', 'admin', 'login', 'dashboard', 'secure',
             'portal', 'vpn', 'ftp', 'support', 'shop', 'store', 'news', 'events', 'forum', 'community', 'docs', 'help',
@@ -138,131 +150,145 @@ class SubdomainScanner:
             
         return parsed.netloc
 
-    def load_wordlist(self) -> List[str]:
-        """Load wordlist from file or use enhanced default."""
+    def load_wordlist(self) -> Sequence[str]:
+        """Load wordlist from file (memory-mapped, shared) or use enhanced default."""
         if self.wordlist_path:
             try:
-                with open(self.wordlist_path, 'r') as f:
-                    return [line.strip() for line in f if line.strip()]
+                return open_wordlist(self.wordlist_path)
             except Exception as e:
                 if not self.silent:
                     logger.error(colored(f"Error loading wordlist {self.wordlist_path}: {e}", "red"))
         return self.default_wordlist
 
-    def dns_dumpster(self, domain: str, max_retries: int = 3) -> None:
-        """Enumerate subdomains using DNS Dumpster with retry logic."""
-        try:
-            if not self.silent:
-                logger.info(colored("Querying DNS Dumpster...", "green"))
-            url = 'https://dnsdumpster.com/'
-            for attempt in range(max_retries):
-                try:
-                    res = self.session.get(url, headers=self.headers, timeout=self.timeout)
-                    res.raise_for_status()
-                    soup = BeautifulSoup(res.text, 'html.parser')
-                    csrf_input = soup.find('input', {'name': 'csrfmiddlewaretoken'}) or soup.find('input', {'name': '__csrf_token'})
-                    if not csrf_input:
-                        if not self.silent and attempt == max_retries - 1:
-                            logger.warning(colored("CSRF token not found on DNS Dumpster after retries", "yellow"))
-                        continue
-
-                    csrf_token = csrf_input.get('value')
-                    if not csrf_token:
-                        if not self.silent and attempt == max_retries - 1:
-                            logger.warning(colored("Empty CSRF token received after retries", "yellow"))
-                        continue
-
-                    data = {
-                        'csrfmiddlewaretoken': csrf_token,
-                        'targetip': domain,
-                        'user': 'free'
-                    }
-                    cookies = {'csrftoken': self.session.cookies.get('csrftoken', '')}
-                    res = self.session.post(url, data=data, headers=self.headers, cookies=cookies, timeout=self.timeout)
-                    res.raise_for_status()
-                    soup = BeautifulSoup(res.text, 'html.parser')
-
-                    for td in soup.find_all('td', class_='col-md-4') or soup.find_all('td', {'data-label': 'Domain'}):
-                        subdomain = td.text.strip().split('\n')[0]
-                        if subdomain.endswith(domain):
-                            self.subdomains.add(subdomain)
-                    if not self.silent:
-                        logger.info(colored(f"Found {len(self.subdomains)} subdomains via DNS Dumpster", "green"))
-                    break
-                except requests.exceptions.RequestException as e:
-                    if not self.silent and attempt == max_retries - 1:
-                        logger.error(colored(f"DNS Dumpster request failed after {max_retries} attempts: {e}", "red"))
-                    time.sleep(2 ** attempt)
-                except Exception as e:
-                    if not self.silent and attempt == max_retries - 1:
-                        logger.error(colored(f"DNS Dumpster parsing error after {max_retries} attempts: {e}", "red"))
-                    time.sleep(2 ** attempt)
-        except Exception as e:
-            if not self.silent:
-                logger.error(colored(f"Unexpected DNS Dumpster error: {e}", "red"))
-                
-
-    def fetch_cert_transparency(self, domain: str) -> None:
-        """Fetch subdomains from certificate transparency logs (e.g., crt.sh) with retry."""
-        try:
-            if not self.silent:
-                logger.info(colored("Querying crt.sh...", "green"))
-            url = f"https://crt.sh/?q={domain}&output=json"
-            for attempt in range(3):
-                try:
-                    res = self.session.get(url, headers=self.headers, timeout=self.timeout)
-                    res.raise_for_status()
-                    data = res.json()
-                    for entry in data:
-                        name = entry.get('name_value', '').strip()
-                        for line in name.split('\n'):
-                            if line.endswith(domain) and not line.startswith('*'):
-                                self.subdomains.add(line)
-                    if not self.silent:
-                        logger.info(colored(f"Fetched {len(self.subdomains)} subdomains from certificate transparency", "green"))
-                    time.sleep(1)
-                    break
-                except requests.exceptions.Timeout:
-                    if not self.silent and attempt == 2:
-                        logger.error(colored(f"crt.sh timed out after {self.timeout} seconds after 3 attempts", "red"))
-                    time.sleep(2 ** attempt)
-                except requests.exceptions.RequestException as e:
-                    if not self.silent and attempt == 2:
-                        logger.error(colored(f"crt.sh request failed after 3 attempts: {e}", "red"))
-                    time.sleep(2 ** attempt)
-                except ValueError as e:
-                    if not self.silent and attempt == 2:
-                        logger.error(colored(f"crt.sh JSON parsing error after 3 attempts: {e}", "red"))
-                    time.sleep(2 ** attempt)
-        except Exception as e:
+    async def gather_passive(self, domain: str) -> None:
+        """Query every registered passive source concurrently and merge the results."""
+        results = await run_passive_sources(domain, timeout=self.timeout, retries=self.retries, silent=self.silent)
+        for found in results.values():
+            self.subdomains.update(found)
+
+    def prepare_output_path(self, path: str) -> str:
+        """Create the parent directory of `path`, or anchor a bare filename in the cwd."""
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            return path
+        return os.path.join(os.getcwd(), path)
+
+    def iter_candidates(self, domain: str, wordlist: Iterable[str]) -> Iterator[str]:
+        """Yield each brute-force candidate once: passive names first, then the wordlist.
+
+        Wordlist names already yielded are tracked in a HostnameSet, so a
+        repeated entry is resolved and written only once.
+        """
+        yield from self.subdomains
+        yielded = HostnameSet()
+        for sub in wordlist:
+            name = f"{sub}.{domain}"
+            if name not in self.subdomains and name not in yielded:
+                yielded.add(name)
+                yield name
+
+    async def dns_brute_force(self, domain: str, wordlist: Iterable[str], resolver: AsyncDNSResolver = None,
+                              validated_file: TextIO = None, records_file: TextIO = None) -> int:
+        """Perform DNS brute-forcing with a wordlist asynchronously.
+
+        Names are pulled lazily from `wordlist` into a bounded queue served
+        by a fixed pool of workers, so memory stays flat however long the
+        wordlist is. Entries may be bare labels (``www``) or already-qualified
+        names (``www.example.com``). Hits that only exist because of a
+        wildcard record are dropped, except for names already reported by
+        passive sources. Validated names are appended to `validated_file` as
+        they resolve, and their A/AAAA/CNAME host records (see
+        AsyncDNSResolver.resolve_host) to `records_file` as JSON lines.
+        Passive names that do not resolve are recorded too, so later stages
+        can skip them. Returns the number of names checked.
+        """
+        if resolver is None:
+            resolver = AsyncDNSResolver.from_files(
+                self.resolvers_file,
+                self.trusted_resolvers_file,
+                max_in_flight=self.dns_concurrency,
+                query_timeout=self.dns_timeout,
+                retries=self.retries,
+                cache=open_cache(self.dns_cache_file)
+            )
             if not self.silent:
-                logger.error(colored(f"Unexpected crt.sh error: {e}", "red"))
-
-    async def dns_brute_force(self, domain: str, wordlist: List[str], semaphore: asyncio.Semaphore):
-        """Perform DNS brute-forcing with a wordlist asynchronously."""
-        resolver = dns.resolver.Resolver()
-        resolver.nameservers = ['8.8.8.8', '8.8.4.4', '1.1.1.1', '9.9.9.9']
-        resolver.timeout = self.timeout
-        resolver.lifetime = self.timeout
+                logger.info(colored(f"Resolving through {len(resolver.pool)} resolvers"
+                                    f"{f' with {len(resolver.trusted)} trusted verifiers' if resolver.trusted else ''}", "green"))
+        wildcards = WildcardDetector(resolver)
+        workers = max(1, resolver.max_in_flight)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        checked = 0
+
+        def record_host(record: Dict):
+            self.host_records[record['name']] = record
+            if records_file is not None:
+                records_file.write(json.dumps(record) + "\n")
+                records_file.flush()
 
         async def check_subdomain(subdomain: str):
-            async with semaphore:
-                target = f"{subdomain}.{domain}"
+            target = subdomain if subdomain == domain or subdomain.endswith(f".{domain}") else f"{subdomain}.{domain}"
+            result = await resolver.query(target, 'A')
+            if result['answers']:
+                if target not in self.subdomains and await wildcards.is_wildcard(target, result, domain):
+                    self.wildcard_filtered += 1
+                    return
+                if target in self.validated_subdomains:
+                    return
+                self.validated_subdomains.add(target)
+                if validated_file is not None:
+                    validated_file.write(f"{target}\n")
+                    validated_file.flush()
+                record_host(await resolver.resolve_host(target, a_result=result))
+                if not self.silent:
+                    logger.info(colored(f"Validated subdomain: {target} ({', '.join(result['answers'])})", "green"))
+            else:
+                if target in self.subdomains:
+                    record_host(await resolver.resolve_host(target, a_result=result))
+                if result['status'] == 'ERROR' and not self.silent:
+                    logger.error(colored(f"DNS query error for {target}", "red"))
+
+        async def worker():
+            while True:
+                subdomain = await queue.get()
                 try:
-                    answers = resolver.resolve(target, 'A')
-                    for rdata in answers:
-                        self.validated_subdomains.add(target)
-                        if not self.silent:
-                            logger.info(colored(f"Validated subdomain: {target} ({rdata})", "green"))
-                    await asyncio.sleep(0.1)
-                except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.Timeout):
-                    pass
+                    if subdomain is None:
+                        return
+                    await check_subdomain(subdomain)
                 except Exception as e:
                     if not self.silent:
-                        logger.error(colored(f"DNS query error for {target}: {e}", "red"))
+                        logger.error(colored(f"DNS worker error for {subdomain}: {e}", "red"))
+                finally:
+                    queue.task_done()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            for subdomain in wordlist:
+                await queue.put(subdomain)
+                checked += 1
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if resolver.cache is not None:
+                resolver.cache.flush()
 
-        tasks = [check_subdomain(subdomain) for subdomain in wordlist]
-        await asyncio.gather(*tasks)
+        if not self.silent:
+            if resolver.cache is not None:
+                logger.info(colored(f"DNS cache: {resolver.cache.stats['hits']} answers served from "
+                                    f"{resolver.cache.path}", "green"))
+            pool = resolver.pool.summary()
+            logger.info(colored(
+                f"DNS pool: {pool['active']}/{pool['total']} resolvers healthy, {pool['evicted']} evicted, "
+                f"{resolver.stats['rejected']} unverified answers discarded", "green"))
+            zones = wildcards.wildcard_zones()
+            if zones:
+                logger.info(colored(
+                    f"Wildcard DNS on {', '.join(f'*.{z}' for z in zones[:5])}{' ...' if len(zones) > 5 else ''}: "
+                    f"dropped {self.wildcard_filtered} wildcard hits", "yellow"))
+        return checked
 
     async def enumerate_subdomains(
         self,
@@ -285,66 +311,45 @@ class SubdomainScanner:
         )
         email_thread.start()
 
-        # Step 1: DNS Dumpster
-        self.dns_dumpster(domain)
-
-        # Step 2: Certificate Transparency
-        self.fetch_cert_transparency(domain)
-
-        # Step 3: Combine with default wordlist and save all subdomains to results.txt
-        wordlist = self.load_wordlist()
-        combined_subdomains = set(self.subdomains)
-        for sub in wordlist:
-            combined_subdomains.add(f"{sub}.{domain}")
+        # Step 1: Passive sources (DNS Dumpster, crt.sh, ...) run concurrently,
+        # each bounded by its own deadline
+        await self.gather_passive(domain)
 
+        # Step 2: Prepare output files. results.txt receives every candidate,
+        # _dns_validated.txt every confirmed name and _dns.jsonl the host
+        # records later stages reuse, all written as the pipeline runs
+        # rather than after it.
         unvalidated_output = output_file or "results.txt"
         if not unvalidated_output or not unvalidated_output.strip():
             unvalidated_output = "results.txt"
             if not self.silent:
                 logger.info(colored(f"No output file specified. Using default: {unvalidated_output}", "yellow"))
+        validated_output = "results_dns_validated.txt" if not output_file else f"{os.path.splitext(output_file)[0]}_dns_validated.txt"
 
-        try:
-            output_dir = os.path.dirname(unvalidated_output)
-            if output_dir:
-                os.makedirs(output_dir, exist_ok=True)
-            else:
-                unvalidated_output = os.path.join(os.getcwd(), unvalidated_output)
+        unvalidated_output = self.prepare_output_path(unvalidated_output)
+        validated_output = self.prepare_output_path(validated_output)
+        records_output = host_records_path(unvalidated_output)
 
-            with open(unvalidated_output, 'w') as f:
-                for subdomain in sorted(combined_subdomains):
-                    f.write(f"{subdomain}\n")
-            if not self.silent:
-                logger.info(colored(f"Saved {len(combined_subdomains)} unvalidated subdomains to {unvalidated_output}", "green"))
-        except Exception as e:
+        # Step 3: Stream candidates (passive results + wordlist) through DNS validation
+        wordlist = self.load_wordlist()
+        try:
+            with open(unvalidated_output, 'w') as unvalidated, open(validated_output, 'w') as validated, \
+                    open(records_output, 'w') as records:
+                def candidates() -> Iterator[str]:
+                    for name in self.iter_candidates(domain, wordlist):
+                        unvalidated.write(f"{name}\n")
+                        yield name
+
+                checked = await self.dns_brute_force(domain, candidates(), validated_file=validated, records_file=records)
+        except OSError as e:
             if not self.silent:
-                logger.error(colored(f"Error saving unvalidated subdomains to {unvalidated_output}: {e}", "red"))
+                logger.error(colored(f"Error writing subdomain results to {unvalidated_output} / {validated_output}: {e}", "red"))
             raise
 
-        # Step 4: DNS Brute-Forcing on combined wordlist
-        combined_wordlist = list(combined_subdomains)
         if not self.silent:
-            logger.info(colored(f"Using {len(combined_wordlist)} unique subdomains for DNS validation", "green"))
-        semaphore = asyncio.Semaphore(self.concurrency)
-        await self.dns_brute_force(domain, combined_wordlist, semaphore)
-
-        # Step 5: Save validated subdomains
-        validated_output = "results_dns_validated.txt" if not output_file else f"{os.path.splitext(output_file)[0]}_dns_validated.txt"
-        try:
-            output_dir = os.path.dirname(validated_output)
-            if output_dir:
-                os.makedirs(output_dir, exist_ok=True)
-            else:
-                validated_output = os.path.join(os.getcwd(), validated_output)
-
-            with open(validated_output, 'w') as f:
-                for subdomain in sorted(self.validated_subdomains):
-                    f.write(f"{subdomain}\n")
-            if not self.silent:
-                logger.info(colored(f"Saved {len(self.validated_subdomains)} validated subdomains to {validated_output}", "green"))
-        except Exception as e:
-            if not self.silent:
-                logger.error(colored(f"Error saving validated subdomains to {validated_output}: {e}", "red"))
-            raise
+            logger.info(colored(f"Saved {checked} unvalidated subdomains to {unvalidated_output}", "green"))
+            logger.info(colored(f"Saved {len(self.validated_subdomains)} validated subdomains to {validated_output}", "green"))
+            logger.info(colored(f"Saved {len(self.host_records)} host records to {records_output}", "green"))
 
         # Wait for email search to complete
         email_thread.join()
@@ -475,147 +480,377 @@ class LLMAssistant:
         raise ValueError("Unsupported provider. Use 'local' or 'remote'.")
 
 
+class TitleScanner:
+    """Incremental <title> extractor fed with raw body chunks.
+
+    Works on bytes so chunks may split tags or multi-byte characters; only a
+    short tail is kept while looking for the opening tag.
+    """
+    _OPEN = re.compile(rb'<title\b[^>]*>', re.I)
+    _CLOSE = re.compile(rb'</title\s*>', re.I)
+    _TAIL = 512
+    _MAX_TITLE = 4096
+
+    def __init__(self):
+        self._buffer = b''
+        self._in_title = False
+        self.title = None
+        self.done = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume a chunk; returns True once the title is complete."""
+        if self.done:
+            return True
+        self._buffer += chunk
+        if not self._in_title:
+            match = self._OPEN.search(self._buffer)
+            if not match:
+                self._buffer = self._buffer[-self._TAIL:]
+                return False
+            self._in_title = True
+            self._buffer = self._buffer[match.end():]
+        match = self._CLOSE.search(self._buffer)
+        if match:
+            self.title = self._buffer[:match.start()]
+            self.done = True
+        elif len(self._buffer) > self._MAX_TITLE:
+            self.title = self._buffer[:self._MAX_TITLE]
+            self.done = True
+        return self.done
+
+    def text(self, encoding: str = None) -> str:
+        """Decoded, unescaped title, or '' if none was found."""
+        if self.title is None:
+            return ''
+        try:
+            title = self.title.decode(encoding or 'utf-8', errors='replace')
+        except LookupError:
+            title = self.title.decode('utf-8', errors='replace')
+        return html.unescape(title).strip()
+
+
 class HTTPStatusChecker:
-    def __init__(self, timeout: int = 10, max_concurrent: int = 100, silent: bool = False):
+    PROBE_MODES = ('smart', 'both')
+
+    def __init__(self, timeout: int = 10, max_concurrent: int = 100, silent: bool = False, probe_mode: str = 'smart',
+                 max_body_bytes: int = 64 * 1024, sort_results: bool = True, jsonl_output: bool = False,
+                 resume: bool = False, per_host: int = 10, host_rate: float = 0.0,
+                 http_meta_file: str = HTTP_META_FILE, changed_only: bool = False, cluster: bool = False):
         self.timeout = timeout
         self.max_concurrent = max_concurrent
+        self.per_host = per_host
+        self.host_rate = host_rate
         self.client = None
         self.silent = silent
+        self.probe_mode = probe_mode if probe_mode in self.PROBE_MODES else 'smart'
+        self.max_body_bytes = max_body_bytes
+        self.sort_results = sort_results
+        self.jsonl_output = jsonl_output
+        self.resume = resume
+        self.http_meta_file = http_meta_file
+        self.changed_only = changed_only
+        self.cluster = cluster
+        self.meta_store = None
         self.default_input_file = "results.txt"
 
     async def initialize_client(self):
-        """Initialize the httpx AsyncClient."""
-        limits = httpx.Limits(max_connections=self.max_concurrent, max_keepalive_connections=10)
-        self.client = httpx.AsyncClient(
-            timeout=self.timeout,
-            limits=limits,
-            follow_redirects=True,
-            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        )
+        """Initialize the pooled httpx AsyncClient."""
+        self.client = create_client(self.max_concurrent, timeout=self.timeout, follow_redirects=True,
+                                    headers={'User-Agent': DEFAULT_USER_AGENT}, cache=True)
 
     async def close_client(self):
-        """Close the httpx AsyncClient."""
+        """Close the httpx AsyncClient and report connection reuse."""
         if self.client:
             await self.client.aclose()
+            if not self.silent and self.client.stats.requests:
+                logger.info(colored(f"HTTP pool: {self.client.stats.summary()}", "blue"))
+                if self.client.cache is not None:
+                    logger.info(colored(f"HTTP cache: {self.client.cache.summary()}", "blue"))
+
+    async def read_title(self, response: httpx.Response, digest=None, sample: bytearray = None) -> str:
+        """Stream at most `max_body_bytes` of the body looking for <title>.
+
+        Reading stops as soon as the title is complete; the rest of the
+        transfer is dropped when the response is closed. When `digest` (a
+        hashlib object) is given, exactly the first BODY_HASH_BYTES (or the
+        whole body, if shorter) are fed to it, and the first SAMPLE_BYTES are
+        collected into `sample`; reading goes on past the title until both are
+        complete, so neither depends on how the body was chunked.
+        """
+        scanner = TitleScanner()
+        received = 0
+        hashed = 0
+        done = False
+        async for chunk in response.aiter_bytes():
+            chunk = chunk[:self.max_body_bytes - received]
+            received += len(chunk)
+            if digest is not None and hashed < BODY_HASH_BYTES:
+                part = chunk[:BODY_HASH_BYTES - hashed]
+                digest.update(part)
+                hashed += len(part)
+            if sample is not None and len(sample) < SAMPLE_BYTES:
+                sample += chunk[:SAMPLE_BYTES - len(sample)]
+            done = done or scanner.feed(chunk)
+            complete = (done and (digest is None or hashed >= BODY_HASH_BYTES)
+                        and (sample is None or len(sample) >= SAMPLE_BYTES))
+            if complete or received >= self.max_body_bytes:
+                break
+        return scanner.text(response.charset_encoding) or 'No Title'
+
+    async def response_features(self, response: httpx.Response, sample: bytearray) -> Dict:
+        """Clustering fingerprint of a response from its body sample."""
+        length = response.headers.get('content-length', '')
+        length = int(length) if length.isdigit() else len(sample)
+        return await parse_body(text_features, bytes(sample), response.charset_encoding or 'utf-8',
+                                list(response.headers.keys()), length)
+
+    async def check_status(self, url: str, subdomain: str, scheduler: HostScheduler) -> Dict:
+        """Check the HTTP status of a single URL.
+
+        The response is streamed and only HTML 200 bodies are read, up to
+        `max_body_bytes`; a body that ends within that prefix seeds the
+        response cache for later root-page fetches. With a metadata store, the validators from the last
+        run are sent and a 304 reuses the stored title without a body; the
+        result's `change` is set to new/changed/unchanged/revalidated/failed.
+        """
+        previous = self.meta_store.get(url) if self.meta_store is not None else None
+        result = {
+            'subdomain': subdomain,
+            'url': url,
+            'status_code': None,
+            'title': None,
+            'server': None,
+            'error': None,
+            'final_url': None,
+            'connect_failed': False
+        }
+        headers = HTTPMetaStore.conditional_headers(previous)
+        try:
+            async with scheduler.slot(url) as slot, \
+                    self.client.stream('GET', url, headers=headers, extensions=CACHEABLE) as response:
+                slot.record(response)
+                if response.status_code == 304 and previous is not None:
+                    result.update(status_code=previous['status_code'], title=previous['title'],
+                                  server=response.headers.get('server', previous['server']),
+                                  final_url=previous['final_url'], revalidated=True)
+                else:
+                    result['status_code'] = response.status_code
+                    result['server'] = response.headers.get('server', 'Unknown')
+                    result['final_url'] = str(response.url)
+                    result['etag'] = response.headers.get('etag')
+                    result['last_modified'] = response.headers.get('last-modified')
+
+                    if 'text/html' in response.headers.get('content-type', ''):
+                        sample = bytearray() if self.cluster else None
+                        if response.status_code == 200:
+                            digest = hashlib.sha1()
+                            result['title'] = await self.read_title(response, digest, sample)
+                            result['body_hash'] = digest.hexdigest()
+                        elif sample is not None:
+                            await self.read_title(response, sample=sample)
+                        if sample is not None:
+                            result['features'] = await self.response_features(response, sample)
 
-    async def check_status(self, url: str, subdomain: str, semaphore: asyncio.Semaphore) -> Dict:
-        """Check the HTTP status of a single URL."""
-        async with semaphore:
-            result = {
-                'subdomain': subdomain,
-                'url': url,
-                'status_code': None,
-                'title': None,
-                'server': None,
-                'error': None
-            }
+            if not self.silent:
+                color = "green" if result['status_code'] == 200 else "cyan" if result['status_code'] in [301, 302] else "yellow" if result['status_code'] == 403 else "red"
+                suffix = " (not modified)" if result.get('revalidated') else ""
+                logger.info(colored(f"{url}: {result['status_code']}{suffix}", color))
+        except httpx.TimeoutException as e:
+            result['error'] = f'Timeout: {str(e)}'
+            result['connect_failed'] = isinstance(e, httpx.ConnectTimeout)
+            if not self.silent:
+                logger.warning(colored(f"{url}: Timeout - {str(e)}", "yellow"))
+        except httpx.ConnectError as e:
+            # Also raised for TLS handshake failures.
+            result['error'] = f'Connection Failed: {str(e)}'
+            result['connect_failed'] = True
+            if not self.silent:
+                logger.warning(colored(f"{url}: Connection Failed - {str(e)}", "yellow"))
+        except httpx.HTTPStatusError as e:
+            result['status_code'] = e.response.status_code if hasattr(e.response, 'status_code') else None
+            result['error'] = f'HTTP Status Error: {str(e)}'
+            if not self.silent:
+                color = "green" if result['status_code'] == 200 else "cyan" if result['status_code'] in [301, 302] else "yellow" if result['status_code'] == 403 else "red"
+                logger.warning(colored(f"{url}: HTTP Status Error - {result['status_code'] or 'Unknown'}", color))
+        except Exception as e:
+            result['error'] = f'Unexpected Error: {str(e)}'
+            if not self.silent:
+                logger.error(colored(f"{url}: Unexpected Error - {str(e)}", "red"))
+        if self.meta_store is not None:
+            result['change'] = self.meta_store.update(result, previous)
+        return result
+
+    async def probe_host(self, host: str, subdomain: str, scheduler: HostScheduler) -> List[Dict]:
+        """Probe one host according to `probe_mode`.
+
+        smart: HTTPS first, HTTP only if HTTPS could not connect (refused,
+        connect timeout or TLS failure). both: probe both schemes, but drop
+        the HTTP result when it was redirected to the same final URL and
+        status as the HTTPS one.
+        """
+        if self.probe_mode == 'both':
+            https, http = await asyncio.gather(
+                self.check_status(f"https://{host}", subdomain, scheduler),
+                self.check_status(f"http://{host}", subdomain, scheduler)
+            )
+            if (https['final_url'] and https['final_url'] == http['final_url']
+                    and https['status_code'] == http['status_code']):
+                return [https]
+            return [https, http]
+
+        https = await self.check_status(f"https://{host}", subdomain, scheduler)
+        if not https['connect_failed']:
+            return [https]
+        http = await self.check_status(f"http://{host}", subdomain, scheduler)
+        if http['status_code'] is not None:
+            return [http]
+        return [https, http]
+
+    def unresolved_results(self, url: str, subdomain: str, record: Dict) -> List[Dict]:
+        """Results for a host whose DNS record has no addresses, without connecting."""
+        return [{
+            'subdomain': subdomain,
+            'url': f"{scheme}://{url}",
+            'status_code': None,
+            'title': None,
+            'server': None,
+            'error': f"DNS: {record['status']}"
+        } for scheme in ('https', 'http')]
+
+    def validate_result(self, result) -> Dict:
+        """Return `result` with a numeric status code, or None if it is malformed."""
+        if not isinstance(result, dict):
+            if not self.silent:
+                logger.warning(colored(f"Unexpected result type: {type(result)}", "yellow"))
+            return None
+        required_keys = {'subdomain', 'url', 'status_code', 'title', 'server', 'error'}
+        if not all(key in result for key in required_keys):
+            if not self.silent:
+                logger.warning(colored(f"Invalid result format for URL {result.get('url', 'unknown')}: {result}", "yellow"))
+            return None
+        if result['status_code'] is not None:
             try:
-                response = await self.client.get(url)
-                result['status_code'] = response.status_code
-                result['server'] = response.headers.get('server', 'Unknown')
-
-                if 'text/html' in response.headers.get('content-type', '') and response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    title = soup.find('title')
-                    result['title'] = title.text.strip() if title and title.text.strip() else 'No Title'
-
-                if not self.silent:
-                    color = "green" if result['status_code'] == 200 else "cyan" if result['status_code'] in [301, 302] else "yellow" if result['status_code'] == 403 else "red"
-                    logger.info(colored(f"{url}: {result['status_code']}", color))
-            except httpx.TimeoutException as e:
-                result['error'] = f'Timeout: {str(e)}'
-                if not self.silent:
-                    logger.warning(colored(f"{url}: Timeout - {str(e)}", "yellow"))
-            except httpx.ConnectError as e:
-                result['error'] = f'Connection Failed: {str(e)}'
+                result['status_code'] = int(result['status_code'])
+            except (ValueError, TypeError):
                 if not self.silent:
-                    logger.warning(colored(f"{url}: Connection Failed - {str(e)}", "yellow"))
-            except httpx.HTTPStatusError as e:
-                result['status_code'] = e.response.status_code if hasattr(e.response, 'status_code') else None
-                result['error'] = f'HTTP Status Error: {str(e)}'
-                if not self.silent:
-                    color = "green" if result['status_code'] == 200 else "cyan" if result['status_code'] in [301, 302] else "yellow" if result['status_code'] == 403 else "red"
-                    logger.warning(colored(f"{url}: HTTP Status Error - {result['status_code'] or 'Unknown'}", color))
-            except Exception as e:
-                result['error'] = f'Unexpected Error: {str(e)}'
-                if not self.silent:
-                    logger.error(colored(f"{url}: Unexpected Error - {str(e)}", "red"))
-            return result
-
-    async def check_all_urls(self, urls: List[str], output_file: str):
-        """Check HTTP status for all URLs."""
+                    logger.warning(colored(f"Non-numeric status code for URL {result['url']}: {result['status_code']}", "yellow"))
+                result['status_code'] = None
+        return result
+
+    async def _probe_entry(self, url: str, subdomain: str, scheduler: HostScheduler):
+        """`probe_host` tagged with the input entry, for journaling."""
+        return url, await self.probe_host(url, subdomain, scheduler)
+
+    async def check_all_urls(self, urls: List[str], output_file: str, host_records: Dict[str, Dict] = None,
+                             input_file: str = None):
+        """Check HTTP status for all URLs.
+
+        `host_records` (name -> record from the subdomain scan) lets hosts
+        already known not to resolve be reported without a connection attempt.
+        Results are written as each host completes and the CSV is sorted by
+        subdomain afterwards unless `sort_results` is off. Completed hosts are
+        journaled; with `resume` a matching journal is loaded, its hosts are
+        skipped and new results are appended to the existing output. With
+        `changed_only`, only results that are new or differ from the last run
+        recorded in the metadata store are written. With `cluster`, live
+        results are grouped by response similarity and the cluster table and
+        representative list are saved next to the output.
+        """
+        host_records = host_records or {}
+        output_dir = os.path.dirname(output_file)
+        if not output_dir:
+            output_file = os.path.join(os.getcwd(), output_file)
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+        journal = ProbeJournal(output_file, input_file, resume=self.resume)
+        if journal.resumed and not self.silent:
+            logger.info(colored(f"Resuming: {len(journal)} hosts already checked, appending to {output_file}", "green"))
+        completed = False
+        self.meta_store = open_meta_store(self.http_meta_file)
         await self.initialize_client()
         try:
-            semaphore = asyncio.Semaphore(self.max_concurrent)
-            results = []
+            scheduler = HostScheduler(self.max_concurrent, self.per_host, self.host_rate)
+            clusterer = HostClusterer() if self.cluster else None
             tasks = []
+            skipped = []
             for url in urls:
                 if not url:
                     if not self.silent:
                         logger.warning(colored("Skipping empty URL", "yellow"))
                     continue
+                if url in journal:
+                    continue
                 subdomain = urlparse(url).netloc if urlparse(url).netloc else url
-                tasks.append(self.check_status(f"https://{url}", subdomain, semaphore))
-                tasks.append(self.check_status(f"http://{url}", subdomain, semaphore))
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            valid_results = []
-            for result in results:
-                if isinstance(result, dict):
-                    required_keys = {'subdomain', 'url', 'status_code', 'title', 'server', 'error'}
-                    if not all(key in result for key in required_keys):
-                        if not self.silent:
-                            logger.warning(colored(f"Invalid result format for URL {result.get('url', 'unknown')}: {result}", "yellow"))
-                        continue
-                    if result['status_code'] is not None:
-                        try:
-                            result['status_code'] = int(result['status_code'])
-                        except (ValueError, TypeError):
-                            if not self.silent:
-                                logger.warning(colored(f"Non-numeric status code for URL {result['url']}: {result['status_code']}", "yellow"))
-                            result['status_code'] = None
-                    valid_results.append(result)
-                else:
-                    if not self.silent:
-                        logger.warning(colored(f"Unexpected result type: {type(result)}", "yellow"))
+                record = host_records.get(subdomain)
+                if record is not None and not host_addresses(record):
+                    skipped.append((url, self.unresolved_results(url, subdomain, record)))
+                    continue
+                tasks.append(self._probe_entry(url, subdomain, scheduler))
 
-            if not self.silent:
-                logger.info(colored(f"Completed checking {len(urls)} URLs", "green"))
+            if skipped and not self.silent:
+                logger.info(colored(f"Skipping {len(skipped)} hosts without DNS records", "yellow"))
 
+            jsonl_file = jsonl_path(output_file) if self.jsonl_output else None
             try:
-                output_dir = os.path.dirname(output_file)
-                if output_dir:
-                    os.makedirs(output_dir, exist_ok=True)
-                else:
-                    output_file = os.path.join(os.getcwd(), output_file)
-
-                with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, escapechar='\\')
-                    writer.writerow(["Subdomain", "URL", "Status Code", "Title", "Server", "Error"])
-                    for result in sorted(valid_results, key=lambda x: x['subdomain']):
-                        writer.writerow([
-                            result['subdomain'] or '',
-                            result['url'] or '',
-                            result['status_code'] if result['status_code'] is not None else '',
-                            result['title'] or '',
-                            result['server'] or '',
-                            result['error'] or ''
-                        ])
-                if not self.silent:
-                    logger.info(colored(f"Saved {len(valid_results)} results to {output_file}", "green"))
+                with HTTPResultWriter(output_file, jsonl_file, append=journal.resumed) as writer:
+                    for url, rows in skipped:
+                        if not self.changed_only:
+                            for result in rows:
+                                writer.write(result)
+                        journal.record(url)
+                    for future in asyncio.as_completed(tasks):
+                        try:
+                            url, outcome = await future
+                        except Exception as e:
+                            url, outcome = None, e
+                        for result in outcome if isinstance(outcome, list) else [outcome]:
+                            result = self.validate_result(result)
+                            if result is None:
+                                continue
+                            if self.is_reported(result):
+                                writer.write(result)
+                            if clusterer is not None and result['status_code'] is not None:
+                                clusterer.add(result)
+                        if url is not None:
+                            journal.record(url)
 
-                df = pd.read_csv(output_file, encoding='utf-8', dtype_backend='numpy_nullable')
-                non_numeric = df['Status Code'][df['Status Code'].notna() & ~df['Status Code'].astype(str).str.isnumeric()]
-                if not non_numeric.empty:
+                if not self.silent:
+                    logger.info(colored(f"Completed checking {len(urls)} URLs", "green"))
+                    if scheduler.throttled or scheduler.timeouts:
+                        logger.info(colored(f"Host scheduler: {scheduler.summary()}", "blue"))
+                    if self.meta_store is not None:
+                        logger.info(colored(f"Since last run: {self.meta_store.summary()}", "blue"))
+                if self.sort_results:
+                    external_sort_csv(output_file, "Subdomain")
+                if clusterer is not None:
+                    clusterer.save(output_file)
                     if not self.silent:
-                        logger.warning(colored(f"Non-numeric values found in 'Status Code' column after writing: {non_numeric.tolist()}", "yellow"))
+                        logger.info(colored(f"Clustered {len(clusterer.clusters) + clusterer.duplicates()} live results "
+                                            f"into {len(clusterer.clusters)} clusters ({clusterer.duplicates()} duplicates); "
+                                            f"see {clusters_path(output_file)} and {representatives_path(output_file)}", "green"))
+                completed = True
+                if not self.silent:
+                    logger.info(colored(f"Saved {writer.count} results to {output_file}", "green"))
+                    if jsonl_file:
+                        logger.info(colored(f"Saved JSONL results to {jsonl_file}", "green"))
             except Exception as e:
                 if not self.silent:
                     logger.error(colored(f"Error saving results to {output_file}: {e}", "red"))
                 raise
         finally:
+            if completed:
+                journal.finish()
+            else:
+                journal.close()
+            if self.meta_store is not None:
+                self.meta_store.close()
+                self.meta_store = None
             await self.close_client()
 
+    def is_reported(self, result: Dict) -> bool:
+        """Whether a result is written: everything, or only changes with `changed_only`."""
+        return not self.changed_only or result.get('change') in ('new', 'changed')
+
     def run(self, input_file: str, output_file: str):
         """Run the HTTP status checker."""
         input_file = input_file or self.default_input_file
@@ -640,19 +875,31 @@ class HTTPStatusChecker:
                 logger.warning(colored("No URLs to check", "yellow"))
             return
 
+        host_records = load_host_records(host_records_path(input_file))
+        if host_records and not self.silent:
+            logger.info(colored(f"Loaded {len(host_records)} host records from {host_records_path(input_file)}", "green"))
+
         if not self.silent:
             print(colored("Running HTTP Status Checking...", "green"))
-        asyncio.run(self.check_all_urls(urls, output_file))
+        asyncio.run(self.check_all_urls(urls, output_file, host_records, input_file))
         if not self.silent:
             print(colored("Finished HTTP Status Checking.", "green"))
 
 class DirectoryScanner:
-    def __init__(self, timeout: int = 10, max_concurrent: int = 50, max_depth: int = 5, silent: bool = False):
+    def __init__(self, timeout: int = 10, max_concurrent: int = 50, max_depth: int = 5, silent: bool = False,
+                 per_host: int = 10, host_rate: float = 0.0, cluster: bool = False, calibrate: bool = True,
+                 screenshot_workers: int = 2):
         self.timeout = timeout
         self.max_concurrent = max_concurrent
         self.max_depth = min(max_depth, 10)
+        self.cluster = cluster
+        self.calibrate = calibrate
+        self.soft404 = None
+        self.per_host = per_host
+        self.host_rate = host_rate
         self.results: Dict[str, List[Dict]] = {}
         self.client = None
+        self.scheduler = None
         self.global_wordlist_path = "global_wordlist.txt"
         self.global_wordlist: Set[str] = self.load_global_wordlist()
         self.default_wordlist = [
@@ -667,7 +914,8 @@ class DirectoryScanner:
         self.fallback_tech_wordlist = [
             'admin', 'login', 'api', '.env', 'config', 'static', 'media', 'uploads', 'robots.txt', 'sitemap.xml'
         ]
-        self.screenshot_driver = None
+        self.screenshot_workers = screenshot_workers
+        self.screenshots = None
         self.silent = silent
 
     def load_global_wordlist(self) -> Set[str]:
@@ -702,43 +950,18 @@ class DirectoryScanner:
                 logger.error(colored(f"Error saving global wordlist: {e}", "red"))
 
     async def initialize_client(self):
-        """Initialize the httpx AsyncClient."""
-        limits = httpx.Limits(max_connections=self.max_concurrent, max_keepalive_connections=10)
-        self.client = httpx.AsyncClient(
-            timeout=self.timeout,
-            limits=limits,
-            follow_redirects=True,
-            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        )
+        """Initialize the pooled httpx AsyncClient."""
+        self.client = create_client(self.max_concurrent, timeout=self.timeout, follow_redirects=True,
+                                    headers={'User-Agent': DEFAULT_USER_AGENT}, cache=True)
 
     async def close_client(self):
-        """Close the httpx AsyncClient."""
+        """Close the httpx AsyncClient and report connection reuse."""
         if self.client:
             await self.client.aclose()
-
-    def initialize_screenshot_driver(self):
-        """Initialize the Selenium WebDriver for screenshots."""
-        try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            self.screenshot_driver = webdriver.Chrome(options=chrome_options)
-            if not self.silent:
-                logger.info(colored("Initialized Selenium WebDriver", "green"))
-        except Exception as e:
-            if not self.silent:
-                logger.error(colored(f"Error initializing Selenium WebDriver: {e}", "red"))
-            self.screenshot_driver = None
-
-    def close_screenshot_driver(self):
-        """Close the Selenium WebDriver."""
-        if self.screenshot_driver:
-            self.screenshot_driver.quit()
-            if not self.silent:
-                logger.info(colored("Closed Selenium WebDriver", "green"))
+            if not self.silent and self.client.stats.requests:
+                logger.info(colored(f"HTTP pool: {self.client.stats.summary()}", "blue"))
+                if self.client.cache is not None:
+                    logger.info(colored(f"HTTP cache: {self.client.cache.summary()}", "blue"))
 
     def read_urls_by_status(self, input_file: str, status_codes: List[int]) -> List[str]:
         """Read URLs from CSV file filtered by status codes with improved error handling."""
@@ -810,33 +1033,39 @@ class DirectoryScanner:
                 logger.error(colored(f"Error reading input file {input_file}: {e}", "red"))
             return []
 
-    def load_wordlist(self, wordlist_path: str = None) -> List[str]:
-        """Load wordlist from file or use enhanced default."""
+    def load_wordlist(self, wordlist_path: str = None) -> Sequence[str]:
+        """Load wordlist from file (memory-mapped, shared) or use enhanced default."""
         if wordlist_path:
             try:
-                with open(wordlist_path, 'r') as f:
-                    return [line.strip() for line in f if line.strip()]
+                return open_wordlist(wordlist_path)
             except Exception as e:
                 if not self.silent:
                     logger.error(colored(f"Error loading wordlist {wordlist_path}: {e}", "red"))
         return self.default_wordlist
 
-    def detect_technologies(self, url: str) -> List[str]:
-        """Detect technologies and generate domain-specific wordlist."""
+    async def detect_technologies(self, url: str) -> List[str]:
+        """Detect technologies and generate domain-specific wordlist.
+
+        The page is fetched through the shared client and scheduler (a
+        response cached earlier in the run is reused), and Wappalyzer matching
+        always runs in the parse pool (or a thread when the pool is disabled)
+        against a ruleset loaded once per process.
+        """
         if not self.silent:
             logger.info(colored(f"Detecting technologies for {url}", "green"))
         wordlist = []
         try:
-            from Wappalyzer import Wappalyzer, WebPage
-            wappalyzer = Wappalyzer.latest()
-            # Fix: Remove headers parameter as it's not supported in newer versions
-            webpage = WebPage.new_from_url(url)
-            techs = wappalyzer.analyze_with_versions_and_categories(webpage)
+            response = await self.scheduler.request(self.client, 'GET', url, extensions=CACHEABLE)
+            techs = await parse_response(analyze_page, response, str(response.url), dict(response.headers),
+                                         offload=True)
             if not self.silent:
                 logger.info(colored(f"Detected technologies: {techs.keys()}", "green"))
 
             for tech, details in techs.items():
-                category = details.get('categories', [{}])[0].get('name', '').lower()
+                categories = details.get('categories') or ['']
+                # python-Wappalyzer returns category names; older releases returned dicts.
+                category = categories[0].get('name', '') if isinstance(categories[0], dict) else str(categories[0])
+                category = category.lower()
                 if 'wordpress' in tech.lower():
                     wordlist.extend(['wp-admin', 'wp-login.php', 'wp-content', 'wp-includes', 'xmlrpc.php', 'wp-config', 'wp-load.php'])
                 elif 'drupal' in tech.lower():
@@ -886,35 +1115,13 @@ class DirectoryScanner:
             if not self.silent:
                 logger.error(colored(f"Error saving domain wordlist for {domain}: {e}", "red"))
 
-    def take_screenshot(self, url: str, domain: str) -> str:
-        """Take a screenshot of the URL and save it with a filename based on the full URL path."""
-        if not self.screenshot_driver:
-            return "Selenium not initialized"
+    async def scan_directory(self, full_url: str, path: str, depth: int, directory: str = None) -> Optional[Dict]:
+        """Request a single directory path.
 
-        try:
-            screenshot_dir = f"results/{domain}/screenshots"
-            os.makedirs(screenshot_dir, exist_ok=True)
-            safe_filename = re.sub(r'[^\w\-._]', '_', url)
-            safe_filename = safe_filename.replace('http_', 'http')
-            safe_filename = safe_filename[:200] + '.png'
-            screenshot_path = os.path.join(screenshot_dir, safe_filename)
-
-            self.screenshot_driver.set_window_size(1920, 1080)
-            self.screenshot_driver.get(url)
-            time.sleep(1)
-            self.screenshot_driver.save_screenshot(screenshot_path)
-            if not self.silent:
-                logger.info(colored(f"Screenshot saved: {screenshot_path}", "green"))
-            return screenshot_path
-        except Exception as e:
-            if not self.silent:
-                logger.error(colored(f"Error taking screenshot for {url}: {e}", "red"))
-            return f"Error: {str(e)}"
-
-    async def scan_directory(self, url: str, path: str, depth: int) -> List[Dict]:
-        """Scan a single directory path and crawl if status is 200."""
-        full_url = f"{url.rstrip('/')}/{path.lstrip('/')}"
-        results = []
+        Returns its result, or None when the status is not worth reporting or
+        the response matches the not-found baseline of `directory` (the URL
+        `path` was appended to).
+        """
         result = {
             'url': full_url,
             'status_code': None,
@@ -924,48 +1131,101 @@ class DirectoryScanner:
             'depth': depth
         }
         try:
-            response = await self.client.get(full_url)
+            response = await self.scheduler.request(self.client, 'GET', full_url)
             result['status_code'] = response.status_code
             result['content_type'] = response.headers.get('content-type', 'Unknown')
 
-            if response.status_code in [200, 301, 302, 403]:
-                self.global_wordlist.add(path)
-                results.append(result)
-                if response.status_code == 200 and depth < self.max_depth:
-                    sub_results = await self.crawl_subdirectories(full_url, depth + 1)
-                    results.extend(sub_results)
-                    result['screenshot'] = self.take_screenshot(full_url, urlparse(url).netloc)
+            if response.status_code not in [200, 301, 302, 403]:
+                return None
+            if (self.soft404 is not None and directory is not None
+                    and await self.soft404.is_soft_404(directory, response, path)):
+                return None
+            self.global_wordlist.add(path)
+            if response.status_code == 200 and depth < self.max_depth and self.screenshots is not None:
+                self.screenshots.submit(result, str(response.url), hashlib.sha1(response.content).hexdigest())
         except httpx.TimeoutException as e:
             result['error'] = f'Timeout: {str(e)}'
-            results.append(result)
             if not self.silent:
                 logger.warning(colored(f"{full_url}: Timeout - {str(e)}", "yellow"))
         except httpx.ConnectError as e:
             result['error'] = f'Connection Failed: {str(e)}'
-            results.append(result)
             if not self.silent:
                 logger.warning(colored(f"{full_url}: Connection Failed - {str(e)}", "yellow"))
         except httpx.HTTPStatusError as e:
             result['status_code'] = e.response.status_code if hasattr(e.response, 'status_code') else None
             result['error'] = f'HTTP Status Error: {str(e)}'
-            results.append(result)
             if not self.silent:
                 color = "green" if result['status_code'] == 200 else "cyan" if result['status_code'] in [301, 302] else "yellow" if result['status_code'] == 403 else "red"
                 logger.warning(colored(f"{full_url}: HTTP Status Error - {result['status_code'] or 'Unknown'}", color))
         except Exception as e:
             result['error'] = f'Unexpected Error: {str(e)}'
-            results.append(result)
             if not self.silent:
                 logger.error(colored(f"{full_url}: Unexpected Error - {str(e)}", "red"))
 
-        return results
+        return result
+
+    async def crawl_subdirectories(self, url: str, paths: Iterable[str]) -> List[Dict]:
+        """Crawl `url`, requesting every path in `paths` at depth 1.
+
+        Each 200 queues the default wordlist beneath it until `max_depth`.
+        The crawl is served by `per_host` workers, as many as the scheduler
+        lets run against one host. Workers drain queued sub-paths first and
+        otherwise pull the next depth-1 path from `paths`, so a large lazy
+        wordlist is never materialized. `paths` must already be free of
+        duplicates; sub-paths already queued are never queued again. Hits
+        matching a directory's soft-404 baseline are dropped, so catch-all
+        directories are not recursed into.
+        """
+        paths = iter(paths)
+        deeper: Deque[Tuple[str, str, str, int]] = deque()
+        queued: Set[str] = set()
+        results: List[Dict] = []
+        crawled = 0
+        active = 0
+        progress = asyncio.Event()
+
+        def next_item() -> Optional[Tuple[str, str, str, int]]:
+            if deeper:
+                return deeper.popleft()
+            for path in paths:
+                return url, f"{url.rstrip('/')}/{path.lstrip('/')}", path, 1
+            return None
 
-    async def crawl_subdirectories(self, url: str, depth: int) -> List[Dict]:
-        """Recursively crawl subdirectories for status 200 responses."""
-        results = []
-        for path in self.default_wordlist:
-            sub_results = await self.scan_directory(url, path, depth)
-            results.extend(sub_results)
+        async def worker():
+            nonlocal active, crawled
+            while True:
+                item = next_item()
+                if item is None:
+                    if not active:
+                        progress.set()
+                        return
+                    # Another worker may still find a directory to recurse into.
+                    progress.clear()
+                    await progress.wait()
+                    continue
+                base, full_url, path, depth = item
+                active += 1
+                crawled += 1
+                try:
+                    result = await self.scan_directory(full_url, path, depth, base)
+                    if result is not None:
+                        results.append(result)
+                        if result['status_code'] == 200 and depth < self.max_depth:
+                            for sub_path in self.default_wordlist:
+                                sub_url = f"{full_url.rstrip('/')}/{sub_path.lstrip('/')}"
+                                if sub_url not in queued:
+                                    queued.add(sub_url)
+                                    deeper.append((full_url, sub_url, sub_path, depth + 1))
+                except Exception as e:
+                    if not self.silent:
+                        logger.error(colored(f"{full_url}: Crawl error - {e}", "red"))
+                finally:
+                    active -= 1
+                    progress.set()
+
+        await asyncio.gather(*(worker() for _ in range(max(1, self.per_host))))
+        if not self.silent:
+            logger.info(colored(f"Crawled {crawled} paths on {url}", "green"))
         return results
 
     def filter_deepest_paths(self, results: List[Dict]) -> List[Dict]:
@@ -989,8 +1249,12 @@ class DirectoryScanner:
 
         return list(path_map.values())
 
-    async def scan_url(self, url: str, wordlist: List[str], semaphore: asyncio.Semaphore):
-        """Scan a single URL with the provided wordlist."""
+    async def scan_url(self, url: str, wordlist: Sequence[str]):
+        """Scan a single URL with the provided wordlist.
+
+        Requests go through `self.scheduler`, which keeps each host under its
+        per-host limit.
+        """
         parsed_url = urlparse(url)
         if not parsed_url.scheme or not parsed_url.netloc:
             if not self.silent:
@@ -1001,36 +1265,46 @@ class DirectoryScanner:
         if domain not in self.results:
             self.results[domain] = []
 
-        async with semaphore:
-            if not self.silent:
-                logger.info(colored(f"Generating domain-specific wordlist for {domain}", "green"))
-            tech_wordlist = self.detect_technologies(url)
-            self.save_domain_wordlist(domain, tech_wordlist or self.fallback_tech_wordlist)
-            combined_wordlist = list(set(wordlist + tech_wordlist))
-            if not self.silent:
-                logger.info(colored(f"Using {len(combined_wordlist)} paths for {url}", "green"))
+        if not self.silent:
+            logger.info(colored(f"Generating domain-specific wordlist for {domain}", "green"))
+        tech_wordlist = await self.detect_technologies(url)
+        self.save_domain_wordlist(domain, tech_wordlist or self.fallback_tech_wordlist)
+        if not self.silent:
+            logger.info(colored(f"Using {len(wordlist)} wordlist + {len(tech_wordlist)} technology paths for {url}", "green"))
 
-            tasks = [self.scan_directory(url, path, depth=1) for path in combined_wordlist]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for result_list in results:
-                if isinstance(result_list, list):
-                    self.results[domain].extend(result_list)
+        # The wordlist is already deduplicated by its index; technology paths
+        # go first and are skipped when the wordlist repeats them.
+        tech_paths = list(dict.fromkeys(tech_wordlist))
+        seen = set(tech_paths)
+        paths = itertools.chain(tech_paths, (path for path in wordlist if path not in seen))
+        self.results[domain].extend(await self.crawl_subdirectories(url, paths))
 
-            self.results[domain] = self.filter_deepest_paths(self.results[domain])
+        self.results[domain] = self.filter_deepest_paths(self.results[domain])
 
-    async def scan_all_urls(self, urls: List[str], wordlist: List[str]):
+    async def scan_all_urls(self, urls: List[str], wordlist: Sequence[str]):
         """Scan all URLs with the provided wordlist."""
         await self.initialize_client()
-        self.initialize_screenshot_driver()
+        # Screenshots are queued to browser threads and trail the scan.
+        self.screenshots = ScreenshotPool(self.screenshot_workers, self.silent) if self.screenshot_workers > 0 else None
+        self.scheduler = HostScheduler(self.max_concurrent, self.per_host, self.host_rate)
+        self.soft404 = SoftNotFoundDetector(self.client, self.scheduler, self.silent) if self.calibrate else None
+        # Load the Wappalyzer ruleset in every parse worker while the first pages are fetched.
+        warmup = asyncio.ensure_future(warm_workers(warm_ruleset))
         try:
-            semaphore = asyncio.Semaphore(self.max_concurrent)
-            tasks = [self.scan_url(url, wordlist, semaphore) for url in urls]
+            tasks = [self.scan_url(url, wordlist) for url in urls]
             await asyncio.gather(*tasks)
             if not self.silent:
                 logger.info(colored(f"Completed scanning {len(urls)} URLs", "green"))
+                logger.info(colored(f"Host scheduler: {self.scheduler.summary()}", "blue"))
+                if self.soft404 is not None:
+                    logger.info(colored(f"Calibration: {self.soft404.summary()}", "blue"))
         finally:
+            await asyncio.gather(warmup, return_exceptions=True)
+            if self.screenshots is not None:
+                await self.screenshots.close()
+                if not self.silent:
+                    logger.info(colored(f"Screenshots: {self.screenshots.summary()}", "blue"))
             await self.close_client()
-            self.close_screenshot_driver()
             self.save_global_wordlist()
 
     def run(self, input_file: str = None, status_codes: List[int] = None, url: str = None, wordlist_path: str = None):
@@ -1040,6 +1314,8 @@ class DirectoryScanner:
 
         if status_codes and input_file:
             urls = self.read_urls_by_status(input_file, status_codes)
+            if self.cluster:
+                urls = drop_cluster_duplicates(urls, input_file, silent=self.silent)
         elif url:
             urls = [url]
         else:
@@ -1084,9 +1360,37 @@ class DirectoryScanner:
 class ReconTool:
     def __init__(self, args):
         self.args = args
-        self.subdomain_scanner = SubdomainScanner(args.timeout, args.subdomain_wordlist, args.concurrency, args.retries, args.silent)
-        self.http_checker = HTTPStatusChecker(args.timeout, args.concurrency, args.silent)
-        self.dir_scanner = DirectoryScanner(args.timeout, args.concurrency, args.depth, args.silent)
+        self.subdomain_scanner = SubdomainScanner(
+            args.timeout, args.subdomain_wordlist, args.concurrency, args.retries, args.silent,
+            dns_concurrency=getattr(args, 'dns_concurrency', 1000),
+            dns_timeout=getattr(args, 'dns_timeout', 2.0),
+            resolvers_file=getattr(args, 'resolvers', None) or RESOLVERS_FILE,
+            trusted_resolvers_file=getattr(args, 'trusted_resolvers', None) or TRUSTED_RESOLVERS_FILE,
+            dns_cache_file=None if getattr(args, 'no_dns_cache', False) else (getattr(args, 'dns_cache', None) or DNS_CACHE_FILE)
+        )
+        set_http2_default(getattr(args, 'http2', False))
+        set_parse_workers(getattr(args, 'parse_workers', None))
+        if getattr(args, 'no_response_cache', False):
+            disable_response_cache()
+        else:
+            enable_response_cache(max_bytes=getattr(args, 'response_cache_mb', 64) * 1024 * 1024)
+        self.http_checker = HTTPStatusChecker(args.timeout, args.concurrency, args.silent,
+                                              probe_mode=getattr(args, 'probe', 'smart'),
+                                              max_body_bytes=getattr(args, 'max_body_kb', 64) * 1024,
+                                              sort_results=not getattr(args, 'no_sort', False),
+                                              jsonl_output=getattr(args, 'jsonl', False),
+                                              resume=getattr(args, 'resume', False),
+                                              per_host=getattr(args, 'per_host', 10),
+                                              host_rate=getattr(args, 'host_rate', 0.0),
+                                              http_meta_file=None if getattr(args, 'no_http_meta', False) else (getattr(args, 'http_meta', None) or HTTP_META_FILE),
+                                              changed_only=getattr(args, 'changed_only', False),
+                                              cluster=getattr(args, 'cluster', False))
+        self.dir_scanner = DirectoryScanner(args.timeout, args.concurrency, args.depth, args.silent,
+                                            per_host=getattr(args, 'per_host', 10),
+                                            host_rate=getattr(args, 'host_rate', 0.0),
+                                            cluster=getattr(args, 'cluster', False),
+                                            calibrate=not getattr(args, 'no_calibration', False),
+                                            screenshot_workers=getattr(args, 'screenshot_workers', 2))
         self.email_searcher = EmailSearcher(args.timeout, args.silent)
         self.wordlist_generator = WordlistGeneratorWrapper(args.silent)
         self.llm_assistant = LLMAssistant(args.silent, args.timeout)
@@ -1610,9 +1914,37 @@ class ReconTool:
             logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
             self.silent = False
 
-        self.subdomain_scanner = SubdomainScanner(args.timeout, args.subdomain_wordlist, args.concurrency, args.retries, args.silent)
-        self.http_checker = HTTPStatusChecker(args.timeout, args.concurrency, args.silent)
-        self.dir_scanner = DirectoryScanner(args.timeout, args.concurrency, args.depth, args.silent)
+        self.subdomain_scanner = SubdomainScanner(
+            args.timeout, args.subdomain_wordlist, args.concurrency, args.retries, args.silent,
+            dns_concurrency=getattr(args, 'dns_concurrency', 1000),
+            dns_timeout=getattr(args, 'dns_timeout', 2.0),
+            resolvers_file=getattr(args, 'resolvers', None) or RESOLVERS_FILE,
+            trusted_resolvers_file=getattr(args, 'trusted_resolvers', None) or TRUSTED_RESOLVERS_FILE,
+            dns_cache_file=None if getattr(args, 'no_dns_cache', False) else (getattr(args, 'dns_cache', None) or DNS_CACHE_FILE)
+        )
+        set_http2_default(getattr(args, 'http2', False))
+        set_parse_workers(getattr(args, 'parse_workers', None))
+        if getattr(args, 'no_response_cache', False):
+            disable_response_cache()
+        else:
+            enable_response_cache(max_bytes=getattr(args, 'response_cache_mb', 64) * 1024 * 1024)
+        self.http_checker = HTTPStatusChecker(args.timeout, args.concurrency, args.silent,
+                                              probe_mode=getattr(args, 'probe', 'smart'),
+                                              max_body_bytes=getattr(args, 'max_body_kb', 64) * 1024,
+                                              sort_results=not getattr(args, 'no_sort', False),
+                                              jsonl_output=getattr(args, 'jsonl', False),
+                                              resume=getattr(args, 'resume', False),
+                                              per_host=getattr(args, 'per_host', 10),
+                                              host_rate=getattr(args, 'host_rate', 0.0),
+                                              http_meta_file=None if getattr(args, 'no_http_meta', False) else (getattr(args, 'http_meta', None) or HTTP_META_FILE),
+                                              changed_only=getattr(args, 'changed_only', False),
+                                              cluster=getattr(args, 'cluster', False))
+        self.dir_scanner = DirectoryScanner(args.timeout, args.concurrency, args.depth, args.silent,
+                                            per_host=getattr(args, 'per_host', 10),
+                                            host_rate=getattr(args, 'host_rate', 0.0),
+                                            cluster=getattr(args, 'cluster', False),
+                                            calibrate=not getattr(args, 'no_calibration', False),
+                                            screenshot_workers=getattr(args, 'screenshot_workers', 2))
         self.email_searcher = EmailSearcher(args.timeout, args.silent)
 
         if args.email_domain or args.email_username:
@@ -1847,6 +2179,12 @@ class ReconTool:
             for v in vuln:
                 mgr.notify_takeover(v['subdomain'], v['cname'], v['service'])
 
+    def cluster_source(self) -> Optional[str]:
+        """HTTP results CSV whose cluster table limits host-level modules, when --cluster is set."""
+        if not getattr(self.args, 'cluster', False):
+            return None
+        return getattr(self.args, 'cluster_source', None) or "http_results.csv"
+
     def run_param_discovery(self, input_file: str = None, output: str = None):
         """Run parameter discovery."""
         if not _PARAM_DISCO_AVAILABLE:
@@ -1858,7 +2196,9 @@ class ReconTool:
         output = output or "results/params_discovered.csv"
         os.makedirs("results", exist_ok=True)
         wordlist = input(colored("[?] Parameter wordlist (optional, press Enter to skip): ", "yellow")).strip() or None
-        disco = ParamDiscovery(timeout=self.args.timeout, concurrency=self.args.concurrency, silent=self.silent, wordlist_path=wordlist)
+        disco = ParamDiscovery(timeout=self.args.timeout, concurrency=self.args.concurrency, silent=self.silent, wordlist_path=wordlist,
+                               per_host=getattr(self.args, 'per_host', 10), host_rate=getattr(self.args, 'host_rate', 0.0),
+                               cluster_source=self.cluster_source())
         disco.run(input_file=input_file, output_file=output)
 
     def run_headers_audit(self, input_file: str = None, output: str = None):
@@ -1874,7 +2214,9 @@ class ReconTool:
         import re as _re
         import sys as _sys
         _sys.modules.setdefault('re', _re)
-        auditor = HeadersAuditor(timeout=self.args.timeout, concurrency=self.args.concurrency, silent=self.silent)
+        auditor = HeadersAuditor(timeout=self.args.timeout, concurrency=self.args.concurrency, silent=self.silent,
+                                 per_host=getattr(self.args, 'per_host', 10), host_rate=getattr(self.args, 'host_rate', 0.0),
+                                 cluster_source=self.cluster_source())
         auditor.run(input_file=input_file, output_file=output)
 
     def run_favicon_scan(self, input_file: str = None, output: str = None):
@@ -1887,7 +2229,9 @@ class ReconTool:
                          or "results/subdomains/subs-alive.txt"
         output = output or "results/favicon_hashes.csv"
         os.makedirs("results", exist_ok=True)
-        scanner = FaviconScanner(timeout=self.args.timeout, concurrency=self.args.concurrency, silent=self.silent)
+        scanner = FaviconScanner(timeout=self.args.timeout, concurrency=self.args.concurrency, silent=self.silent,
+                                 per_host=getattr(self.args, 'per_host', 10), host_rate=getattr(self.args, 'host_rate', 0.0),
+                                 cluster_source=self.cluster_source())
         scanner.run(input_file=input_file, output_file=output)
 
     def run_github_dork(self, domain: str = None, output: str = None):
@@ -1917,7 +2261,7 @@ class ReconTool:
         output = output or f"results/asn_{domain}.csv"
         os.makedirs("results", exist_ok=True)
         recon = ASNRecon(timeout=self.args.timeout, silent=self.silent)
-        recon.run(domain, output)
+        recon.run(domain, output, load_host_records(host_records_path("results.txt")))
 
     def run_monitor(self):
         """Start continuous monitoring."""
@@ -2135,12 +2479,38 @@ Subdomain Enumeration:
     -t, --timeout N           Request timeout in seconds (default: 10)
     -c, --concurrency N       Maximum concurrent requests (default: 50)
     -r, --retries N           Number of retries for failed requests (default: 3)
+    --dns-concurrency N       Maximum DNS queries in flight (default: 1000)
+    --dns-timeout SECONDS     Per-query DNS timeout (default: 2.0)
+    --resolvers FILE          Public resolver pool (default: resolvers.txt)
+    --trusted-resolvers FILE  Resolvers used to re-verify hits (default: resolvers-trusted.txt)
+    --dns-cache FILE          Persistent DNS answer cache (default: results/dns_cache.sqlite)
+    --no-dns-cache            Always query the network, ignoring cached answers
 
 HTTP Status Checking:
     --input FILE              Input file with URLs to check
     -o, --output FILE         Output CSV file (default: http_results.csv)
     -t, --timeout N           Request timeout in seconds (default: 10)
     -c, --concurrency N       Maximum concurrent requests (default: 50)
+    --probe MODE              smart: HTTPS, HTTP only if HTTPS cannot connect;
+                              both: probe both schemes (default: smart)
+    --max-body-kb N           Read at most N KB of each page for its title (default: 64)
+    --jsonl                   Also write results as JSON lines next to the CSV
+    --no-sort                 Leave the CSV in completion order instead of sorting it
+    --resume                  Continue an interrupted run, skipping hosts already checked
+    --http2                   Use HTTP/2 where servers support it (needs httpx[http2])
+    --per-host N              Maximum concurrent requests per host (default: 10)
+    --host-rate R             Maximum requests per second per host (default: unlimited)
+    --response-cache-mb N     Memory for responses shared between modules (default: 64)
+    --no-response-cache       Fetch every page again instead of sharing responses
+    --http-meta FILE          Per-URL ETag/Last-Modified store for rescans (default: results/http_meta.sqlite)
+    --no-http-meta            Do not send conditional requests or track changes between runs
+    --changed-only            Write only hosts that are new or changed since the last run
+    --parse-workers N         Processes for HTML/JS parsing (default: CPU count, 0 = parse inline)
+    --cluster                 Group live hosts serving the same page; directory scans, param discovery,
+                              the headers audit and favicon hashing then visit one per group
+    --cluster-source FILE     HTTP results CSV whose groups the host-list modules use (default: http_results.csv)
+    --no-calibration          Report every 200/301/302/403 instead of dropping soft-404 (catch-all) matches
+    --screenshot-workers N    Headless browsers taking directory screenshots (default: 2, 0 = none)
 
 Directory Scanning:
     --input FILE              Input CSV file with URLs
@@ -2220,6 +2590,30 @@ if __name__ == "__main__":
     parser.add_argument('-t', '--timeout', type=int, default=10, help="Request timeout in seconds")
     parser.add_argument('-c', '--concurrency', type=int, default=50, help="Maximum concurrent requests")
     parser.add_argument('-r', '--retries', type=int, default=3, help="Number of retries for failed requests")
+    parser.add_argument('--probe', choices=['smart', 'both'], default='smart', help="HTTP probing: HTTPS with HTTP fallback (smart) or both schemes")
+    parser.add_argument('--max-body-kb', type=int, default=64, help="Maximum KB of each response body read for the title")
+    parser.add_argument('--jsonl', action='store_true', help="Also write HTTP results as JSON lines next to the CSV")
+    parser.add_argument('--no-sort', action='store_true', help="Do not sort the HTTP results CSV by subdomain")
+    parser.add_argument('--resume', action='store_true', help="Resume an interrupted HTTP status check from its <output>.journal")
+    parser.add_argument('--http2', action='store_true', help="Use HTTP/2 multiplexing where supported (requires the h2 package)")
+    parser.add_argument('--per-host', type=int, default=10, help="Maximum concurrent requests per host (backs off on 429/503/timeouts)")
+    parser.add_argument('--host-rate', type=float, default=0.0, help="Maximum requests per second per host (0 = unlimited)")
+    parser.add_argument('--response-cache-mb', type=int, default=64, help="In-memory size of the run's shared HTTP response cache in MB (spills to disk beyond it)")
+    parser.add_argument('--no-response-cache', action='store_true', help="Disable the shared HTTP response cache")
+    parser.add_argument('--http-meta', help="Persistent per-URL HTTP metadata store used to revalidate rescans (default: results/http_meta.sqlite)")
+    parser.add_argument('--no-http-meta', action='store_true', help="Disable conditional requests and change tracking")
+    parser.add_argument('--changed-only', action='store_true', help="Only write HTTP results that are new or changed since the last run")
+    parser.add_argument('--parse-workers', type=int, default=None, help="Worker processes for HTML/JS parsing (default: CPU count, 0 = parse on the event loop)")
+    parser.add_argument('--cluster', action='store_true', help="HTTP checking: group live hosts by response similarity; directory scanning, param discovery, headers audit, favicon hashing: scan one representative per group")
+    parser.add_argument('--cluster-source', metavar='FILE', help="HTTP results CSV whose response clusters --cluster applies to param discovery, the headers audit and favicon hashing (default: http_results.csv)")
+    parser.add_argument('--no-calibration', action='store_true', help="Directory scanning: disable soft-404 baselines from random paths")
+    parser.add_argument('--screenshot-workers', type=int, default=2, help="Headless browser workers for directory screenshots (0 disables screenshots)")
+    parser.add_argument('--dns-concurrency', type=int, default=1000, help="Maximum DNS queries in flight during brute force")
+    parser.add_argument('--dns-timeout', type=float, default=2.0, help="Per-query DNS timeout in seconds")
+    parser.add_argument('--resolvers', help="Resolver list for DNS brute force (default: resolvers.txt)")
+    parser.add_argument('--trusted-resolvers', help="Trusted resolvers used to verify answers (default: resolvers-trusted.txt)")
+    parser.add_argument('--dns-cache', help="Persistent TTL-aware DNS cache file (default: results/dns_cache.sqlite)")
+    parser.add_argument('--no-dns-cache', action='store_true', help="Disable the persistent DNS cache")
     parser.add_argument('--depth', type=int, default=5, help="Maximum crawling depth for directory scanning (1-10)")
     parser.add_argument('--silent', action='store_true', help="Run in silent mode (only show main status messages)")
     parser.add_argument('--llm-prompt', help="Prompt to send to REK LLM assistant")
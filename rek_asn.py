@@ -8,10 +8,12 @@ import httpx
 import csv
 import os
 import ipaddress
-import socket
 import json
 from typing import List, Dict, Optional, Set
 from termcolor import colored
+from rek_dns import AsyncDNSResolver, host_addresses
+from rek_dns_cache import DNS_CACHE_FILE, open_cache
+from rek_http import create_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,30 +27,28 @@ HACKTRICKS_AMASS_URL = "https://api.bgpview.io/search?query_term={query}"
 
 
 class ASNRecon:
-    def __init__(self, timeout: int = 15, silent: bool = False):
+    def __init__(self, timeout: int = 15, silent: bool = False, dns_cache_file: str = DNS_CACHE_FILE):
         self.timeout = timeout
         self.silent = silent
+        self.dns_cache_file = dns_cache_file
         self.findings: List[Dict] = []
 
-    def resolve_domain_ips(self, domain: str) -> List[str]:
-        """Resolve domain to IP addresses."""
-        ips = []
-        try:
-            results = socket.getaddrinfo(domain, None)
-            ips = list({r[4][0] for r in results})
-        except Exception:
-            pass
-
-        # Also try common subdomains
-        for sub in ['www', 'api', 'mail']:
-            try:
-                results = socket.getaddrinfo(f"{sub}.{domain}", None)
-                for r in results:
-                    ips.append(r[4][0])
-            except Exception:
-                pass
-
-        return list(set(ips))
+    async def resolve_domain_ips(self, domain: str, host_records: Dict[str, Dict] = None) -> List[str]:
+        """Resolve domain (and common subdomains) to IPv4/IPv6 addresses.
+
+        Host records from the subdomain scan are reused as-is; only hosts
+        without a record are resolved here.
+        """
+        host_records = host_records or {}
+        hosts = [domain] + [f"{sub}.{domain}" for sub in ['www', 'api', 'mail']]
+        records = {host: host_records[host] for host in hosts if host in host_records}
+        missing = [host for host in hosts if host not in records]
+        if missing:
+            resolver = AsyncDNSResolver.from_files(query_timeout=5, cache=open_cache(self.dns_cache_file))
+            records.update(await resolver.resolve_hosts(missing))
+            if resolver.cache is not None:
+                resolver.cache.close()
+        return sorted({ip for record in records.values() for ip in host_addresses(record)})
 
     async def get_asn_for_ip(self, client: httpx.AsyncClient, ip: str) -> Optional[Dict]:
         """Get ASN information for an IP address."""
@@ -167,7 +167,7 @@ class ASNRecon:
             pass
         return asns
 
-    async def run_async(self, domain: str) -> Dict:
+    async def run_async(self, domain: str, host_records: Dict[str, Dict] = None) -> Dict:
         """Run full ASN recon for a domain."""
         results = {
             'domain': domain,
@@ -177,9 +177,9 @@ class ASNRecon:
             'total_ips': 0,
         }
 
-        async with httpx.AsyncClient(verify=False, timeout=self.timeout) as client:
+        async with create_client(timeout=self.timeout, verify=False) as client:
             # Step 1: Resolve domain to IPs
-            ips = self.resolve_domain_ips(domain)
+            ips = await self.resolve_domain_ips(domain, host_records)
             results['ips'] = ips
 
             if not self.silent:
@@ -229,12 +229,12 @@ class ASNRecon:
 
         return results
 
-    def run(self, domain: str, output_file: str = None) -> Dict:
+    def run(self, domain: str, output_file: str = None, host_records: Dict[str, Dict] = None) -> Dict:
         """Run ASN recon."""
         if not self.silent:
             print(colored(f"\n[+] ASN/IP Range Expansion for {domain}...", "blue"))
 
-        results = asyncio.run(self.run_async(domain))
+        results = asyncio.run(self.run_async(domain, host_records))
         self.findings = results.get('prefixes', [])
 
         out = output_file or f"asn_{domain}.csv"
@@ -0,0 +1,300 @@
+"""
+REK DNS Benchmarks
+Offline benchmark for the DNS resolution path. Starts an in-process UDP DNS
+stub (configurable latency, packet loss, wildcard zones and NXDOMAIN ratio)
+and drives SubdomainScanner.dns_brute_force and TakeoverDetector against it
+with the shipped wordlists, reporting queries/sec, p50/p99 query latency and
+peak RSS.
+
+    python rek_bench.py
+    python rek_bench.py -w wordlists/subdomains-top5000.txt --latency 20 --loss 0.02
+    python rek_bench.py --wildcard-zone dev.bench.test --json bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import time
+import zlib
+from typing import Dict, List
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+from termcolor import colored
+
+from rek_dns import AsyncDNSResolver
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DOMAIN = 'bench.test'
+DEFAULT_WORDLIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wordlists', 'subdomains-top1million-5000.txt')
+
+
+class StubDNSServer(asyncio.DatagramProtocol):
+    """Authoritative-looking UDP stub answering every zone from a hash of the name.
+
+    A name is NXDOMAIN when its CRC falls under `nxdomain_ratio`; otherwise it
+    gets an A/AAAA record, and `cname_ratio` of those are served through a
+    CNAME first. Names under a `wildcard_zones` entry always resolve. Replies
+    are delayed by `latency` (+/- `jitter`) seconds and `loss` of the queries
+    are dropped.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0, nxdomain_ratio: float = 0.9,
+                 cname_ratio: float = 0.1, wildcard_zones: List[str] = None, ttl: int = 300):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.nxdomain_ratio = nxdomain_ratio
+        self.cname_ratio = cname_ratio
+        self.wildcard_zones = [z.lower().rstrip('.') for z in wildcard_zones or []]
+        self.ttl = ttl
+        self.transport = None
+        self.stats = {'received': 0, 'dropped': 0, 'answered': 0}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def _wildcard_zone(self, name: str) -> str:
+        for zone in self.wildcard_zones:
+            if name == zone or name.endswith(f".{zone}"):
+                return zone
+        return None
+
+    def _build_response(self, query: dns.message.Message) -> dns.message.Message:
+        response = dns.message.make_response(query)
+        question = query.question[0]
+        qname = question.name.to_text()
+        name = qname.rstrip('.').lower()
+        zone = '.'.join(name.split('.')[-2:]) + '.'
+        soa = dns.rrset.from_text(zone, self.ttl, 'IN', 'SOA', f"ns.{zone} hostmaster.{zone} 1 3600 600 86400 {self.ttl}")
+        # Every name under a wildcard zone gets that zone's answer.
+        wildcard = self._wildcard_zone(name)
+        bucket = zlib.crc32((wildcard or name).encode()) % 10000
+
+        if wildcard is None and bucket < self.nxdomain_ratio * 10000:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+            response.authority.append(soa)
+            return response
+
+        owner = qname
+        if bucket % 100 < self.cname_ratio * 100:
+            owner = f"edge-{bucket % 7}.bench-cdn.test."
+            response.answer.append(dns.rrset.from_text(qname, self.ttl, 'IN', 'CNAME', owner))
+        octet = bucket % 250 + 1
+        if question.rdtype == dns.rdatatype.A:
+            response.answer.append(dns.rrset.from_text(owner, self.ttl, 'IN', 'A', f"10.0.{octet}.{octet}"))
+        elif question.rdtype == dns.rdatatype.AAAA:
+            response.answer.append(dns.rrset.from_text(owner, self.ttl, 'IN', 'AAAA', f"fd00::{octet:x}"))
+        elif question.rdtype != dns.rdatatype.CNAME or owner == qname:
+            response.authority.append(soa)
+        return response
+
+    def datagram_received(self, data: bytes, addr):
+        self.stats['received'] += 1
+        if self.loss and random.random() < self.loss:
+            self.stats['dropped'] += 1
+            return
+        try:
+            wire = self._build_response(dns.message.from_wire(data)).to_wire()
+        except Exception:
+            return
+        delay = max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+        if delay:
+            asyncio.get_running_loop().call_later(delay, self._send, wire, addr)
+        else:
+            self._send(wire, addr)
+
+    def _send(self, wire: bytes, addr):
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.sendto(wire, addr)
+            self.stats['answered'] += 1
+
+
+async def start_stub(host: str = '127.0.0.1', port: int = 0, **config):
+    """Bind a StubDNSServer; returns (transport, protocol, bound port)."""
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: StubDNSServer(**config), local_addr=(host, port)
+    )
+    # A burst of `concurrency` queries otherwise overflows the default
+    # receive buffer and shows up as resolver timeouts.
+    try:
+        transport.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+    except OSError:
+        pass
+    return transport, protocol, transport.get_extra_info('sockname')[1]
+
+
+def time_queries(resolver: AsyncDNSResolver) -> List[float]:
+    """Record the latency of every DNS query this resolver sends.
+
+    The clock starts when the query goes on the wire, after the resolver's
+    in-flight limit let it through, so time spent queued is not counted. The
+    stub shares the event loop, so once the loop is CPU-bound the figure also
+    includes waiting for it (roughly concurrency / queries per second).
+    """
+    latencies: List[float] = []
+    exchange = resolver._exchange
+
+    async def timed_exchange(query: dns.message.Message, nameserver: str) -> dns.message.Message:
+        started = time.perf_counter()
+        try:
+            return await exchange(query, nameserver)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    resolver._exchange = timed_exchange
+    return latencies
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def load_words(path: str, limit: int = None) -> List[str]:
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        words = [line.strip().lower() for line in f if line.strip() and not line.startswith('#')]
+    return words[:limit] if limit else words
+
+
+def summarise(name: str, elapsed: float, resolver: AsyncDNSResolver, latencies: List[float], extra: Dict) -> Dict:
+    queries = resolver.stats['queries']
+    return {
+        'benchmark': name,
+        'elapsed': round(elapsed, 3),
+        'queries': queries,
+        'qps': round(queries / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'timeouts': resolver.stats['timeouts'],
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        **extra,
+    }
+
+
+async def bench_brute_force(words: List[str], port: int, concurrency: int, timeout: float, retries: int) -> Dict:
+    """Run SubdomainScanner.dns_brute_force over `words` against the stub."""
+    from rek import SubdomainScanner
+
+    scanner = SubdomainScanner(silent=True, retries=retries, dns_concurrency=concurrency,
+                               dns_timeout=timeout, dns_cache_file=None)
+    resolver = AsyncDNSResolver(['127.0.0.1'], max_in_flight=concurrency, query_timeout=timeout,
+                                retries=retries, port=port)
+    latencies = time_queries(resolver)
+    started = time.perf_counter()
+    checked = await scanner.dns_brute_force(BENCH_DOMAIN, iter(words), resolver=resolver)
+    elapsed = time.perf_counter() - started
+    return summarise('dns_brute_force', elapsed, resolver, latencies, {
+        'names': checked,
+        'validated': len(scanner.validated_subdomains),
+        'wildcard_filtered': scanner.wildcard_filtered,
+    })
+
+
+async def bench_takeover(hosts: List[str], port: int, concurrency: int, timeout: float, retries: int) -> Dict:
+    """Run TakeoverDetector.scan_all over `hosts` against the stub.
+
+    The stub's CNAME targets match no takeover fingerprint, so only the DNS
+    path is exercised and no HTTP request leaves the machine.
+    """
+    from rek_takeover import TakeoverDetector
+
+    detector = TakeoverDetector(timeout=timeout, concurrency=concurrency, silent=True, dns_cache_file=None)
+    detector.resolver = AsyncDNSResolver(['127.0.0.1'], max_in_flight=concurrency, query_timeout=timeout,
+                                         retries=retries, port=port)
+    latencies = time_queries(detector.resolver)
+    started = time.perf_counter()
+    findings = await detector.scan_all(hosts)
+    elapsed = time.perf_counter() - started
+    with_cname = sum(1 for record in detector.host_records.values() if record['cnames'])
+    return summarise('takeover', elapsed, detector.resolver, latencies, {
+        'names': len(hosts),
+        'cname_hosts': with_cname,
+        'findings': len(findings),
+    })
+
+
+async def run_benchmarks(args) -> List[Dict]:
+    words = load_words(args.wordlist, args.limit)
+    transport, stub, port = await start_stub(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        loss=args.loss,
+        nxdomain_ratio=args.nxdomain_ratio,
+        cname_ratio=args.cname_ratio,
+        wildcard_zones=args.wildcard_zone,
+    )
+    results = []
+
+    async def run(bench):
+        # The stub's counters are cumulative; report what this benchmark added.
+        before = dict(stub.stats)
+        result = await bench
+        result['stub'] = {key: value - before[key] for key, value in stub.stats.items()}
+        results.append(result)
+
+    try:
+        if 'brute' in args.benchmarks:
+            await run(bench_brute_force(words, port, args.concurrency, args.timeout, args.retries))
+        if 'takeover' in args.benchmarks:
+            hosts = [f"{word}.{BENCH_DOMAIN}" for word in words]
+            await run(bench_takeover(hosts, port, args.concurrency, args.timeout, args.retries))
+    finally:
+        transport.close()
+    return results
+
+
+def print_report(results: List[Dict]):
+    for r in results:
+        print(colored(f"\n[+] {r['benchmark']}", "blue"))
+        print(colored(f"    {r['names']} names, {r['queries']} queries in {r['elapsed']}s "
+                      f"-> {r['qps']} queries/sec", "green"))
+        print(colored(f"    latency p50 {r['p50_ms']}ms, p99 {r['p99_ms']}ms; "
+                      f"{r['timeouts']} timeouts; peak RSS {r['peak_rss_mb']} MB", "cyan"))
+        details = {k: v for k, v in r.items() if k in ('validated', 'wildcard_filtered', 'cname_hosts', 'findings')}
+        print(colored(f"    {', '.join(f'{k}={v}' for k, v in details.items())}; stub {r['stub']}", "cyan"))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="REK DNS benchmark against a local stub server")
+    parser.add_argument('-w', '--wordlist', default=DEFAULT_WORDLIST, help="Wordlist of labels to resolve")
+    parser.add_argument('--limit', type=int, help="Only use the first N wordlist entries")
+    parser.add_argument('--benchmarks', nargs='+', default=['brute', 'takeover'], choices=['brute', 'takeover'])
+    parser.add_argument('-c', '--concurrency', type=int, default=1000, help="DNS queries in flight")
+    parser.add_argument('--timeout', type=float, default=2.0, help="Per-query DNS timeout in seconds")
+    parser.add_argument('-r', '--retries', type=int, default=2, help="Retries per query")
+    parser.add_argument('--latency', type=float, default=0.0, help="Stub reply latency in ms")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Stub latency jitter in ms")
+    parser.add_argument('--loss', type=float, default=0.0, help="Fraction of queries the stub drops")
+    parser.add_argument('--nxdomain-ratio', type=float, default=0.9, help="Fraction of names that are NXDOMAIN")
+    parser.add_argument('--cname-ratio', type=float, default=0.1, help="Fraction of resolving names behind a CNAME")
+    parser.add_argument('--wildcard-zone', action='append', default=[], help="Zone answering every name (repeatable)")
+    parser.add_argument('--json', help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(args))
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(colored(f"\n[✓] Results saved to {args.json}", "green"))
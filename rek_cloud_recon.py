@@ -10,6 +10,7 @@ import os
 import csv
 from typing import List, Dict, Optional
 from termcolor import colored
+from rek_http import create_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -169,7 +170,7 @@ class CloudRecon:
         semaphore = asyncio.Semaphore(self.concurrency)
         findings = []
 
-        async with httpx.AsyncClient(verify=False, timeout=self.timeout) as client:
+        async with create_client(self.concurrency, timeout=self.timeout, verify=False) as client:
             tasks = []
             for name in bucket_names:
                 tasks.append(self.check_s3_bucket(client, name, semaphore))
@@ -0,0 +1,210 @@
+"""
+REK Response Clustering
+Groups live hosts that serve the same page (parking pages, CDN errors,
+default nginx/IIS pages) so later stages can scan one representative per
+group instead of every host.
+
+Each response gets a cheap fingerprint while it is probed: a 64-bit simhash
+of the body prefix (title included), a body length bucket, and a hash of the
+set of response header names. Hosts are only compared within the same
+status / header set / length bucket, and join a cluster when their simhash is
+within a few bits of its representative. Simhashes are indexed by eight 8-bit
+bands, so a lookup only touches clusters sharing a band (any pair within 7
+bits shares at least one).
+"""
+import csv
+import hashlib
+import math
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+from termcolor import colored
+import logging
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+# Largest simhash distance at which two pages count as the same. Templated
+# pages differing only in the domain name land within ~5 bits; unrelated
+# pages around 32.
+MAX_DISTANCE = 6
+# Body prefix read from each HTML response for its simhash.
+SAMPLE_BYTES = 16 * 1024
+_BANDS = 8
+_BAND_BITS = SIMHASH_BITS // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+# Header names that come and go between otherwise identical responses.
+_VOLATILE_HEADERS = frozenset(('date', 'age', 'expires', 'set-cookie', 'etag', 'last-modified', 'content-length',
+                               'x-request-id', 'x-amz-cf-id', 'cf-ray', 'x-cache', 'via', 'report-to', 'nel'))
+
+_TOKEN = re.compile(r'[a-z0-9]{2,}')
+_TAG = re.compile(r'<[^>]{0,512}>')
+
+CLUSTER_COLUMNS = ["Cluster", "Size", "Representative", "URL", "Status Code", "Title"]
+
+
+def clusters_path(path: str) -> str:
+    """Cluster table stored next to a CSV output (http_results.csv -> http_results.clusters.csv)."""
+    return os.path.splitext(path)[0] + '.clusters.csv'
+
+
+def representatives_path(path: str) -> str:
+    """One representative URL per line (http_results.csv -> http_results.representatives.txt)."""
+    return os.path.splitext(path)[0] + '.representatives.txt'
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little')
+
+
+def simhash(text: str) -> int:
+    """64-bit simhash of the word 3-shingles of `text` with markup stripped."""
+    tokens = _TOKEN.findall(_TAG.sub(' ', text.lower()))
+    if len(tokens) > 2:
+        tokens = [' '.join(tokens[i:i + 3]) for i in range(len(tokens) - 2)]
+    weights = [0] * SIMHASH_BITS
+    for token in tokens:
+        h = _hash64(token)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def length_bucket(length: int) -> int:
+    """Half-octave bucket of a body length, so sizes within ~40% usually share one."""
+    return int(math.log2(length) * 2) if length > 0 else -1
+
+
+def header_set_hash(names: Iterable[str]) -> str:
+    names = sorted({name.lower() for name in names} - _VOLATILE_HEADERS)
+    return hashlib.sha1('\n'.join(names).encode()).hexdigest()[:16]
+
+
+def text_features(text: str, header_names: List[str], length: int) -> Dict:
+    """Fingerprint fields for one response body sample (run via rek_parse)."""
+    return {
+        'simhash': simhash(text),
+        'length_bucket': length_bucket(length),
+        'header_hash': header_set_hash(header_names),
+    }
+
+
+class HostClusterer:
+    """Incrementally assigns results with `features` to clusters.
+
+    The first host of a cluster is its representative.
+    """
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.clusters: List[Dict] = []
+        self._bands: Dict[Tuple, List[int]] = {}
+
+    def _band_keys(self, block: Tuple, value: int) -> List[Tuple]:
+        return [block + (i, value >> (i * _BAND_BITS) & _BAND_MASK) for i in range(_BANDS)]
+
+    def add(self, result: Dict) -> int:
+        """Assign `result` to a cluster and return the cluster id."""
+        features = result.get('features')
+        if features is None:
+            cluster_id = self._new_cluster(result, None, None)
+            result['cluster'] = cluster_id
+            return cluster_id
+        block = (result.get('status_code'), features['header_hash'], features['length_bucket'])
+        value = features['simhash']
+        keys = self._band_keys(block, value)
+        for key in keys:
+            for cluster_id in self._bands.get(key, ()):
+                if hamming(self.clusters[cluster_id]['simhash'], value) <= self.max_distance:
+                    self.clusters[cluster_id]['members'].append(self._member(result))
+                    result['cluster'] = cluster_id
+                    return cluster_id
+        cluster_id = self._new_cluster(result, value, keys)
+        result['cluster'] = cluster_id
+        return cluster_id
+
+    @staticmethod
+    def _member(result: Dict) -> Tuple:
+        return result['url'], result.get('status_code'), result.get('title')
+
+    def _new_cluster(self, result: Dict, value: Optional[int], keys: Optional[List[Tuple]]) -> int:
+        cluster_id = len(self.clusters)
+        self.clusters.append({'simhash': value, 'members': [self._member(result)]})
+        for key in keys or ():
+            self._bands.setdefault(key, []).append(cluster_id)
+        return cluster_id
+
+    def representatives(self) -> List[str]:
+        return [cluster['members'][0][0] for cluster in self.clusters]
+
+    def duplicates(self) -> int:
+        """Hosts that are not the representative of their cluster."""
+        return sum(len(cluster['members']) - 1 for cluster in self.clusters)
+
+    def save(self, output_file: str):
+        """Write the cluster table and representative list next to `output_file`."""
+        order = sorted(range(len(self.clusters)), key=lambda i: -len(self.clusters[i]['members']))
+        with open(clusters_path(output_file), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(CLUSTER_COLUMNS)
+            for rank, cluster_id in enumerate(order, 1):
+                members = self.clusters[cluster_id]['members']
+                for i, (url, status, title) in enumerate(members):
+                    writer.writerow([rank, len(members), 'yes' if i == 0 else 'no', url,
+                                     status if status is not None else '', title or ''])
+        with open(representatives_path(output_file), 'w', encoding='utf-8') as f:
+            for cluster_id in order:
+                f.write(f"{self.clusters[cluster_id]['members'][0][0]}\n")
+
+
+def load_duplicate_urls(output_file: str) -> Optional[set]:
+    """URLs that are not their cluster's representative, or None without a cluster table."""
+    try:
+        with open(clusters_path(output_file), 'r', newline='', encoding='utf-8') as f:
+            return {row['URL'] for row in csv.DictReader(f) if row.get('Representative') == 'no'}
+    except (OSError, csv.Error, KeyError) as e:
+        logger.debug(f"No cluster table for {output_file}: {e}")
+        return None
+
+
+def url_host(url: str) -> str:
+    """Host (with port) of a URL or bare host name."""
+    return (urlparse(url).netloc or urlparse(f"//{url}").netloc).lower()
+
+
+def load_duplicate_hosts(output_file: str) -> Optional[set]:
+    """Hosts none of whose probed URLs represents a cluster, or None without a cluster table."""
+    try:
+        with open(clusters_path(output_file), 'r', newline='', encoding='utf-8') as f:
+            rows = [(url_host(row['URL']), row.get('Representative') == 'yes') for row in csv.DictReader(f)]
+    except (OSError, csv.Error, KeyError) as e:
+        logger.debug(f"No cluster table for {output_file}: {e}")
+        return None
+    representatives = {host for host, representative in rows if representative}
+    return {host for host, representative in rows if not representative} - representatives
+
+
+
+def drop_cluster_duplicates(urls: List[str], output_file: str, by_host: bool = False,
+                            silent: bool = False) -> List[str]:
+    """`urls` without the cluster duplicates recorded next to `output_file` (see --cluster).
+
+    URLs are matched exactly against the cluster table, or with `by_host` by
+    host, for inputs that are host or endpoint lists rather than the probed
+    URLs. Without a cluster table every URL is kept.
+    """
+    duplicates = load_duplicate_hosts(output_file) if by_host else load_duplicate_urls(output_file)
+    if duplicates is None:
+        if not silent:
+            logger.warning(colored(f"No cluster table {clusters_path(output_file)}; scanning every URL", "yellow"))
+        return urls
+    kept = [url for url in urls if (url_host(url) if by_host else url) not in duplicates]
+    if not silent:
+        logger.info(colored(f"Skipping {len(urls) - len(kept)} URLs that serve the same page as a scanned one", "green"))
+    return kept
@@ -0,0 +1,506 @@
+"""
+REK Async DNS Engine
+Non-blocking DNS resolution on the asyncio event loop built on dnspython's
+async query layer. Keeps thousands of queries in flight with a per-query
+timeout that is independent of the HTTP timeouts used elsewhere in REK.
+
+Queries are spread round-robin over a health-scored pool loaded from
+resolvers.txt; positive answers from public resolvers are re-verified
+against resolvers-trusted.txt (puredns-style) before being reported.
+WildcardDetector fingerprints wildcard zones so brute-force hits that only
+exist because of a `*` record can be dropped. resolve_host() produces the
+compact A/AAAA/CNAME host record the takeover, ASN and HTTP stages consume.
+"""
+import asyncio
+import ipaddress
+import json
+import os
+import random
+import string
+import time
+from typing import Dict, List, Optional, Set
+
+import dns.asyncquery
+import dns.exception
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import logging
+
+from rek_dns_cache import DNSCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAMESERVERS = ['8.8.8.8', '8.8.4.4', '1.1.1.1', '9.9.9.9']
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOLVERS_FILE = os.path.join(_BASE_DIR, 'resolvers.txt')
+TRUSTED_RESOLVERS_FILE = os.path.join(_BASE_DIR, 'resolvers-trusted.txt')
+
+# Statuses that count against a resolver's health score.
+FAILURE_STATUSES = ('TIMEOUT', 'ERROR', 'SERVFAIL', 'REFUSED', 'LIE')
+
+
+def load_resolvers(path: str) -> List[str]:
+    """Read one resolver IP per line, skipping comments and invalid entries."""
+    resolvers = []
+    try:
+        with open(path) as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                try:
+                    resolvers.append(str(ipaddress.ip_address(line)))
+                except ValueError:
+                    logger.debug(f"Skipping invalid resolver entry in {path}: {line}")
+    except OSError as e:
+        logger.warning(f"Could not read resolvers file {path}: {e}")
+    return list(dict.fromkeys(resolvers))
+
+
+def empty_result(name: str, rtype: str, status: str) -> Dict:
+    """Build an answer dict carrying no records."""
+    return {
+        'name': name,
+        'rtype': rtype,
+        'status': status,
+        'answers': [],
+        'cnames': [],
+        'ttl': 0,
+        'resolver': None,
+    }
+
+
+def negative_ttl(response: dns.message.Message) -> int:
+    """Negative-caching TTL of a response: min(SOA TTL, SOA MINIMUM), RFC 2308."""
+    for rrset in response.authority:
+        if rrset.rdtype == dns.rdatatype.SOA:
+            return min(rrset.ttl, min(rdata.minimum for rdata in rrset))
+    return 0
+
+
+def parse_response(name: str, rtype: str, response: dns.message.Message) -> Dict:
+    """Flatten a DNS response into REK's answer dict.
+
+    `answers` holds the records of the requested type, `cnames` the CNAME
+    chain that led to them (in resolution order). The chain is kept for
+    NXDOMAIN too, since a CNAME to a missing name is what a dangling record
+    looks like. For NXDOMAIN/NOANSWER the `ttl` is the negative-caching TTL
+    taken from the SOA record.
+    """
+    rcode = response.rcode()
+    if rcode not in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN):
+        return empty_result(name, rtype, dns.rcode.to_text(rcode))
+
+    wanted = dns.rdatatype.from_text(rtype)
+    result = empty_result(name, rtype, 'NXDOMAIN' if rcode == dns.rcode.NXDOMAIN else 'NOANSWER')
+    ttls = []
+    for rrset in response.answer:
+        if rrset.rdtype == dns.rdatatype.CNAME and wanted != dns.rdatatype.CNAME:
+            result['cnames'].extend(str(rdata.target).rstrip('.') for rdata in rrset)
+            ttls.append(rrset.ttl)
+        elif rrset.rdtype == wanted:
+            for rdata in rrset:
+                if wanted == dns.rdatatype.CNAME:
+                    result['answers'].append(str(rdata.target).rstrip('.'))
+                else:
+                    result['answers'].append(rdata.to_text())
+            ttls.append(rrset.ttl)
+    if result['answers']:
+        result['status'] = 'NOERROR'
+        result['ttl'] = min(ttls)
+    else:
+        result['ttl'] = negative_ttl(response)
+    return result
+
+
+def host_record(name: str, a: Dict, aaaa: Dict, cname: Dict = None) -> Dict:
+    """Merge A, AAAA and (optionally) CNAME answers into one host record.
+
+    The record is what downstream scanners consume instead of resolving the
+    host again: ``{'name', 'status', 'a', 'aaaa', 'cnames', 'ttl'}`` where
+    `cnames` is the full chain and `status` is NOERROR when the host has any
+    address, otherwise the A lookup's status.
+    """
+    cnames = a['cnames'] or aaaa['cnames']
+    if not cnames and cname is not None:
+        cnames = cname['answers']
+    ttls = [r['ttl'] for r in (a, aaaa) if r['answers']]
+    addressed = bool(a['answers'] or aaaa['answers'])
+    return {
+        'name': name,
+        'status': 'NOERROR' if addressed else a['status'],
+        'a': a['answers'],
+        'aaaa': aaaa['answers'],
+        'cnames': cnames,
+        'ttl': min(ttls) if ttls else a['ttl'],
+    }
+
+
+def host_addresses(record: Dict) -> List[str]:
+    """All IPv4 and IPv6 addresses of a host record."""
+    return record['a'] + record['aaaa']
+
+
+def host_records_path(path: str) -> str:
+    """Host records file that sits next to a subdomain list (results.txt -> results_dns.jsonl)."""
+    return f"{os.path.splitext(path)[0]}_dns.jsonl"
+
+
+def load_host_records(path: str) -> Dict[str, Dict]:
+    """Read a host records JSONL file into a name -> record mapping ({} if absent)."""
+    records = {}
+    if not path or not os.path.exists(path):
+        return records
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[record['name']] = record
+    except OSError as e:
+        logger.warning(f"Could not read host records {path}: {e}")
+    return records
+
+
+class ResolverPool:
+    """Round-robin set of resolvers with per-resolver health tracking.
+
+    Each resolver accumulates query, failure, SERVFAIL and timeout counts plus
+    a moving-average latency. Once a resolver has `min_samples` queries it is
+    evicted when its failure rate exceeds `max_failure_rate` or its average
+    latency exceeds `max_latency` seconds.
+    """
+
+    def __init__(
+        self,
+        resolvers: List[str] = None,
+        min_samples: int = 5,
+        max_failure_rate: float = 0.5,
+        max_latency: float = 1.5,
+    ):
+        self.resolvers = list(dict.fromkeys(resolvers or DEFAULT_NAMESERVERS))
+        self.min_samples = min_samples
+        self.max_failure_rate = max_failure_rate
+        self.max_latency = max_latency
+        self.health: Dict[str, Dict] = {ip: self._new_health() for ip in self.resolvers}
+        self.active: List[str] = list(self.resolvers)
+        self.evicted: List[str] = []
+        self._index = 0
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'ResolverPool':
+        """Build a pool from a resolvers file, falling back to the defaults."""
+        return cls(load_resolvers(path) or None, **kwargs)
+
+    @staticmethod
+    def _new_health() -> Dict:
+        return {'queries': 0, 'failures': 0, 'servfails': 0, 'timeouts': 0, 'lies': 0, 'latency': 0.0}
+
+    def __len__(self) -> int:
+        return len(self.active)
+
+    def __contains__(self, ip: str) -> bool:
+        return ip in self.health
+
+    def next(self) -> str:
+        """Return the next healthy resolver in round-robin order."""
+        if not self.active:
+            # Everything was evicted (e.g. the network dropped): start over
+            # rather than stalling the scan.
+            logger.warning("All resolvers evicted from pool, resetting health scores")
+            self.active = list(self.resolvers)
+            self.evicted = []
+            self.health = {ip: self._new_health() for ip in self.resolvers}
+        self._index = (self._index + 1) % len(self.active)
+        return self.active[self._index]
+
+    def record(self, ip: str, status: str, latency: float = 0.0):
+        """Account one query outcome for `ip` and evict it if unhealthy."""
+        health = self.health.get(ip)
+        if health is None:
+            return
+        if status == 'LIE':
+            # Re-verification rejected an answer this resolver already got
+            # credit for; count it as a failure without a second query.
+            health['lies'] += 1
+            health['failures'] += 1
+        else:
+            health['queries'] += 1
+            if status in FAILURE_STATUSES:
+                health['failures'] += 1
+            if status == 'SERVFAIL':
+                health['servfails'] += 1
+            elif status == 'TIMEOUT':
+                health['timeouts'] += 1
+            else:
+                health['latency'] = latency if health['queries'] == 1 else 0.8 * health['latency'] + 0.2 * latency
+
+        if health['queries'] >= self.min_samples and ip in self.active:
+            failure_rate = health['failures'] / health['queries']
+            if failure_rate > self.max_failure_rate or health['latency'] > self.max_latency:
+                self.evict(ip)
+
+    def evict(self, ip: str):
+        if ip in self.active:
+            self.active.remove(ip)
+            self.evicted.append(ip)
+            h = self.health[ip]
+            logger.debug(
+                f"Evicted resolver {ip} ({h['failures']}/{h['queries']} failures, "
+                f"{h['servfails']} SERVFAIL, {h['lies']} lies, {h['latency'] * 1000:.0f}ms avg)"
+            )
+
+    def summary(self) -> Dict:
+        """Aggregate pool statistics for reporting."""
+        return {
+            'total': len(self.resolvers),
+            'active': len(self.active),
+            'evicted': len(self.evicted),
+            'queries': sum(h['queries'] for h in self.health.values()),
+            'failures': sum(h['failures'] for h in self.health.values()),
+            'servfails': sum(h['servfails'] for h in self.health.values()),
+            'lies': sum(h['lies'] for h in self.health.values()),
+        }
+
+
+class AsyncDNSResolver:
+    """Concurrent stub resolver.
+
+    Every query is a single UDP exchange awaited on the event loop (falling
+    back to TCP on truncation), so `max_in_flight` lookups genuinely overlap
+    instead of blocking one another. Queries are sent through `pool`; when a
+    `trusted` pool is given, positive answers from untrusted resolvers are
+    confirmed there and dropped if the trusted resolvers disagree. With a
+    `cache`, unexpired answers are served from disk without a query.
+    """
+
+    def __init__(
+        self,
+        nameservers: List[str] = None,
+        max_in_flight: int = 1000,
+        query_timeout: float = 2.0,
+        retries: int = 2,
+        pool: ResolverPool = None,
+        trusted: ResolverPool = None,
+        cache: DNSCache = None,
+        port: int = 53,
+    ):
+        self.pool = pool or ResolverPool(nameservers)
+        self.trusted = trusted
+        self.cache = cache
+        self.port = port
+        self.max_in_flight = max_in_flight
+        self.query_timeout = query_timeout
+        self.retries = retries
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+        self.stats = {'queries': 0, 'timeouts': 0, 'errors': 0, 'rejected': 0}
+
+    @classmethod
+    def from_files(
+        cls,
+        resolvers_file: str = RESOLVERS_FILE,
+        trusted_file: str = TRUSTED_RESOLVERS_FILE,
+        **kwargs
+    ) -> 'AsyncDNSResolver':
+        """Build a resolver over the shipped public and trusted resolver lists."""
+        pool = ResolverPool.from_file(resolvers_file) if resolvers_file else None
+        trusted = ResolverPool.from_file(trusted_file) if trusted_file else None
+        return cls(pool=pool, trusted=trusted, **kwargs)
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created per event loop: callers such as TakeoverDetector.run() use
+        # a fresh asyncio.run() each time but keep the pool's health scores.
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _exchange(self, query: dns.message.Message, nameserver: str) -> dns.message.Message:
+        response = await dns.asyncquery.udp(query, nameserver, timeout=self.query_timeout, port=self.port)
+        if response.flags & dns.flags.TC:
+            response = await dns.asyncquery.tcp(query, nameserver, timeout=self.query_timeout, port=self.port)
+        return response
+
+    async def _query_pool(self, pool: ResolverPool, name: str, rtype: str) -> Dict:
+        """Query `pool`, moving to the next resolver on failure."""
+        status = 'TIMEOUT'
+        for _ in range(self.retries + 1):
+            nameserver = pool.next()
+            query = dns.message.make_query(name, rtype)
+            self.stats['queries'] += 1
+            started = time.monotonic()
+            try:
+                response = await self._exchange(query, nameserver)
+            except dns.exception.Timeout:
+                self.stats['timeouts'] += 1
+                pool.record(nameserver, 'TIMEOUT')
+                status = 'TIMEOUT'
+                continue
+            except (OSError, dns.exception.DNSException) as e:
+                self.stats['errors'] += 1
+                pool.record(nameserver, 'ERROR')
+                logger.debug(f"DNS query {name}/{rtype} via {nameserver} failed: {e}")
+                status = 'ERROR'
+                continue
+
+            result = parse_response(name, rtype, response)
+            result['resolver'] = nameserver
+            pool.record(nameserver, result['status'], time.monotonic() - started)
+            if result['status'] in ('SERVFAIL', 'REFUSED'):
+                status = result['status']
+                continue
+            return result
+        return empty_result(name, rtype, status)
+
+    async def query(self, name: str, rtype: str = 'A', use_cache: bool = True) -> Dict:
+        """Resolve `name`/`rtype`, serving unexpired answers from the cache."""
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cached = self.cache.get(name, rtype)
+            if cached is not None:
+                return cached
+        result = await self._query_network(name, rtype)
+        if use_cache:
+            self.cache.put(result)
+        return result
+
+    async def _query_network(self, name: str, rtype: str) -> Dict:
+        """Resolve `name`/`rtype`, retrying on other resolvers on failure."""
+        async with self.semaphore:
+            result = await self._query_pool(self.pool, name, rtype)
+            if not result['answers'] or self.trusted is None or result['resolver'] in self.trusted:
+                return result
+
+            verified = await self._query_pool(self.trusted, name, rtype)
+            if verified['answers']:
+                return verified
+            if verified['status'] in ('NXDOMAIN', 'NOANSWER'):
+                self.stats['rejected'] += 1
+                self.pool.record(result['resolver'], 'LIE')
+                logger.debug(f"Discarded unverified answer for {name}/{rtype} from {result['resolver']}")
+                return verified
+            # Trusted resolvers were unreachable; keep the unverified answer
+            # rather than losing a possibly valid host.
+            return result
+
+    async def resolve(self, name: str, rtype: str = 'A') -> List[str]:
+        """Return only the records for `name`/`rtype` (empty on any failure)."""
+        result = await self.query(name, rtype)
+        return result['answers']
+
+    async def resolve_host(self, name: str, a_result: Dict = None) -> Dict:
+        """Resolve A, AAAA and the CNAME chain of `name` in one pass.
+
+        A and AAAA are queried concurrently and normally carry the CNAME
+        chain themselves; an explicit CNAME query only runs when the A lookup
+        did not get a definitive answer (e.g. a CNAME into a lame zone that
+        SERVFAILs). Pass `a_result` to reuse an A answer already in hand.
+        """
+        lookups = [self.query(name, 'AAAA')]
+        if a_result is None:
+            lookups.append(self.query(name, 'A'))
+        aaaa, *rest = await asyncio.gather(*lookups)
+        a = a_result if a_result is not None else rest[0]
+        cname = None
+        if not a['cnames'] and not aaaa['cnames'] and a['status'] not in ('NOERROR', 'NOANSWER', 'NXDOMAIN'):
+            cname = await self.query(name, 'CNAME')
+        return host_record(name, a, aaaa, cname)
+
+    async def resolve_hosts(self, names: List[str]) -> Dict[str, Dict]:
+        """Resolve many hosts concurrently; returns name -> host record."""
+        names = list(dict.fromkeys(names))
+        records = await asyncio.gather(*[self.resolve_host(name) for name in names])
+        return dict(zip(names, records))
+
+
+class WildcardDetector:
+    """Per-zone wildcard fingerprinting with random labels.
+
+    For every zone between a hit and the scan root the detector resolves a few
+    random, almost certainly non-existent labels once and caches the union of
+    the addresses and CNAME targets they return. A hit whose answers are all
+    contained in some enclosing zone's wildcard set is a wildcard artefact.
+    """
+
+    def __init__(self, resolver: AsyncDNSResolver, probes: int = 3, rtype: str = 'A'):
+        self.resolver = resolver
+        self.probes = probes
+        self.rtype = rtype
+        self.zones: Dict[str, Dict[str, Set[str]]] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def random_label(length: int = 12) -> str:
+        return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+
+    async def _fingerprint(self, zone: str) -> Dict[str, Set[str]]:
+        results = await asyncio.gather(*[
+            # Random labels never repeat, so keep them out of the cache.
+            self.resolver.query(f"{self.random_label()}.{zone}", self.rtype, use_cache=False)
+            for _ in range(self.probes)
+        ])
+        fingerprint = {'answers': set(), 'cnames': set()}
+        definitive = 0
+        for result in results:
+            fingerprint['answers'].update(result['answers'])
+            fingerprint['cnames'].update(result['cnames'])
+            if result['status'] in ('NOERROR', 'NOANSWER', 'NXDOMAIN'):
+                definitive += 1
+        if fingerprint['answers']:
+            logger.debug(f"Wildcard detected on *.{zone}: {sorted(fingerprint['answers'])}")
+        # Only cache fingerprints backed by at least one real answer; if every
+        # probe timed out the zone is probed again on the next hit.
+        fingerprint['definitive'] = definitive > 0
+        return fingerprint
+
+    async def zone_fingerprint(self, zone: str) -> Dict[str, Set[str]]:
+        """Return the cached wildcard answer set for `zone` (probing once)."""
+        zone = zone.lower().rstrip('.')
+        if zone in self.zones:
+            return self.zones[zone]
+        # Many hits under the same zone arrive concurrently; share one probe.
+        task = self._pending.get(zone)
+        if task is None:
+            task = asyncio.ensure_future(self._fingerprint(zone))
+            self._pending[zone] = task
+        fingerprint = await task
+        if self._pending.get(zone) is task:
+            del self._pending[zone]
+        if fingerprint['definitive']:
+            self.zones[zone] = fingerprint
+        return fingerprint
+
+    async def is_wildcard(self, name: str, result: Dict, root: str) -> bool:
+        """True if `result` for `name` is explained by a wildcard under `root`."""
+        name = name.lower().rstrip('.')
+        root = root.lower().rstrip('.')
+        answers = set(result['answers'])
+        cnames = set(result['cnames'])
+        if not answers:
+            return False
+
+        labels = name.split('.')
+        for i in range(1, len(labels)):
+            zone = '.'.join(labels[i:])
+            if zone != root and not zone.endswith(f".{root}"):
+                break
+            fingerprint = await self.zone_fingerprint(zone)
+            if fingerprint['answers'] and (
+                answers <= fingerprint['answers'] or (cnames and cnames & fingerprint['cnames'])
+            ):
+                return True
+        return False
+
+    def wildcard_zones(self) -> List[str]:
+        return sorted(zone for zone, fp in self.zones.items() if fp['answers'])
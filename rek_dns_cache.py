@@ -0,0 +1,154 @@
+"""
+REK DNS Cache
+Persistent, TTL-aware DNS answer cache shared by the subdomain scanner,
+takeover detector, ASN recon and the monitor. Answers are stored in a small
+SQLite database under the results root keyed by (name, rtype) and are served
+until their record TTL runs out; NXDOMAIN/NOANSWER results are kept for the
+zone's negative-caching TTL (RFC 2308). Repeat runs therefore only hit the
+network for names whose entries have expired.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DNS_CACHE_FILE = os.path.join(_BASE_DIR, 'results', 'dns_cache.sqlite')
+
+# Only definitive answers are cached; timeouts and server failures are retried.
+CACHEABLE_STATUSES = ('NOERROR', 'NOANSWER', 'NXDOMAIN')
+
+# Bounds applied to the TTLs reported by resolvers.
+MIN_TTL = 30
+MAX_TTL = 86400
+DEFAULT_NEGATIVE_TTL = 300
+
+
+class DNSCache:
+    """SQLite-backed (name, rtype) -> answer dict cache.
+
+    Writes are buffered and flushed in batches so a brute force with tens of
+    thousands of lookups does not pay a commit per answer; lookups check the
+    buffer first. The database runs in WAL mode so the monitor daemon and an
+    interactive scan can share one file.
+    """
+
+    def __init__(self, path: str = DNS_CACHE_FILE, flush_every: int = 500):
+        self.path = path
+        self.flush_every = flush_every
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+        self._pending: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS answers ('
+            ' name TEXT NOT NULL,'
+            ' rtype TEXT NOT NULL,'
+            ' expires REAL NOT NULL,'
+            ' result TEXT NOT NULL,'
+            ' PRIMARY KEY (name, rtype))'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(name: str, rtype: str) -> tuple:
+        return name.lower().rstrip('.'), rtype.upper()
+
+    def get(self, name: str, rtype: str = 'A') -> Optional[Dict]:
+        """Return the cached answer dict, or None when missing or expired.
+
+        The returned `ttl` is the time the entry has left to live.
+        """
+        key = self._key(name, rtype)
+        now = time.time()
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                entry = self._conn.execute(
+                    'SELECT expires, result FROM answers WHERE name = ? AND rtype = ?', key
+                ).fetchone()
+        if entry is None or entry[0] <= now:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        result = json.loads(entry[1])
+        result['ttl'] = int(entry[0] - now)
+        return result
+
+    def put(self, result: Dict):
+        """Store a resolver answer dict if its status is cacheable."""
+        if result.get('status') not in CACHEABLE_STATUSES:
+            return
+        if result['status'] == 'NOERROR':
+            ttl = result.get('ttl') or MIN_TTL
+        else:
+            ttl = result.get('ttl') or DEFAULT_NEGATIVE_TTL
+        ttl = max(MIN_TTL, min(ttl, MAX_TTL))
+        key = self._key(result['name'], result['rtype'])
+        with self._lock:
+            self._pending[key] = (time.time() + ttl, json.dumps(result))
+            self.stats['stores'] += 1
+            if len(self._pending) >= self.flush_every:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        try:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO answers (name, rtype, expires, result) VALUES (?, ?, ?, ?)',
+                [(name, rtype, expires, result) for (name, rtype), (expires, result) in self._pending.items()]
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write DNS cache {self.path}: {e}")
+        self._pending.clear()
+
+    def flush(self):
+        """Write buffered answers to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def prune(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        with self._lock:
+            self._flush_locked()
+            try:
+                cur = self._conn.execute('DELETE FROM answers WHERE expires <= ?', (time.time(),))
+                self._conn.commit()
+                return cur.rowcount
+            except sqlite3.Error as e:
+                logger.warning(f"Could not prune DNS cache {self.path}: {e}")
+                return 0
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def __enter__(self) -> 'DNSCache':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_cache(path: str = DNS_CACHE_FILE) -> Optional[DNSCache]:
+    """Open the shared cache, returning None (cache disabled) if it is unusable."""
+    if not path:
+        return None
+    try:
+        return DNSCache(path)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"DNS cache disabled, could not open {path}: {e}")
+        return None
@@ -13,6 +13,10 @@ import csv
 import json
 from typing import List, Dict, Optional, Tuple
 from termcolor import colored
+from rek_cluster import drop_cluster_duplicates
+from rek_http import CACHEABLE, create_client
+from rek_parse import parse_response
+from rek_scheduler import HostScheduler
 from urllib.parse import urljoin, urlparse
 import logging
 
@@ -109,16 +113,35 @@ def compute_favicon_hash(favicon_bytes: bytes) -> str:
     b64 = base64.encodebytes(favicon_bytes).decode()
     return str(mmh3_hash(b64.encode()))
 
+def favicon_links(html: str, base_url: str) -> List[str]:
+    """Absolute favicon URLs declared by <link rel="icon"> tags, last one first."""
+    links = []
+    try:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+        for link in soup.find_all('link', rel=lambda x: x and ('icon' in x or 'shortcut' in x)):
+            href = link.get('href', '')
+            if href:
+                links.insert(0, urljoin(base_url, href))
+    except Exception:
+        pass
+    return links
+
+
 class FaviconScanner:
-    def __init__(self, timeout: int = 10, concurrency: int = 30, silent: bool = False, shodan_key: str = None):
+    def __init__(self, timeout: int = 10, concurrency: int = 30, silent: bool = False, shodan_key: str = None,
+                 per_host: int = 10, host_rate: float = 0.0, cluster_source: str = None):
         self.timeout = timeout
         self.concurrency = concurrency
+        self.per_host = per_host
+        self.host_rate = host_rate
         self.silent = silent
         self.shodan_key = shodan_key
+        self.cluster_source = cluster_source
         self.findings: List[Dict] = []
 
-    def get_favicon_urls(self, base_url: str, html: str = None) -> List[str]:
-        """Extract favicon URLs from HTML or use common paths."""
+    def get_favicon_urls(self, base_url: str, html: str = None, links: List[str] = None) -> List[str]:
+        """Extract favicon URLs from HTML (or take `links` already parsed) or use common paths."""
         favicon_paths = [
             '/favicon.ico',
             '/favicon.png',
@@ -129,78 +152,68 @@ class FaviconScanner:
         urls = [urljoin(base_url, p) for p in favicon_paths]
 
         # Try to parse from HTML if provided
-        if html:
-            try:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(html, 'html.parser')
-                for link in soup.find_all('link', rel=lambda x: x and ('icon' in x or 'shortcut' in x)):
-                    href = link.get('href', '')
-                    if href:
-                        urls.insert(0, urljoin(base_url, href))
-            except Exception:
-                pass
-
-        return urls
+        if links is None:
+            links = favicon_links(html, base_url) if html else []
+        return links + urls
 
-    async def fetch_favicon(self, client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore) -> Optional[Tuple[str, bytes]]:
+    async def fetch_favicon(self, client: httpx.AsyncClient, url: str, scheduler: HostScheduler) -> Optional[Tuple[str, bytes]]:
         """Fetch favicon bytes from URL."""
-        async with semaphore:
-            try:
-                r = await client.get(url, timeout=self.timeout, follow_redirects=True)
-                if r.status_code == 200 and len(r.content) > 0:
-                    return (url, r.content)
-            except Exception:
-                pass
+        try:
+            r = await scheduler.request(client, 'GET', url, timeout=self.timeout, follow_redirects=True)
+            if r.status_code == 200 and len(r.content) > 0:
+                return (url, r.content)
+        except Exception:
+            pass
         return None
 
-    async def scan_host(self, client: httpx.AsyncClient, host_url: str, semaphore: asyncio.Semaphore) -> Optional[Dict]:
+    async def scan_host(self, client: httpx.AsyncClient, host_url: str, scheduler: HostScheduler) -> Optional[Dict]:
         """Scan a single host for favicon and compute its hash."""
-        async with semaphore:
+        try:
+            # Fetch main page to find favicon link
+            r = await scheduler.request(client, 'GET', host_url, timeout=self.timeout, follow_redirects=True,
+                                        extensions=CACHEABLE)
+            links = await parse_response(favicon_links, r, host_url) if r.status_code == 200 else []
+        except Exception:
+            links = []
+
+        favicon_urls = self.get_favicon_urls(host_url, links=links)
+
+        # Try each favicon URL
+        for fav_url in favicon_urls[:3]:  # Try first 3
             try:
-                # Fetch main page to find favicon link
-                r = await client.get(host_url, timeout=self.timeout, follow_redirects=True)
-                html = r.text if r.status_code == 200 else None
+                r = await scheduler.request(client, 'GET', fav_url, timeout=self.timeout, follow_redirects=True)
+                if r.status_code == 200 and len(r.content) > 100:
+                    hash_val = compute_favicon_hash(r.content)
+                    md5_hash = hashlib.md5(r.content).hexdigest()
+                    known_service = KNOWN_HASHES.get(hash_val, '')
+
+                    result = {
+                        'host': host_url,
+                        'favicon_url': fav_url,
+                        'mmh3_hash': hash_val,
+                        'md5_hash': md5_hash,
+                        'size_bytes': len(r.content),
+                        'known_service': known_service,
+                        'shodan_query': f'http.favicon.hash:{hash_val}',
+                    }
+
+                    if known_service and not self.silent:
+                        print(colored(f"[!] Known service via favicon: {known_service} @ {host_url} (hash: {hash_val})", "red"))
+                    elif not self.silent:
+                        print(colored(f"[+] Favicon hash: {hash_val} @ {host_url}", "cyan"))
+
+                    return result
             except Exception:
-                html = None
-
-            favicon_urls = self.get_favicon_urls(host_url, html)
-
-            # Try each favicon URL
-            for fav_url in favicon_urls[:3]:  # Try first 3
-                try:
-                    r = await client.get(fav_url, timeout=self.timeout, follow_redirects=True)
-                    if r.status_code == 200 and len(r.content) > 100:
-                        hash_val = compute_favicon_hash(r.content)
-                        md5_hash = hashlib.md5(r.content).hexdigest()
-                        known_service = KNOWN_HASHES.get(hash_val, '')
-
-                        result = {
-                            'host': host_url,
-                            'favicon_url': fav_url,
-                            'mmh3_hash': hash_val,
-                            'md5_hash': md5_hash,
-                            'size_bytes': len(r.content),
-                            'known_service': known_service,
-                            'shodan_query': f'http.favicon.hash:{hash_val}',
-                        }
-
-                        if known_service and not self.silent:
-                            print(colored(f"[!] Known service via favicon: {known_service} @ {host_url} (hash: {hash_val})", "red"))
-                        elif not self.silent:
-                            print(colored(f"[+] Favicon hash: {hash_val} @ {host_url}", "cyan"))
-
-                        return result
-                except Exception:
-                    pass
-            return None
+                pass
+        return None
 
     async def scan_all(self, urls: List[str]) -> List[Dict]:
         """Scan all hosts for favicons."""
-        semaphore = asyncio.Semaphore(self.concurrency)
+        scheduler = HostScheduler(self.concurrency, self.per_host, self.host_rate)
         findings = []
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        async with httpx.AsyncClient(verify=False, headers=headers, timeout=self.timeout) as client:
-            tasks = [self.scan_host(client, url, semaphore) for url in urls]
+        async with create_client(self.concurrency, timeout=self.timeout, verify=False, headers=headers, cache=True) as client:
+            tasks = [self.scan_host(client, url, scheduler) for url in urls]
             results = await asyncio.gather(*tasks, return_exceptions=True)
             for r in results:
                 if isinstance(r, dict) and r:
@@ -225,6 +238,9 @@ class FaviconScanner:
             print(colored("[!] No URLs provided", "red"))
             return []
 
+        if self.cluster_source:
+            urls = drop_cluster_duplicates(urls, self.cluster_source, by_host=True, silent=self.silent)
+
         if not self.silent:
             print(colored(f"\n[+] Favicon Hash Fingerprinting on {len(urls)} hosts...", "blue"))
 
@@ -13,6 +13,7 @@ import time
 import base64
 from typing import List, Dict, Optional, Set
 from termcolor import colored
+from rek_http import create_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -218,7 +219,7 @@ class GitHubDorker:
 
         seen_repos = set()
 
-        async with httpx.AsyncClient(verify=False, timeout=self.timeout) as client:
+        async with create_client(timeout=self.timeout, verify=False) as client:
             for i, dork in enumerate(dorks_to_run):
                 if not self.silent:
                     print(colored(f"  [*] Dork {i+1}/{len(dorks_to_run)}: {dork[:60]}...", "cyan"))
@@ -9,6 +9,9 @@ import os
 import json
 from typing import List, Dict, Optional
 from termcolor import colored
+from rek_cluster import drop_cluster_duplicates
+from rek_http import CACHEABLE, create_client
+from rek_scheduler import HostScheduler
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,10 +40,15 @@ CORS_REFLECT_ORIGINS = [
 ]
 
 class HeadersAuditor:
-    def __init__(self, timeout: int = 10, concurrency: int = 30, silent: bool = False):
+    def __init__(self, timeout: int = 10, concurrency: int = 30, silent: bool = False,
+                 per_host: int = 10, host_rate: float = 0.0,
+                 cluster_source: str = None):
         self.timeout = timeout
         self.concurrency = concurrency
+        self.per_host = per_host
+        self.host_rate = host_rate
         self.silent = silent
+        self.cluster_source = cluster_source
         self.findings: List[Dict] = []
 
     def analyze_cors(self, url: str, headers: dict, reflected_origin: str) -> List[Dict]:
@@ -121,51 +129,51 @@ class HeadersAuditor:
 
         return issues
 
-    async def audit_url(self, client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore) -> List[Dict]:
+    async def audit_url(self, client: httpx.AsyncClient, url: str, scheduler: HostScheduler) -> List[Dict]:
         """Audit a single URL for CORS and security header issues."""
-        async with semaphore:
-            url_issues = []
-            try:
-                # Normal request
-                r = await client.get(url, timeout=self.timeout, follow_redirects=True)
-                headers = dict(r.headers)
-                url_issues.extend(self.analyze_security_headers(url, headers))
-
-                # CORS probe with evil origins
-                for origin in CORS_REFLECT_ORIGINS:
-                    try:
-                        r2 = await client.get(
-                            url,
-                            headers={'Origin': origin},
-                            timeout=self.timeout,
-                            follow_redirects=True
-                        )
-                        cors_issues = self.analyze_cors(url, dict(r2.headers), origin)
-                        url_issues.extend(cors_issues)
-                        if cors_issues:
-                            break  # Found an issue, no need to test more origins
-                    except Exception:
-                        pass
-
-            except Exception as e:
-                pass
-
-            for issue in url_issues:
-                sev_color = {'High': 'red', 'Medium': 'yellow', 'Low': 'cyan', 'Info': 'white'}.get(issue.get('severity', 'Info'), 'white')
-                if not self.silent:
-                    print(colored(f"[{issue['severity']}] {issue['issue']} @ {url}", sev_color))
+        url_issues = []
+        try:
+            # Normal request
+            r = await scheduler.request(client, 'GET', url, timeout=self.timeout, follow_redirects=True,
+                                        extensions=CACHEABLE)
+            headers = dict(r.headers)
+            url_issues.extend(self.analyze_security_headers(url, headers))
+
+            # CORS probe with evil origins
+            for origin in CORS_REFLECT_ORIGINS:
+                try:
+                    r2 = await scheduler.request(
+                        client, 'GET', url,
+                        headers={'Origin': origin},
+                        timeout=self.timeout,
+                        follow_redirects=True
+                    )
+                    cors_issues = self.analyze_cors(url, dict(r2.headers), origin)
+                    url_issues.extend(cors_issues)
+                    if cors_issues:
+                        break  # Found an issue, no need to test more origins
+                except Exception:
+                    pass
+
+        except Exception as e:
+            pass
+
+        for issue in url_issues:
+            sev_color = {'High': 'red', 'Medium': 'yellow', 'Low': 'cyan', 'Info': 'white'}.get(issue.get('severity', 'Info'), 'white')
+            if not self.silent:
+                print(colored(f"[{issue['severity']}] {issue['issue']} @ {url}", sev_color))
 
-            return url_issues
+        return url_issues
 
     async def audit_all(self, urls: List[str]) -> List[Dict]:
         """Audit all URLs concurrently."""
-        semaphore = asyncio.Semaphore(self.concurrency)
+        scheduler = HostScheduler(self.concurrency, self.per_host, self.host_rate)
         all_issues = []
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
         }
-        async with httpx.AsyncClient(verify=False, headers=headers, timeout=self.timeout) as client:
-            tasks = [self.audit_url(client, url, semaphore) for url in urls]
+        async with create_client(self.concurrency, timeout=self.timeout, verify=False, headers=headers, cache=True) as client:
+            tasks = [self.audit_url(client, url, scheduler) for url in urls]
             results = await asyncio.gather(*tasks, return_exceptions=True)
             for result in results:
                 if isinstance(result, list):
@@ -190,6 +198,9 @@ class HeadersAuditor:
             print(colored("[!] No URLs provided for headers audit", "red"))
             return []
 
+        if self.cluster_source:
+            urls = drop_cluster_duplicates(urls, self.cluster_source, by_host=True, silent=self.silent)
+
         if not self.silent:
             print(colored(f"\n[+] Starting Headers/CORS Audit on {len(urls)} URLs...", "blue"))
 
@@ -0,0 +1,207 @@
+"""
+REK Hostname Set
+Compact, array-backed set of hostnames for subdomain lists that run into the
+millions (permutation output, merged tool results).
+
+Each hostname is kept in a single bytearray as its leftmost label, stored
+inline as UTF-8, followed by a short run of varint ids for the remaining
+labels. Every distinct suffix label (`api`, `example`, `com`) is stored once,
+and an open-addressing hash table of offsets indexes the entries. Leftmost
+labels are not interned because in permutation and brute-force output they
+are almost all distinct. A typical FQDN costs ~25 bytes instead of the ~110 a
+`str` in a `set` needs. Iteration is always in sorted order.
+"""
+from array import array
+from typing import Dict, Iterable, Iterator, List
+
+_EMPTY = 0xFFFFFFFF
+_MAX_LOAD = 0.7
+
+
+def _encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _decode_varint(data, pos: int):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class HostnameSet:
+    """Set of hostnames with add/contains/sorted-iteration and `|`.
+
+    Names are normalised to lower case without a trailing dot.
+    """
+
+    def __init__(self, hostnames: Iterable[str] = None, capacity: int = 1024):
+        # suffix label -> varint-encoded id, and id -> label
+        self._label_codes: Dict[str, bytes] = {}
+        self._labels: List[str] = []
+        # Entries are <varint payload length><payload> back to back; a payload
+        # is <varint length><leftmost label> then the suffix label ids.
+        self._data = bytearray()
+        size = 1024
+        while size * _MAX_LOAD < capacity:
+            size *= 2
+        # Open-addressing table of entry offsets (linear probing).
+        self._slots = array('I', [_EMPTY]) * size
+        self._count = 0
+        if hostnames is not None:
+            self.update(hostnames)
+
+    @staticmethod
+    def _normalise(hostname: str) -> str:
+        return hostname.strip().lower().rstrip('.')
+
+    def _intern(self, labels: List[str]):
+        for label in labels:
+            if label not in self._label_codes:
+                self._label_codes[label] = _encode_varint(len(self._labels))
+                self._labels.append(label)
+
+    def _payload(self, hostname: str, intern: bool) -> bytes:
+        """Encoded entry for a normalised name; KeyError for an unknown suffix label unless `intern`."""
+        first, _, suffix = hostname.partition('.')
+        first = first.encode()
+        parts = [_encode_varint(len(first)), first]
+        if suffix:
+            labels = suffix.split('.')
+            codes = self._label_codes
+            try:
+                parts.extend([codes[label] for label in labels])
+            except KeyError:
+                if not intern:
+                    raise
+                self._intern(labels)
+                parts.extend([codes[label] for label in labels])
+        return b''.join(parts)
+
+    def _payload_at(self, offset: int) -> bytearray:
+        size = self._data[offset]
+        if size < 0x80:
+            return self._data[offset + 1:offset + 1 + size]
+        size, start = _decode_varint(self._data, offset)
+        return self._data[start:start + size]
+
+    def _find(self, payload: bytes) -> int:
+        """Slot index holding `payload`, or the empty slot where it belongs."""
+        slots = self._slots
+        mask = len(slots) - 1
+        index = hash(payload) & mask
+        while True:
+            offset = slots[index]
+            if offset == _EMPTY or self._payload_at(offset) == payload:
+                return index
+            index = (index + 1) & mask
+
+    def _grow(self):
+        old_slots = self._slots
+        size = len(old_slots) * 2
+        self._slots = slots = array('I', [_EMPTY]) * size
+        mask = size - 1
+        for offset in old_slots:
+            if offset == _EMPTY:
+                continue
+            index = hash(bytes(self._payload_at(offset))) & mask
+            while slots[index] != _EMPTY:
+                index = (index + 1) & mask
+            slots[index] = offset
+
+    def add(self, hostname: str):
+        hostname = self._normalise(hostname)
+        if not hostname:
+            return
+        payload = self._payload(hostname, intern=True)
+        index = self._find(payload)
+        if self._slots[index] != _EMPTY:
+            return
+        self._slots[index] = len(self._data)
+        self._data += _encode_varint(len(payload))
+        self._data += payload
+        self._count += 1
+        if self._count > len(self._slots) * _MAX_LOAD:
+            self._grow()
+
+    def update(self, hostnames: Iterable[str]):
+        for hostname in hostnames:
+            self.add(hostname)
+
+    def __contains__(self, hostname: object) -> bool:
+        if not isinstance(hostname, str):
+            return False
+        try:
+            payload = self._payload(self._normalise(hostname), intern=False)
+        except KeyError:
+            return False
+        return self._slots[self._find(payload)] != _EMPTY
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _decode(self, offset: int) -> str:
+        payload = self._payload_at(offset)
+        size, pos = _decode_varint(payload, 0)
+        labels = [payload[pos:pos + size].decode()]
+        pos += size
+        while pos < len(payload):
+            label_id, pos = _decode_varint(payload, pos)
+            labels.append(self._labels[label_id])
+        return '.'.join(labels)
+
+    def _offsets(self) -> Iterator[int]:
+        """Entry offsets in insertion order."""
+        pos = 0
+        end = len(self._data)
+        while pos < end:
+            offset = pos
+            size, pos = _decode_varint(self._data, pos)
+            pos += size
+            yield offset
+
+    def iter_sorted(self) -> Iterator[str]:
+        """Yield hostnames in sorted order.
+
+        Entries are bucketed by the first byte of their leftmost label (UTF-8
+        preserves code point order) and only one bucket is decoded and sorted
+        at a time, so the full list of strings is never materialised.
+        """
+        data = self._data
+        buckets: Dict[int, array] = {}
+        for offset in self._offsets():
+            _, start = _decode_varint(data, offset)
+            size, start = _decode_varint(data, start)
+            first_byte = data[start] if size else -1
+            bucket = buckets.get(first_byte)
+            if bucket is None:
+                bucket = buckets[first_byte] = array('I')
+            bucket.append(offset)
+        for first_byte in sorted(buckets):
+            yield from sorted(self._decode(offset) for offset in buckets.pop(first_byte))
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_sorted()
+
+    def __or__(self, other: Iterable[str]) -> 'HostnameSet':
+        merged = HostnameSet(self, capacity=len(self))
+        merged.update(other)
+        return merged
+
+    __ror__ = __or__
+
+    def __ior__(self, other: Iterable[str]) -> 'HostnameSet':
+        self.update(other)
+        return self
+
+    def __repr__(self) -> str:
+        return f"HostnameSet({self._count} hostnames, {len(self._labels)} suffix labels)"
@@ -0,0 +1,380 @@
+"""
+REK HTTP Clients
+Shared factory for the httpx clients used by rek.py and the rek_* modules.
+Keep-alive pools are sized to the caller's concurrency so connections are
+reused instead of re-handshaked once more than a handful of requests are in
+flight, HTTP/2 can be switched on to multiplex requests to one host over a
+single connection, and every client counts the requests, connections and TLS
+handshakes it made.
+
+Clients created with `cache=True` can also share a run-scoped response cache
+for the few pages every module fetches, such as a host's root page. Only GET
+requests sent with `extensions=CACHEABLE` use it. If such a response was read
+to the end, it is kept in an in-memory LRU (spilling to a temporary directory
+once the memory cap is reached), so the next module is served from memory
+instead of fetching it again. Brute-force and fuzzing requests on the same
+client are never cached.
+
+HTTP/2 needs the optional `h2` package (`pip install httpx[http2]`); without
+it clients fall back to HTTP/1.1.
+"""
+import atexit
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Idle connections are kept this long (seconds) before being closed.
+KEEPALIVE_EXPIRY = 30.0
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Request headers that change the response and are therefore part of the
+# cache key. The User-Agent is deliberately left out so modules share entries.
+CACHE_KEY_HEADERS = ('accept', 'accept-language', 'authorization', 'cookie', 'origin', 'range')
+
+# Request extension that marks a GET as worth caching; pass
+# `extensions=CACHEABLE` on requests whose response later modules reuse.
+CACHE_EXTENSION = 'rek_cache'
+CACHEABLE = {CACHE_EXTENSION: True}
+
+# Process-wide default for clients created without an explicit `http2`.
+_http2_default = False
+
+# Run-scoped response cache used by clients created without an explicit one.
+_response_cache = None
+
+
+def set_http2_default(enabled: bool):
+    """Enable or disable HTTP/2 for clients that do not choose explicitly."""
+    global _http2_default
+    if enabled and not HTTP2_AVAILABLE:
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+    _http2_default = bool(enabled) and HTTP2_AVAILABLE
+
+
+class ResponseCache:
+    """Run-scoped LRU of complete GET responses, keyed by URL and the
+    request headers in CACHE_KEY_HEADERS.
+
+    Entries live in memory up to `max_bytes`; least recently used entries are
+    then moved to files under `spill_dir` (a temporary directory when True)
+    until `max_disk_bytes` is reached, and dropped after that. Only
+    responses that were read to the end, are at most `max_entry_bytes` long
+    and are not 429 or 5xx are stored.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, spill_dir=None,
+                 max_disk_bytes: int = 512 * 1024 * 1024, max_entry_bytes: int = 2 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'spilled': 0}
+        self._memory: 'OrderedDict[str, Tuple]' = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: Dict[str, Tuple[str, int]] = {}
+        self._disk_bytes = 0
+        self._owns_spill_dir = spill_dir is True
+        if spill_dir is True:
+            spill_dir = tempfile.mkdtemp(prefix='rek-http-cache-')
+        elif spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        self.spill_dir = spill_dir or None
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        parts = [request.method, str(request.url)]
+        parts.extend(f"{name}:{request.headers.get(name, '')}" for name in CACHE_KEY_HEADERS)
+        return '\n'.join(parts)
+
+    @staticmethod
+    def _entry_size(entry: Tuple) -> int:
+        status, headers, body, extensions = entry
+        return len(body) + sum(len(k) + len(v) for k, v in headers) + 64
+
+    def get(self, key: str) -> Optional[Tuple]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        elif key in self._disk:
+            path, size = self._disk.pop(key)
+            self._disk_bytes -= size
+            try:
+                with open(path, 'rb') as f:
+                    entry = pickle.load(f)
+                os.remove(path)
+            except (OSError, pickle.PickleError, EOFError):
+                entry = None
+            if entry is not None:
+                self._store(key, entry)
+        self.stats['hits' if entry is not None else 'misses'] += 1
+        return entry
+
+    def put(self, key: str, status: int, headers: Iterable[Tuple[bytes, bytes]], body: bytes, extensions: Dict):
+        entry = (status, list(headers), body, extensions)
+        if self._entry_size(entry) > self.max_entry_bytes:
+            return
+        self._store(key, entry)
+        self.stats['stores'] += 1
+
+    def _store(self, key: str, entry: Tuple):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= self._entry_size(old)
+        self._memory[key] = entry
+        self._memory_bytes += self._entry_size(entry)
+        while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+            old_key, old_entry = self._memory.popitem(last=False)
+            self._memory_bytes -= self._entry_size(old_entry)
+            self._spill(old_key, old_entry)
+
+    def _spill(self, key: str, entry: Tuple):
+        size = self._entry_size(entry)
+        if not self.spill_dir or self._disk_bytes + size > self.max_disk_bytes:
+            return
+        path = os.path.join(self.spill_dir, hashlib.sha1(key.encode()).hexdigest())
+        try:
+            with open(path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            logger.warning(f"Could not spill response cache entry to {path}: {e}")
+            return
+        self._disk[key] = (path, size)
+        self._disk_bytes += size
+        self.stats['spilled'] += 1
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._disk)
+
+    def clear(self):
+        """Drop every entry and remove spilled files."""
+        self._memory.clear()
+        self._memory_bytes = 0
+        for path, _ in self._disk.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._disk.clear()
+        self._disk_bytes = 0
+
+    def close(self):
+        self.clear()
+        if self._owns_spill_dir and self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def summary(self) -> str:
+        return (f"{self.stats['hits']} hits, {self.stats['misses']} misses, "
+                f"{len(self)} entries ({self.stats['spilled']} spilled to disk)")
+
+
+def enable_response_cache(max_bytes: int = 64 * 1024 * 1024, spill: bool = True) -> ResponseCache:
+    """Install the run-scoped cache used by every client created afterwards."""
+    global _response_cache
+    if _response_cache is not None:
+        _response_cache.close()
+    _response_cache = ResponseCache(max_bytes=max_bytes, spill_dir=True if spill else None)
+    atexit.register(_response_cache.close)
+    return _response_cache
+
+
+def disable_response_cache():
+    global _response_cache
+    if _response_cache is not None:
+        _response_cache.close()
+    _response_cache = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    return _response_cache
+
+
+class _TeeStream(httpx.AsyncByteStream):
+    """Passes a response body through, handing the full body to `on_complete`
+    if it was read to the end without exceeding `limit` bytes."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, limit: int, on_complete):
+        self._stream = stream
+        self._limit = limit
+        self._on_complete = on_complete
+        self._buffer = bytearray()
+        self._complete = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            if self._buffer is not None:
+                self._buffer += chunk
+                if len(self._buffer) > self._limit:
+                    self._buffer = None
+            yield chunk
+        self._complete = True
+
+    async def aclose(self):
+        await self._stream.aclose()
+        if self._complete and self._buffer is not None:
+            self._on_complete(bytes(self._buffer))
+            self._buffer = None
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Serves CACHEABLE GET requests from a ResponseCache and fills it from `transport`."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: ResponseCache):
+        self._transport = transport
+        self.cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Conditional requests revalidate against the origin; a cached 304
+        # must never answer a later unconditional GET.
+        if (request.method != 'GET' or not request.extensions.get(CACHE_EXTENSION)
+                or 'if-none-match' in request.headers or 'if-modified-since' in request.headers):
+            return await self._transport.handle_async_request(request)
+        key = self.cache.key(request)
+        entry = self.cache.get(key)
+        if entry is not None:
+            status, headers, body, extensions = entry
+            return httpx.Response(status, headers=headers, stream=httpx.ByteStream(body),
+                                  extensions=dict(extensions), request=request)
+
+        response = await self._transport.handle_async_request(request)
+        if response.status_code == 429 or response.status_code >= 500:
+            return response
+        headers = response.headers.raw
+        extensions = {name: value for name, value in response.extensions.items()
+                      if name in ('http_version', 'reason_phrase')}
+        response.stream = _TeeStream(
+            response.stream, self.cache.max_entry_bytes,
+            lambda body: self.cache.put(key, response.status_code, headers, body, extensions)
+        )
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class PoolStats:
+    """Request and connection counters fed by httpcore trace events.
+
+    Only requests that reach the network are counted, so responses served
+    from the cache do not inflate requests per connection.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self.http2_connections = 0
+        self.connect_failures = 0
+
+    async def on_request(self, request: httpx.Request):
+        request.extensions['trace'] = self.trace
+
+    async def trace(self, event: str, info: Dict):
+        if event.endswith('.send_request_headers.started'):
+            self.requests += 1
+        elif event == 'connection.connect_tcp.complete':
+            self.connections += 1
+        elif event == 'connection.connect_tcp.failed':
+            self.connect_failures += 1
+        elif event == 'connection.start_tls.complete':
+            self.tls_handshakes += 1
+            stream = info.get('return_value')
+            ssl_object = stream.get_extra_info('ssl_object') if stream is not None else None
+            if ssl_object is not None and ssl_object.selected_alpn_protocol() == 'h2':
+                self.http2_connections += 1
+
+    @property
+    def requests_per_connection(self) -> float:
+        return self.requests / self.connections if self.connections else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'connections': self.connections,
+            'tls_handshakes': self.tls_handshakes,
+            'http2_connections': self.http2_connections,
+            'connect_failures': self.connect_failures,
+            'requests_per_connection': round(self.requests_per_connection, 2),
+        }
+
+    def summary(self) -> str:
+        text = (f"{self.requests} requests over {self.connections} connections "
+                f"({self.tls_handshakes} TLS handshakes")
+        if self.http2_connections:
+            text += f", {self.http2_connections} HTTP/2"
+        return text + ")"
+
+
+class PooledClient(httpx.AsyncClient):
+    """httpx.AsyncClient with a concurrency-sized pool and `stats`.
+
+    `cache=True` uses the run-scoped response cache for CACHEABLE requests,
+    if one is enabled; a ResponseCache uses that cache instead. Clients are
+    not cached by default.
+    """
+
+    def __init__(self, concurrency: int = 100, http2: Optional[bool] = None, cache=False, **kwargs):
+        self.stats = PoolStats()
+        if http2 is None:
+            http2 = _http2_default
+        elif http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        concurrency = max(1, concurrency)
+        limits = kwargs.pop('limits', None) or httpx.Limits(
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        if cache is True:
+            cache = _response_cache
+        elif cache is False:
+            cache = None
+        if cache is not None and 'transport' not in kwargs:
+            transport = httpx.AsyncHTTPTransport(
+                verify=kwargs.get('verify', True), http2=http2, limits=limits,
+            )
+            kwargs['transport'] = CachingTransport(transport, cache)
+        self.cache = cache
+        event_hooks = {key: list(hooks) for key, hooks in (kwargs.pop('event_hooks', None) or {}).items()}
+        event_hooks.setdefault('request', []).insert(0, self.stats.on_request)
+        super().__init__(http2=http2, limits=limits, event_hooks=event_hooks, **kwargs)
+
+
+def create_client(
+    concurrency: int = 100,
+    timeout: float = 10,
+    http2: Optional[bool] = None,
+    verify: bool = True,
+    headers: Optional[Dict[str, str]] = None,
+    follow_redirects: bool = False,
+    **kwargs,
+) -> PooledClient:
+    """Create an AsyncClient whose keep-alive pool matches `concurrency`.
+
+    `http2=None` uses the process-wide default (see `set_http2_default`);
+    `cache=True` opts in to the run-scoped response cache (see PooledClient).
+    """
+    return PooledClient(
+        concurrency=concurrency,
+        http2=http2,
+        timeout=timeout,
+        verify=verify,
+        headers=headers,
+        follow_redirects=follow_redirects,
+        **kwargs,
+    )
@@ -0,0 +1,163 @@
+"""
+REK HTTP Metadata Store
+Persistent per-URL record of what the HTTP status checker saw last time:
+status, validators (ETag / Last-Modified), a hash of the first
+BODY_HASH_BYTES of the body, title and server. Repeat scans send the
+validators as If-None-Match / If-Modified-Since so unchanged pages answer 304
+without a body, and each result's fingerprint is compared with the stored one
+to report only what changed since the previous run.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HTTP_META_FILE = os.path.join(_BASE_DIR, 'results', 'http_meta.sqlite')
+
+# Body prefix hashed into the fingerprint. A fixed length keeps the hash
+# independent of how the response happened to be chunked.
+BODY_HASH_BYTES = 16 * 1024
+
+_COLUMNS = ('url', 'status_code', 'etag', 'last_modified', 'body_hash', 'title', 'server', 'final_url',
+            'fingerprint', 'updated')
+
+
+def fingerprint(result: Dict) -> str:
+    """Hash of the parts of a result that make a host look different."""
+    parts = (result.get('status_code'), result.get('final_url') or result.get('url'), result.get('title'),
+             result.get('server'), result.get('body_hash'))
+    return hashlib.sha1('\x00'.join('' if p is None else str(p) for p in parts).encode()).hexdigest()
+
+
+class HTTPMetaStore:
+    """SQLite-backed url -> last response metadata.
+
+    Writes are buffered and flushed in batches like DNSCache; lookups check
+    the buffer first.
+    """
+
+    def __init__(self, path: str = HTTP_META_FILE, flush_every: int = 500):
+        self.path = path
+        self.flush_every = flush_every
+        self.stats = {'new': 0, 'changed': 0, 'unchanged': 0, 'revalidated': 0, 'failed': 0}
+        self._pending: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' url TEXT PRIMARY KEY,'
+            ' status_code INTEGER,'
+            ' etag TEXT,'
+            ' last_modified TEXT,'
+            ' body_hash TEXT,'
+            ' title TEXT,'
+            ' server TEXT,'
+            ' final_url TEXT,'
+            ' fingerprint TEXT NOT NULL,'
+            ' updated REAL NOT NULL)'
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the stored metadata dict for `url`, or None."""
+        with self._lock:
+            row = self._pending.get(url)
+            if row is None:
+                row = self._conn.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM responses WHERE url = ?", (url,)
+                ).fetchone()
+        return dict(zip(_COLUMNS, row)) if row is not None else None
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for a stored 200 response."""
+        headers = {}
+        if entry and entry['status_code'] == 200:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def update(self, result: Dict, previous: Optional[Dict] = None) -> str:
+        """Store `result` and classify it against `previous`.
+
+        Returns 'new', 'changed', 'unchanged', 'revalidated' (the server
+        answered 304) or 'failed'. Failed probes (no status code) are neither
+        stored nor counted as changes, so a flaky host keeps its last entry.
+        """
+        if result.get('revalidated'):
+            state = 'revalidated'
+        elif result.get('status_code') is None:
+            state = 'failed'
+        else:
+            result['fingerprint'] = fingerprint(result)
+            if previous is None:
+                state = 'new'
+            elif previous['fingerprint'] == result['fingerprint']:
+                state = 'unchanged'
+            else:
+                state = 'changed'
+            row = (result['url'], result['status_code'], result.get('etag'), result.get('last_modified'),
+                   result.get('body_hash'), result.get('title'), result.get('server'), result.get('final_url'),
+                   result['fingerprint'], time.time())
+            with self._lock:
+                self._pending[result['url']] = row
+                if len(self._pending) >= self.flush_every:
+                    self._flush_locked()
+        self.stats[state] += 1
+        return state
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        try:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO responses ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                list(self._pending.values())
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write HTTP metadata {self.path}: {e}")
+        self._pending.clear()
+
+    def flush(self):
+        """Write buffered entries to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def summary(self) -> str:
+        return ', '.join(f"{count} {state}" for state, count in self.stats.items())
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def __enter__(self) -> 'HTTPMetaStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_meta_store(path: str = HTTP_META_FILE) -> Optional[HTTPMetaStore]:
+    """Open the metadata store, returning None (revalidation disabled) if it is unusable."""
+    if not path:
+        return None
+    try:
+        return HTTPMetaStore(path)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"HTTP metadata store disabled, could not open {path}: {e}")
+        return None
@@ -14,6 +14,7 @@ import hashlib
 from datetime import datetime, timedelta
 from typing import Dict, List, Set, Optional
 from termcolor import colored
+from rek_dns_cache import open_cache
 import logging
 import threading
 
@@ -254,6 +255,13 @@ class ContinuousMonitor:
                 for domain in domains:
                     self.run_check(domain)
 
+                # Answers are shared with the takeover checks on the next run;
+                # drop the ones that have expired so the cache stays small.
+                cache = open_cache()
+                if cache is not None:
+                    self.log(f"[*] Pruned {cache.prune()} expired DNS cache entries", 'info')
+                    cache.close()
+
                 next_run = datetime.utcnow() + timedelta(minutes=self.interval_minutes)
                 self.log(f"[*] Next check at {next_run.strftime('%Y-%m-%d %H:%M:%S')} UTC", 'info')
 
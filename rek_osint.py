@@ -29,6 +29,8 @@ from urllib.parse import quote_plus, urlparse
 
 try:
     import httpx
+    from rek_http import CACHEABLE, create_client
+    from rek_parse import parse_response
     _HTTPX_OK = True
 except ImportError:
     _HTTPX_OK = False
@@ -236,6 +238,30 @@ async def _hunter_search(
     return emails
 
 
+def _page_emails(html: str, domain: str) -> Set[str]:
+    """Addresses under `domain` in the visible text of a results page."""
+    text = BeautifulSoup(html, "html.parser").get_text(" ")
+    return {e for e in _extract_emails(text) if domain in e}
+
+
+def _bing_dork_results(html: str, dork: str) -> List[Dict]:
+    """Top Bing results (<li class="b_algo">) of a dork query."""
+    results = []
+    soup = BeautifulSoup(html, "html.parser")
+    for result_li in soup.select("li.b_algo")[:5]:
+        link_tag = result_li.select_one("h2 a")
+        snippet_tag = result_li.select_one(".b_caption p")
+        if link_tag and link_tag.get("href", "").startswith("http"):
+            snippet = snippet_tag.get_text(strip=True) if snippet_tag else ""
+            results.append({
+                "dork":       dork,
+                "result_url": link_tag["href"],
+                "snippet":    snippet[:300],
+                "engine":     "bing",
+            })
+    return results
+
+
 async def _scrape_search_emails(
     client: "httpx.AsyncClient",
     domain: str,
@@ -266,11 +292,8 @@ async def _scrape_search_emails(
         }
         r = await client.get(search_url, headers=headers, timeout=15, follow_redirects=True)
         if r.status_code == 200 and _BS4_OK:
-            soup = BeautifulSoup(r.text, "html.parser")
-            text = soup.get_text(" ")
-            emails = _extract_emails(text)
-            # Filter to target domain only
-            emails = {e for e in emails if domain in e}
+            # Parsed in the parse pool; only target-domain addresses are kept
+            emails = await parse_response(_page_emails, r, domain)
             if not silent and emails:
                 print(colored(f"  [+] {engine} scrape: {len(emails)} emails", "green"))
         await asyncio.sleep(2)  # Respectful delay between search engines
@@ -295,7 +318,7 @@ async def harvest_emails_async(
         logger.warning("httpx not installed — email harvesting unavailable")
         return []
 
-    async with httpx.AsyncClient(verify=False, timeout=20) as client:
+    async with create_client(timeout=20, verify=False) as client:
         # Source 1: Hunter.io (if key provided)
         if hunter_api_key:
             hunter_emails = await _hunter_search(client, domain, hunter_api_key, silent=silent)
@@ -334,7 +357,7 @@ async def detect_technologies_async(
     headers_captured: Dict[str, str] = {}
 
     try:
-        r = await client.get(url, timeout=15, follow_redirects=True)
+        r = await client.get(url, timeout=15, follow_redirects=True, extensions=CACHEABLE)
         headers_captured = dict(r.headers)
         body = r.text
 
@@ -539,7 +562,7 @@ async def google_dork_async(
         return results
 
     if client is None:
-        client = httpx.AsyncClient(verify=False, timeout=15)
+        client = create_client(timeout=15, verify=False)
         should_close = True
 
     try:
@@ -556,20 +579,8 @@ async def google_dork_async(
                 r = await client.get(bing_url, headers=headers, timeout=15, follow_redirects=True)
 
                 if r.status_code == 200 and _BS4_OK:
-                    soup = BeautifulSoup(r.text, "html.parser")
                     # Bing result links are in <li class="b_algo"> tags
-                    for result_li in soup.select("li.b_algo")[:5]:
-                        link_tag = result_li.select_one("h2 a")
-                        snippet_tag = result_li.select_one(".b_caption p")
-                        if link_tag and link_tag.get("href", "").startswith("http"):
-                            result_url = link_tag["href"]
-                            snippet = snippet_tag.get_text(strip=True) if snippet_tag else ""
-                            results.append({
-                                "dork":       dork,
-                                "result_url": result_url,
-                                "snippet":    snippet[:300],
-                                "engine":     "bing",
-                            })
+                    results.extend(await parse_response(_bing_dork_results, r, dork))
                 elif r.status_code == 200 and not _BS4_OK:
                     # Fallback: extract URLs with regex
                     urls_found = re.findall(r'href="(https?://[^"]+)"', r.text)
@@ -638,7 +649,7 @@ class OSINTEngine:
 
     def detect_technologies(self, url: str) -> Dict:
         async def _run():
-            async with httpx.AsyncClient(verify=False, timeout=self.timeout) as client:
+            async with create_client(timeout=self.timeout, verify=False, cache=True) as client:
                 return await detect_technologies_async(url, client, silent=self.silent)
         return asyncio.run(_run())
 
@@ -646,7 +657,7 @@ class OSINTEngine:
         key = api_key or self.hibp_api_key
 
         async def _run():
-            async with httpx.AsyncClient(verify=False, timeout=self.timeout) as client:
+            async with create_client(timeout=self.timeout, verify=False) as client:
                 return await check_breach_async(email, key, client, silent=self.silent)
 
         return asyncio.run(_run())
@@ -680,7 +691,7 @@ class OSINTEngine:
         }
 
         async def _run_all():
-            async with httpx.AsyncClient(verify=False, timeout=self.timeout) as client:
+            async with create_client(timeout=self.timeout, verify=False, cache=True) as client:
 
                 # 1. Certificate transparency
                 if not self.silent:
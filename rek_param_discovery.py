@@ -12,9 +12,14 @@ import os
 import json
 import random
 import string
-from typing import List, Dict, Set, Optional, Tuple
+from typing import List, Dict, Set, Optional, Sequence, Tuple
 from urllib.parse import urlencode, urlparse, parse_qs, urljoin
 from termcolor import colored
+from rek_cluster import drop_cluster_duplicates
+from rek_http import CACHEABLE, create_client
+from rek_parse import parse_response
+from rek_scheduler import HostScheduler
+from rek_wordlist import open_wordlist
 import logging
 
 logger = logging.getLogger(__name__)
@@ -82,122 +87,125 @@ def extract_params_from_source(content: str) -> Set[str]:
     return params
 
 class ParamDiscovery:
-    def __init__(self, timeout: int = 10, concurrency: int = 20, silent: bool = False, wordlist_path: str = None):
+    def __init__(self, timeout: int = 10, concurrency: int = 20, silent: bool = False, wordlist_path: str = None,
+                 per_host: int = 10, host_rate: float = 0.0,
+                 cluster_source: str = None):
         self.timeout = timeout
         self.concurrency = concurrency
+        self.per_host = per_host
+        self.host_rate = host_rate
         self.silent = silent
         self.wordlist_path = wordlist_path
+        self.cluster_source = cluster_source
         self.findings: List[Dict] = []
 
-    def load_wordlist(self) -> List[str]:
-        """Load parameter wordlist."""
+    def load_wordlist(self) -> Sequence[str]:
+        """Load parameter wordlist (memory-mapped and shared, so per-URL calls are cheap)."""
         if self.wordlist_path and os.path.exists(self.wordlist_path):
             try:
-                with open(self.wordlist_path) as f:
-                    return [line.strip() for line in f if line.strip()]
+                return open_wordlist(self.wordlist_path)
             except Exception:
                 pass
         return DEFAULT_PARAMS
 
-    async def probe_params_get(self, client: httpx.AsyncClient, url: str, params: List[str], semaphore: asyncio.Semaphore) -> List[str]:
+    async def probe_params_get(self, client: httpx.AsyncClient, url: str, params: Sequence[str], scheduler: HostScheduler) -> List[str]:
         """Probe GET parameters via reflection detection."""
-        async with semaphore:
-            discovered = []
-            # First get baseline response
+        discovered = []
+        # First get baseline response
+        try:
+            baseline = await scheduler.request(client, 'GET', url, timeout=self.timeout, follow_redirects=True,
+                                               extensions=CACHEABLE)
+            baseline_len = len(baseline.content)
+            baseline_status = baseline.status_code
+        except Exception:
+            return []
+
+        # Test params in batches of 20
+        batch_size = 20
+        for i in range(0, len(params), batch_size):
+            batch = params[i:i + batch_size]
+            # Create a unique marker for each param
+            markers = {p: random_string(8) for p in batch}
+            query = '&'.join(f"{p}={markers[p]}" for p in batch)
+            test_url = f"{url}{'&' if '?' in url else '?'}{query}"
+
             try:
-                baseline = await client.get(url, timeout=self.timeout, follow_redirects=True)
-                baseline_len = len(baseline.content)
-                baseline_status = baseline.status_code
+                r = await scheduler.request(client, 'GET', test_url, timeout=self.timeout, follow_redirects=True)
+                response_text = r.text
+
+                # Check which markers appear in the response (reflected params)
+                for param, marker in markers.items():
+                    if marker in response_text:
+                        discovered.append(param)
+                        if not self.silent:
+                            print(colored(f"    [+] Reflected param: {param} @ {url}", "green"))
             except Exception:
-                return []
+                pass
+
+            await asyncio.sleep(0.1)
 
-            # Test params in batches of 20
-            batch_size = 20
-            for i in range(0, len(params), batch_size):
-                batch = params[i:i + batch_size]
-                # Create a unique marker for each param
-                markers = {p: random_string(8) for p in batch}
-                query = '&'.join(f"{p}={markers[p]}" for p in batch)
-                test_url = f"{url}{'&' if '?' in url else '?'}{query}"
-
-                try:
-                    r = await client.get(test_url, timeout=self.timeout, follow_redirects=True)
-                    response_text = r.text
-
-                    # Check which markers appear in the response (reflected params)
-                    for param, marker in markers.items():
-                        if marker in response_text:
-                            discovered.append(param)
-                            if not self.silent:
-                                print(colored(f"    [+] Reflected param: {param} @ {url}", "green"))
-                except Exception:
-                    pass
-
-                await asyncio.sleep(0.1)
-
-            return discovered
-
-    async def probe_params_post(self, client: httpx.AsyncClient, url: str, params: List[str], semaphore: asyncio.Semaphore) -> List[str]:
+        return discovered
+
+    async def probe_params_post(self, client: httpx.AsyncClient, url: str, params: Sequence[str], scheduler: HostScheduler) -> List[str]:
         """Probe POST parameters."""
-        async with semaphore:
-            discovered = []
-            batch_size = 20
-            for i in range(0, len(params), batch_size):
-                batch = params[i:i + batch_size]
-                markers = {p: random_string(8) for p in batch}
-                data = {p: markers[p] for p in batch}
-
-                try:
-                    r = await client.post(url, data=data, timeout=self.timeout, follow_redirects=True)
-                    response_text = r.text
-                    for param, marker in markers.items():
-                        if marker in response_text:
-                            discovered.append(param)
-                            if not self.silent:
-                                print(colored(f"    [+] Reflected POST param: {param} @ {url}", "cyan"))
-                except Exception:
-                    pass
-
-                await asyncio.sleep(0.1)
-            return discovered
-
-    async def discover_params(self, client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore) -> Dict:
-        """Discover parameters for a single URL."""
-        async with semaphore:
-            wordlist = self.load_wordlist()
+        discovered = []
+        batch_size = 20
+        for i in range(0, len(params), batch_size):
+            batch = params[i:i + batch_size]
+            markers = {p: random_string(8) for p in batch}
+            data = {p: markers[p] for p in batch}
 
-            # Passive: extract from page source
-            passive_params = set()
             try:
-                r = await client.get(url, timeout=self.timeout, follow_redirects=True)
-                passive_params = extract_params_from_source(r.text)
-                # Add existing URL params
-                passive_params.update(extract_params_from_url(url))
+                r = await scheduler.request(client, 'POST', url, data=data, timeout=self.timeout, follow_redirects=True)
+                response_text = r.text
+                for param, marker in markers.items():
+                    if marker in response_text:
+                        discovered.append(param)
+                        if not self.silent:
+                            print(colored(f"    [+] Reflected POST param: {param} @ {url}", "cyan"))
             except Exception:
                 pass
 
-            # Active: probe wordlist
-            active_params = await self.probe_params_get(client, url, wordlist, asyncio.Semaphore(1))
-
-            all_params = list(set(list(passive_params) + active_params))
+            await asyncio.sleep(0.1)
+        return discovered
 
-            if all_params and not self.silent:
-                print(colored(f"[+] {url}: {len(all_params)} params ({len(passive_params)} passive, {len(active_params)} active)", "green"))
-
-            return {
-                'url': url,
-                'passive_params': sorted(passive_params),
-                'active_params': sorted(active_params),
-                'all_params': sorted(set(all_params)),
-                'param_count': len(all_params),
-            }
+    async def discover_params(self, client: httpx.AsyncClient, url: str, scheduler: HostScheduler) -> Dict:
+        """Discover parameters for a single URL."""
+        wordlist = self.load_wordlist()
+
+        # Passive: extract from page source
+        passive_params = set()
+        try:
+            r = await scheduler.request(client, 'GET', url, timeout=self.timeout, follow_redirects=True,
+                                        extensions=CACHEABLE)
+            passive_params = await parse_response(extract_params_from_source, r)
+            # Add existing URL params
+            passive_params.update(extract_params_from_url(url))
+        except Exception:
+            pass
+
+        # Active: probe wordlist
+        active_params = await self.probe_params_get(client, url, wordlist, scheduler)
+
+        all_params = list(set(list(passive_params) + active_params))
+
+        if all_params and not self.silent:
+            print(colored(f"[+] {url}: {len(all_params)} params ({len(passive_params)} passive, {len(active_params)} active)", "green"))
+
+        return {
+            'url': url,
+            'passive_params': sorted(passive_params),
+            'active_params': sorted(active_params),
+            'all_params': sorted(set(all_params)),
+            'param_count': len(all_params),
+        }
 
     async def run_async(self, urls: List[str]) -> List[Dict]:
         """Run param discovery on all URLs."""
-        semaphore = asyncio.Semaphore(self.concurrency)
+        scheduler = HostScheduler(self.concurrency, self.per_host, self.host_rate)
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        async with httpx.AsyncClient(verify=False, headers=headers, timeout=self.timeout) as client:
-            tasks = [self.discover_params(client, url, semaphore) for url in urls]
+        async with create_client(self.concurrency, timeout=self.timeout, verify=False, headers=headers, cache=True) as client:
+            tasks = [self.discover_params(client, url, scheduler) for url in urls]
             results = await asyncio.gather(*tasks, return_exceptions=True)
         return [r for r in results if isinstance(r, dict)]
 
@@ -215,6 +223,9 @@ class ParamDiscovery:
             print(colored("[!] No URLs provided", "red"))
             return []
 
+        if self.cluster_source:
+            urls = drop_cluster_duplicates(urls, self.cluster_source, by_host=True, silent=self.silent)
+
         # Focus on URLs that are likely to have parameters (prioritize endpoints, not static files)
         filtered_urls = []
         skip_exts = {'.jpg', '.jpeg', '.png', '.gif', '.css', '.woff', '.woff2', '.ico', '.svg', '.mp4'}
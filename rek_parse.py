@@ -0,0 +1,136 @@
+"""
+REK Parse Offload
+Runs CPU-bound HTML/JS parsing off the event loop. Response bodies are
+shipped as raw bytes to a shared process pool, decoded and parsed there, and
+only the extracted fields come back, so at high concurrency the loop keeps
+serving sockets while parsing uses every core.
+
+Small bodies are parsed inline: below INLINE_BYTES the pickling round trip
+costs more than a cheap parse. Callers whose parse is expensive whatever the
+body size pass `offload=True` to always leave the loop. Per-process setup
+that every worker needs (a ruleset, a compiled pattern table) is registered
+with `warm_workers`, which runs it as the pool initializer.
+"""
+import asyncio
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are parsed on the calling thread.
+INLINE_BYTES = 32 * 1024
+
+# None = one worker per CPU, 0 = always parse inline.
+_workers: Optional[int] = None
+_executor: Optional[ProcessPoolExecutor] = None
+# Functions run by every worker before its first task (see warm_workers).
+_warmups: Tuple[Callable, ...] = ()
+
+
+def set_parse_workers(workers: Optional[int]):
+    """Size the parse pool for this process (None = CPU count, 0 = disabled)."""
+    global _workers
+    shutdown_parse_pool()
+    _workers = workers
+
+
+def _pool_size() -> int:
+    return _workers or os.cpu_count() or 1
+
+
+def _run_warmups(funcs: Tuple[Callable, ...]):
+    for func in funcs:
+        try:
+            func()
+        except Exception as e:
+            logger.debug(f"Parse worker warm-up {func.__name__} failed: {e}")
+
+
+def _noop():
+    pass
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+    if _workers == 0:
+        return None
+    if _executor is None:
+        try:
+            _executor = ProcessPoolExecutor(max_workers=_pool_size(), initializer=_run_warmups,
+                                            initargs=(_warmups,))
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"Parse pool unavailable, parsing inline: {e}")
+            set_parse_workers(0)
+            return None
+    return _executor
+
+
+def shutdown_parse_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+atexit.register(shutdown_parse_pool)
+
+
+async def warm_workers(func: Callable):
+    """Run `func()` in every parse worker, including ones started later.
+
+    `func` becomes part of the pool initializer; a pool created before it was
+    registered is replaced (queued parses still finish on the old one). All
+    workers are then started and this returns once each has run `func`. With
+    the pool disabled, `func` runs once in a thread of this process.
+    """
+    global _warmups, _executor
+    if func not in _warmups:
+        _warmups += (func,)
+        if _executor is not None:
+            old, _executor = _executor, None
+            old.shutdown(wait=False)
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    if executor is None:
+        await loop.run_in_executor(None, func)
+        return
+    # Each submission made while no worker is idle starts a new worker, so
+    # one no-op per worker brings the whole pool up through the initializer.
+    try:
+        await asyncio.gather(*(loop.run_in_executor(executor, _noop) for _ in range(_pool_size())))
+    except RuntimeError:
+        pass
+
+
+def _decode_and_call(func: Callable, body: bytes, encoding: str, args: tuple) -> Any:
+    return func(body.decode(encoding or 'utf-8', errors='replace'), *args)
+
+
+async def parse_body(func: Callable, body: bytes, encoding: str = 'utf-8', *args, offload: bool = False) -> Any:
+    """Return `func(body decoded with encoding, *args)`, run in the parse pool.
+
+    `func` must be a module-level function whose arguments and result can be
+    pickled. With `offload`, small bodies go to the pool too, and a thread is
+    used when the pool is disabled, so `func` never runs on the loop.
+    """
+    executor = _get_executor() if offload or len(body) >= INLINE_BYTES else None
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        if offload:
+            return await loop.run_in_executor(None, _decode_and_call, func, body, encoding, args)
+        return _decode_and_call(func, body, encoding, args)
+    try:
+        return await loop.run_in_executor(executor, _decode_and_call, func, body, encoding, args)
+    except RuntimeError:
+        # The pool was shut down underneath us (interpreter exit).
+        return _decode_and_call(func, body, encoding, args)
+
+
+async def parse_response(func: Callable, response: httpx.Response, *args, offload: bool = False) -> Any:
+    """`parse_body` for a fully read httpx response, decoded with its charset."""
+    return await parse_body(func, response.content, response.encoding, *args, offload=offload)
@@ -0,0 +1,159 @@
+"""
+REK Passive Subdomain Sources
+Registry of passive subdomain sources (DNSDumpster, crt.sh, ...) that run
+concurrently on the event loop. Every source has its own deadline, so the
+passive phase takes as long as the slowest source allows rather than the sum
+of all of them, and one stalled service cannot hold up the run.
+
+Adding a source:
+
+    @register_source('example', deadline=60)
+    async def example_source(client, domain, retries=3, silent=False) -> Set[str]:
+        ...
+"""
+import asyncio
+from typing import Callable, Dict, List, Set
+
+import httpx
+from bs4 import BeautifulSoup
+from termcolor import colored
+from rek_http import create_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Source name -> {'func': coroutine function, 'deadline': seconds}
+PASSIVE_SOURCES: Dict[str, Dict] = {}
+
+
+def register_source(name: str, deadline: float = 60) -> Callable:
+    """Register a passive source coroutine under `name`."""
+    def decorator(func: Callable) -> Callable:
+        PASSIVE_SOURCES[name] = {'func': func, 'deadline': deadline}
+        return func
+    return decorator
+
+
+def _in_scope(name: str, domain: str) -> bool:
+    return name == domain or name.endswith(f".{domain}")
+
+
+@register_source('dnsdumpster', deadline=90)
+async def dns_dumpster(client: httpx.AsyncClient, domain: str, retries: int = 3, silent: bool = False) -> Set[str]:
+    """Enumerate subdomains using DNS Dumpster with retry logic."""
+    subdomains: Set[str] = set()
+    url = 'https://dnsdumpster.com/'
+    for attempt in range(retries):
+        try:
+            res = await client.get(url)
+            res.raise_for_status()
+            soup = BeautifulSoup(res.text, 'html.parser')
+            csrf_input = soup.find('input', {'name': 'csrfmiddlewaretoken'}) or soup.find('input', {'name': '__csrf_token'})
+            csrf_token = csrf_input.get('value') if csrf_input else None
+            if not csrf_token:
+                if not silent and attempt == retries - 1:
+                    logger.warning(colored("CSRF token not found on DNS Dumpster after retries", "yellow"))
+                continue
+
+            data = {
+                'csrfmiddlewaretoken': csrf_token,
+                'targetip': domain,
+                'user': 'free'
+            }
+            res = await client.post(url, data=data, headers={'Referer': url})
+            res.raise_for_status()
+            soup = BeautifulSoup(res.text, 'html.parser')
+
+            for td in soup.find_all('td', class_='col-md-4') or soup.find_all('td', {'data-label': 'Domain'}):
+                subdomain = td.text.strip().split('\n')[0]
+                if _in_scope(subdomain, domain):
+                    subdomains.add(subdomain)
+            break
+        except httpx.HTTPError as e:
+            if not silent and attempt == retries - 1:
+                logger.error(colored(f"DNS Dumpster request failed after {retries} attempts: {e}", "red"))
+            await asyncio.sleep(2 ** attempt)
+        except Exception as e:
+            if not silent and attempt == retries - 1:
+                logger.error(colored(f"DNS Dumpster parsing error after {retries} attempts: {e}", "red"))
+            await asyncio.sleep(2 ** attempt)
+    return subdomains
+
+
+@register_source('crtsh', deadline=120)
+async def cert_transparency(client: httpx.AsyncClient, domain: str, retries: int = 3, silent: bool = False) -> Set[str]:
+    """Fetch subdomains from certificate transparency logs (crt.sh) with retry."""
+    subdomains: Set[str] = set()
+    url = f"https://crt.sh/?q={domain}&output=json"
+    for attempt in range(retries):
+        try:
+            res = await client.get(url)
+            res.raise_for_status()
+            for entry in res.json():
+                name = entry.get('name_value', '').strip()
+                for line in name.split('\n'):
+                    line = line.strip().lower()
+                    if _in_scope(line, domain) and not line.startswith('*'):
+                        subdomains.add(line)
+            break
+        except httpx.TimeoutException:
+            if not silent and attempt == retries - 1:
+                logger.error(colored(f"crt.sh timed out after {retries} attempts", "red"))
+            await asyncio.sleep(2 ** attempt)
+        except httpx.HTTPError as e:
+            if not silent and attempt == retries - 1:
+                logger.error(colored(f"crt.sh request failed after {retries} attempts: {e}", "red"))
+            await asyncio.sleep(2 ** attempt)
+        except ValueError as e:
+            if not silent and attempt == retries - 1:
+                logger.error(colored(f"crt.sh JSON parsing error after {retries} attempts: {e}", "red"))
+            await asyncio.sleep(2 ** attempt)
+    return subdomains
+
+
+async def run_passive_sources(
+    domain: str,
+    timeout: int = 30,
+    retries: int = 3,
+    sources: List[str] = None,
+    deadlines: Dict[str, float] = None,
+    silent: bool = False,
+) -> Dict[str, Set[str]]:
+    """Run the selected passive sources concurrently.
+
+    Returns a mapping of source name to the subdomains it reported; a source
+    that errors or overruns its deadline contributes an empty set.
+    """
+    selected = sources or list(PASSIVE_SOURCES)
+    deadlines = deadlines or {}
+
+    async with create_client(len(selected), timeout=timeout, headers=DEFAULT_HEADERS, follow_redirects=True) as client:
+        async def run_source(name: str) -> Set[str]:
+            entry = PASSIVE_SOURCES.get(name)
+            if entry is None:
+                if not silent:
+                    logger.warning(colored(f"Unknown passive source: {name}", "yellow"))
+                return set()
+            deadline = deadlines.get(name, entry['deadline'])
+            if not silent:
+                logger.info(colored(f"Querying {name}...", "green"))
+            try:
+                found = await asyncio.wait_for(entry['func'](client, domain, retries=retries, silent=silent), deadline)
+            except asyncio.TimeoutError:
+                if not silent:
+                    logger.warning(colored(f"{name} exceeded its {deadline}s deadline, skipping", "yellow"))
+                return set()
+            except Exception as e:
+                if not silent:
+                    logger.error(colored(f"Unexpected {name} error: {e}", "red"))
+                return set()
+            if not silent:
+                logger.info(colored(f"Found {len(found)} subdomains via {name}", "green"))
+            return found
+
+        results = await asyncio.gather(*[run_source(name) for name in selected])
+    return dict(zip(selected, results))
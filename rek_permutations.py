@@ -0,0 +1,182 @@
+"""
+REK Subdomain Permutations
+In-process replacement for the dnsgen/goaltdns/gotator/ripgen chain. Known
+subdomains are split into tokens, permutations are generated lazily and
+deduplicated through a Bloom filter, and candidates stream straight into the
+async resolver through a bounded queue, so neither the permutation list nor
+its output files ever exist in full.
+"""
+import asyncio
+import hashlib
+import math
+import re
+from typing import Iterable, Iterator, List, Set, TextIO
+
+from rek_dns import AsyncDNSResolver, WildcardDetector
+import logging
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_SPLIT = re.compile(r'[.\-]')
+_NUMBER = re.compile(r'\d+')
+
+
+def extract_tokens(hostnames: Iterable[str], domain: str = None) -> Set[str]:
+    """Split hostnames on dots and hyphens into permutation tokens.
+
+    The labels of `domain` itself are left out so every candidate stays
+    inside the target zone.
+    """
+    excluded = set(domain.split('.')) if domain else set()
+    tokens = set()
+    for hostname in hostnames:
+        for part in _TOKEN_SPLIT.split(hostname.lower()):
+            if part and part not in excluded:
+                tokens.add(part)
+    return tokens
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> bool:
+        """Add `item`; returns False if it was (probably) already present."""
+        new = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                new = True
+        return new
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def _label_variants(label: str, tokens: List[str], numbers: int) -> Iterator[str]:
+    """Variants of one label: token joins, hyphen-part swaps and number shifts."""
+    for token in tokens:
+        yield f"{token}-{label}"
+        yield f"{label}-{token}"
+        yield f"{token}{label}"
+        yield f"{label}{token}"
+    parts = label.split('-')
+    if len(parts) > 1:
+        for i in range(len(parts)):
+            for token in tokens:
+                if token != parts[i]:
+                    yield '-'.join(parts[:i] + [token] + parts[i + 1:])
+    for match in _NUMBER.finditer(label):
+        value = int(match.group())
+        for delta in range(-numbers, numbers + 1):
+            if delta and value + delta >= 0:
+                yield f"{label[:match.start()]}{value + delta}{label[match.end():]}"
+
+
+def iter_permutations(hostnames: Iterable[str], tokens: Iterable[str], domain: str, numbers: int = 1) -> Iterator[str]:
+    """Lazily yield permutations of `hostnames` under `domain`.
+
+    Patterns follow dnsgen/gotator/ripgen at depth 1: a token inserted as a
+    new label at every position, each label joined with or replaced by a
+    token, hyphen-separated parts swapped for tokens, and numbers shifted by
+    up to `numbers`. Candidates are not deduplicated here.
+    """
+    tokens = sorted(tokens)
+    suffix = f".{domain}"
+    for hostname in hostnames:
+        hostname = hostname.lower().rstrip('.')
+        if not hostname.endswith(suffix):
+            continue
+        labels = hostname[:-len(suffix)].split('.')
+        for i in range(len(labels) + 1):
+            for token in tokens:
+                yield '.'.join(labels[:i] + [token] + labels[i:]) + suffix
+        for i, label in enumerate(labels):
+            head, tail = labels[:i], labels[i + 1:]
+            for token in tokens:
+                if token != label:
+                    yield '.'.join(head + [token] + tail) + suffix
+            for variant in _label_variants(label, tokens, numbers):
+                yield '.'.join(head + [variant] + tail) + suffix
+
+
+def unique_permutations(hostnames: List[str], domain: str, tokens: Iterable[str] = None, numbers: int = 1,
+                        error_rate: float = 0.001) -> Iterator[str]:
+    """Deduplicated permutations; known hostnames are never yielded.
+
+    The Bloom filter is sized from the number of candidates the patterns can
+    produce, so a false positive (a skipped candidate) stays near
+    `error_rate` without holding every candidate string in memory.
+    """
+    tokens = sorted(tokens if tokens is not None else extract_tokens(hostnames, domain))
+    labels = sum(len(h.split('.')) for h in hostnames)
+    seen = BloomFilter(capacity=(labels * 8 + len(hostnames)) * max(len(tokens), 1), error_rate=error_rate)
+    for hostname in hostnames:
+        seen.add(hostname.lower().rstrip('.'))
+    for candidate in iter_permutations(hostnames, tokens, domain, numbers):
+        if seen.add(candidate):
+            yield candidate
+
+
+async def resolve_permutations(
+    domain: str,
+    candidates: Iterable[str],
+    resolver: AsyncDNSResolver,
+    output: TextIO = None,
+    silent: bool = False,
+) -> List[str]:
+    """Resolve streamed candidates, dropping wildcard hits.
+
+    Candidates are pulled into a bounded queue served by
+    `resolver.max_in_flight` workers. Resolved names are written to `output`
+    as they are found and returned.
+    """
+    wildcards = WildcardDetector(resolver)
+    workers = max(1, resolver.max_in_flight)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    found: List[str] = []
+
+    async def worker():
+        while True:
+            name = await queue.get()
+            try:
+                if name is None:
+                    return
+                result = await resolver.query(name, 'A')
+                if result['answers'] and not await wildcards.is_wildcard(name, result, domain):
+                    found.append(name)
+                    if output is not None:
+                        output.write(f"{name}\n")
+                        output.flush()
+            except Exception as e:
+                if not silent:
+                    logger.error(f"Permutation worker error for {name}: {e}")
+            finally:
+                queue.task_done()
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        for name in candidates:
+            await queue.put(name)
+        for _ in tasks:
+            await queue.put(None)
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        if resolver.cache is not None:
+            resolver.cache.flush()
+    return found
@@ -0,0 +1,192 @@
+"""
+REK Result Writers
+Incremental sinks for HTTP status results. Rows are written and flushed as
+each probe completes, so an interrupted run keeps everything checked so far,
+and the final ordering is produced by an external merge sort whose memory use
+is bounded by the run size rather than the number of hosts.
+
+Completed hosts are also appended to a journal next to the output, whose
+header records the input it belongs to, so an interrupted run can be resumed
+with --resume.
+"""
+import csv
+import heapq
+import itertools
+import json
+import os
+import tempfile
+from operator import itemgetter
+from typing import Dict, List
+import logging
+
+from rek_hostset import HostnameSet
+
+logger = logging.getLogger(__name__)
+
+HTTP_RESULT_COLUMNS = ["Subdomain", "URL", "Status Code", "Title", "Server", "Error"]
+HTTP_RESULT_KEYS = ['subdomain', 'url', 'status_code', 'title', 'server', 'error']
+
+# Dialect shared by the writer and the external sort so rows round-trip.
+CSV_FORMAT = {'quoting': csv.QUOTE_MINIMAL, 'escapechar': '\\'}
+
+
+def jsonl_path(path: str) -> str:
+    """JSONL sink stored next to a CSV output (http_results.csv -> http_results.jsonl)."""
+    return os.path.splitext(path)[0] + '.jsonl'
+
+
+class HTTPResultWriter:
+    """Streams result dicts to a CSV file and, optionally, a JSONL file.
+
+    Both files are flushed after every row.
+    """
+
+    def __init__(self, csv_file: str, jsonl_file: str = None, append: bool = False):
+        self.csv_file = csv_file
+        self.jsonl_file = jsonl_file
+        self.count = 0
+        for path in (csv_file, jsonl_file):
+            directory = os.path.dirname(path) if path else ''
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        mode = 'a' if append else 'w'
+        has_header = append and os.path.exists(csv_file) and os.path.getsize(csv_file) > 0
+        self._csv = open(csv_file, mode, newline='', encoding='utf-8')
+        self._writer = csv.writer(self._csv, **CSV_FORMAT)
+        if not has_header:
+            self._writer.writerow(HTTP_RESULT_COLUMNS)
+            self._csv.flush()
+        self._jsonl = open(jsonl_file, mode, encoding='utf-8') if jsonl_file else None
+
+    def write(self, result: Dict):
+        self._writer.writerow([
+            result['subdomain'] or '',
+            result['url'] or '',
+            result['status_code'] if result['status_code'] is not None else '',
+            result['title'] or '',
+            result['server'] or '',
+            result['error'] or ''
+        ])
+        self._csv.flush()
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps({key: result.get(key) for key in HTTP_RESULT_KEYS}) + '\n')
+            self._jsonl.flush()
+        self.count += 1
+
+    def close(self):
+        self._csv.close()
+        if self._jsonl is not None:
+            self._jsonl.close()
+
+    def __enter__(self) -> 'HTTPResultWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ProbeJournal:
+    """Append-only journal of hosts whose results are already written.
+
+    The journal lives at `<output>.journal`: a header line recording the
+    input file (`# resume_from=<path>`), then one host per line. With
+    `resume=True` and a journal for the same input, its hosts are loaded and
+    can be skipped; otherwise it starts empty. Each output has its own
+    journal, so concurrent runs never share resume state.
+    """
+
+    HEADER = '# resume_from='
+
+    def __init__(self, output_file: str, input_file: str = None, resume: bool = False):
+        self.path = f"{output_file}.journal"
+        self.input_file = os.path.abspath(input_file) if input_file else ''
+        self.done = HostnameSet()
+        if resume and os.path.exists(output_file):
+            self._load()
+        self.resumed = len(self.done) > 0
+        if self.resumed:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._file.write(f"{self.HEADER}{self.input_file}\n")
+            self._file.flush()
+
+    def _load(self):
+        """Load the journaled hosts if the journal belongs to this input."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = f.readline().rstrip('\n')
+                if header != f"{self.HEADER}{self.input_file}":
+                    return
+                self.done.update(line for line in f if line.strip())
+        except OSError:
+            pass
+
+    def __contains__(self, host: str) -> bool:
+        return host in self.done
+
+    def __len__(self) -> int:
+        return len(self.done)
+
+    def record(self, host: str):
+        """Mark `host` as done; call after its results have been written."""
+        self._file.write(f"{host}\n")
+        self._file.flush()
+        self.done.add(host)
+
+    def close(self):
+        """Close the journal, keeping it for a later --resume."""
+        self._file.close()
+
+    def finish(self):
+        """The run completed: drop the journal."""
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _write_run(rows: List[List[str]], directory: str):
+    run = tempfile.TemporaryFile('w+', newline='', encoding='utf-8', dir=directory or None)
+    csv.writer(run, **CSV_FORMAT).writerows(rows)
+    run.seek(0)
+    return run
+
+
+def external_sort_csv(path: str, key_column: str = "Subdomain", run_rows: int = 50000) -> int:
+    """Sort a CSV file in place by `key_column`, keeping its header row.
+
+    Rows are sorted in runs of `run_rows`, spilled to temporary files and
+    merged with `heapq.merge`. The sort is stable, so rows with equal keys
+    keep the order they were written in. Returns the number of data rows.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    runs = []
+    count = 0
+    try:
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f, **CSV_FORMAT)
+            header = next(reader, None)
+            if header is None:
+                return 0
+            key = itemgetter(header.index(key_column))
+            while True:
+                rows = list(itertools.islice(reader, run_rows))
+                if not rows:
+                    break
+                rows.sort(key=key)
+                runs.append(_write_run(rows, directory))
+
+        sorted_path = f"{path}.sorting"
+        with open(sorted_path, 'w', newline='', encoding='utf-8') as out:
+            writer = csv.writer(out, **CSV_FORMAT)
+            writer.writerow(header)
+            for row in heapq.merge(*(csv.reader(run, **CSV_FORMAT) for run in runs), key=key):
+                writer.writerow(row)
+                count += 1
+        os.replace(sorted_path, path)
+    finally:
+        for run in runs:
+            run.close()
+    return count
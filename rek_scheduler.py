@@ -0,0 +1,223 @@
+"""
+REK Host Scheduler
+Per-host politeness for the HTTP modules. Requests are submitted to one
+HostScheduler that caps in-flight requests per host, optionally spaces them
+out with a per-host rate limit, and adapts each host's cap with AIMD: the cap
+is halved when a host answers 429/503 or times out and grows back by about
+one request per round of healthy responses.
+
+The global concurrency cap is only taken once a host slot is free, so a busy
+or throttled host never holds capacity that other hosts could use.
+"""
+import asyncio
+import contextlib
+import time
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "slow down".
+BACKOFF_STATUSES = (429, 503)
+# Upper bound on how long a Retry-After header may pause a host (seconds).
+MAX_RETRY_AFTER = 60.0
+# Near the cap a host last pushed back at, growth slows to one request per
+# this many rounds of healthy responses.
+PROBE_ROUNDS = 10
+
+
+def host_key(url: str) -> str:
+    """Scheduling key for a URL or bare host: the lower-cased host[:port]."""
+    parsed = urlparse(url if '://' in url else f"//{url}")
+    return (parsed.netloc or url).lower()
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a numeric Retry-After header, capped at MAX_RETRY_AFTER."""
+    try:
+        return min(max(float(response.headers.get('retry-after')), 0.0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return None
+
+
+class _HostState:
+    __slots__ = ('limit', 'ceiling', 'in_flight', 'waiting', 'users', 'condition', 'next_send', 'paused_until',
+                 'last_decrease')
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        # Cap at which the host last answered 429/503 or timed out.
+        self.ceiling = float('inf')
+        self.in_flight = 0
+        self.waiting = 0
+        # Slots that hold this state, from lookup to release; the host entry
+        # is only forgotten when this drops to zero.
+        self.users = 0
+        self.condition = asyncio.Condition()
+        self.next_send = 0.0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+
+
+class HostSlot:
+    """A granted request slot; report the response with `record`."""
+
+    def __init__(self, scheduler: 'HostScheduler', state: _HostState):
+        self._scheduler = scheduler
+        self._state = state
+        self.started = 0.0
+        self.recorded = False
+
+    def record(self, response: httpx.Response = None, timed_out: bool = False):
+        if not self.recorded:
+            self.recorded = True
+            self._scheduler._record(self._state, self.started, response, timed_out)
+
+
+class HostScheduler:
+    """Per-host concurrency caps, rate limits and AIMD backoff.
+
+    `per_host` is the most requests in flight to one host, `rate` the most
+    requests per second sent to one host (0 disables it) and
+    `max_concurrent` the total in flight across all hosts.
+    """
+
+    def __init__(self, max_concurrent: int = 100, per_host: int = 10, rate: float = 0.0,
+                 min_per_host: int = 1, backoff_delay: float = 1.0):
+        self.max_concurrent = max(1, max_concurrent)
+        self.per_host = max(1, per_host)
+        self.rate = max(0.0, rate or 0.0)
+        self.min_per_host = max(1, min(min_per_host, self.per_host))
+        self.backoff_delay = backoff_delay
+        self.requests = 0
+        self.throttled = 0
+        self.timeouts = 0
+        self.decreases = 0
+        self._global = asyncio.Semaphore(self.max_concurrent)
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        """The host's state, referenced by the caller until `_forget`.
+
+        The reference is taken before any await, so the entry cannot be
+        evicted between the lookup and `_acquire`.
+        """
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(float(self.per_host))
+        state.users += 1
+        return state
+
+    def _forget(self, host: str, state: _HostState):
+        """Drop the caller's reference, and the host entry once it is idle."""
+        state.users -= 1
+        # Forget idle hosts with nothing to remember so a 200k-host run
+        # does not keep a state object per host.
+        if (state.users == 0 and state.limit >= self.per_host
+                and max(state.paused_until, state.next_send) <= time.monotonic()):
+            if self._hosts.get(host) is state:
+                del self._hosts[host]
+
+    def _delay(self, state: _HostState) -> float:
+        """Reserve the host's next send time and return how long to wait for it."""
+        now = time.monotonic()
+        start = max(now, state.paused_until)
+        if self.rate:
+            start = max(start, state.next_send)
+            state.next_send = start + 1.0 / self.rate
+        return start - now
+
+    async def _acquire(self, state: _HostState):
+        async with state.condition:
+            state.waiting += 1
+            try:
+                await state.condition.wait_for(lambda: state.in_flight < int(state.limit))
+            finally:
+                state.waiting -= 1
+            state.in_flight += 1
+
+    async def _release(self, host: str, state: _HostState):
+        try:
+            async with state.condition:
+                state.in_flight -= 1
+                state.condition.notify(max(1, int(state.limit) - state.in_flight))
+        finally:
+            self._forget(host, state)
+
+    def _record(self, state: _HostState, started: float, response: Optional[httpx.Response], timed_out: bool):
+        self.requests += 1
+        status = response.status_code if response is not None else None
+        if not timed_out and status not in BACKOFF_STATUSES:
+            # Additive increase: about +1 per round of `limit` healthy
+            # responses, slowing down just below the last failing cap.
+            step = 1.0 / state.limit
+            if state.limit + 1 >= state.ceiling:
+                step /= PROBE_ROUNDS
+            state.limit = min(float(self.per_host), state.limit + step)
+            return
+        now = time.monotonic()
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.throttled += 1
+            pause = retry_after(response) or self.backoff_delay
+            state.paused_until = max(state.paused_until, now + pause)
+        # Multiplicative decrease. Requests sent before the last decrease
+        # report the same congestion, so they do not cut the cap again.
+        if started >= state.last_decrease:
+            state.ceiling = state.limit
+            state.limit = max(float(self.min_per_host), state.limit / 2)
+            state.last_decrease = now
+            self.decreases += 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[HostSlot]:
+        """Hold one request slot for the host of `url`.
+
+        Timeouts raised inside the block are recorded automatically; other
+        outcomes are reported with `HostSlot.record(response)`.
+        """
+        host = host_key(url)
+        state = self._state(host)
+        try:
+            await self._acquire(state)
+        except BaseException:
+            self._forget(host, state)
+            raise
+        slot = HostSlot(self, state)
+        try:
+            delay = self._delay(state)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with self._global:
+                slot.started = time.monotonic()
+                yield slot
+        except httpx.TimeoutException:
+            slot.record(timed_out=True)
+            raise
+        finally:
+            await self._release(host, state)
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send one request through the scheduler and record its outcome."""
+        async with self.slot(url) as slot:
+            response = await client.request(method, url, **kwargs)
+            slot.record(response)
+            return response
+
+    def stats(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'timeouts': self.timeouts,
+            'decreases': self.decreases,
+            'backed_off_hosts': sum(1 for s in self._hosts.values() if s.limit < self.per_host),
+        }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        return (f"{stats['requests']} requests, {stats['throttled']} throttled, "
+                f"{stats['timeouts']} timeouts, {stats['backed_off_hosts']} hosts backed off")
@@ -0,0 +1,155 @@
+"""
+REK Screenshot Pool
+Headless Chrome screenshots taken off the event loop. Captures are queued
+and served by a pool of worker threads, each driving its own browser, so
+directory brute forcing runs at network speed while screenshots trail
+behind. Pages are deduplicated by final URL and by body hash: a page already
+captured (or queued) is not captured again and its result shares the
+existing screenshot.
+"""
+import asyncio
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from urllib.parse import urlparse
+import logging
+
+from termcolor import colored
+
+logger = logging.getLogger(__name__)
+
+NOT_INITIALIZED = "Selenium not initialized"
+
+
+def screenshot_path(url: str, domain: str) -> str:
+    """results/<domain>/screenshots/<url made filename-safe>.png"""
+    safe_filename = re.sub(r'[^\w\-._]', '_', url)
+    safe_filename = safe_filename.replace('http_', 'http')
+    safe_filename = safe_filename[:200] + '.png'
+    return os.path.join(f"results/{domain}/screenshots", safe_filename)
+
+
+class ScreenshotPool:
+    """Queue of screenshots served by `workers` headless Chrome instances.
+
+    `submit` returns immediately; the `screenshot` key of the submitted
+    result dict is filled in when the capture finishes. `close` waits for
+    the queue to drain and quits the browsers.
+    """
+
+    def __init__(self, workers: int = 2, silent: bool = False, page_wait: float = 1.0):
+        self.workers = max(1, workers)
+        self.silent = silent
+        self.page_wait = page_wait
+        self.captured = 0
+        self.deduplicated = 0
+        self.disabled = False
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='screenshot')
+        self._local = threading.local()
+        self._drivers: List = []
+        self._lock = threading.Lock()
+        self._by_url: Dict[str, asyncio.Future] = {}
+        self._by_hash: Dict[str, asyncio.Future] = {}
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def _driver(self):
+        """This thread's browser, started on first use."""
+        driver = getattr(self._local, 'driver', None)
+        if driver is None:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            chrome_options = Options()
+            chrome_options.add_argument('--headless')
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            driver = self._local.driver = webdriver.Chrome(options=chrome_options)
+            driver.set_window_size(1920, 1080)
+            with self._lock:
+                self._drivers.append(driver)
+            if not self.silent:
+                logger.info(colored("Initialized Selenium WebDriver", "green"))
+        return driver
+
+    def _capture(self, url: str, path: str) -> str:
+        """Load `url` and save it to `path` (runs in a pool thread)."""
+        try:
+            driver = self._driver()
+        except Exception as e:
+            if not self.silent:
+                logger.error(colored(f"Error initializing Selenium WebDriver: {e}", "red"))
+            self.disabled = True
+            return NOT_INITIALIZED
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            driver.get(url)
+            time.sleep(self.page_wait)
+            driver.save_screenshot(path)
+            if not self.silent:
+                logger.info(colored(f"Screenshot saved: {path}", "green"))
+            return path
+        except Exception as e:
+            if not self.silent:
+                logger.error(colored(f"Error taking screenshot for {url}: {e}", "red"))
+            return f"Error: {str(e)}"
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            url, path, future = await self._queue.get()
+            try:
+                if self.disabled:
+                    outcome = NOT_INITIALIZED
+                else:
+                    outcome = await loop.run_in_executor(self._executor, self._capture, url, path)
+                    if outcome == path:
+                        self.captured += 1
+                future.set_result(outcome)
+            except Exception as e:
+                if not future.done():
+                    future.set_result(f"Error: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, result: Dict, final_url: str = None, content_hash: str = None):
+        """Queue a screenshot of `result['url']` unless the same page is already queued."""
+        url = result['url']
+        final_url = final_url or url
+        future = self._by_url.get(final_url) or (self._by_hash.get(content_hash) if content_hash else None)
+        if future is not None:
+            self.deduplicated += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._queue.put_nowait((url, screenshot_path(url, urlparse(url).netloc), future))
+        self._by_url.setdefault(final_url, future)
+        if content_hash:
+            self._by_hash.setdefault(content_hash, future)
+        future.add_done_callback(lambda f: result.__setitem__('screenshot', f.result()))
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def close(self):
+        """Wait for queued screenshots, then stop the workers and browsers."""
+        if self._queue.qsize() and not self.silent:
+            logger.info(colored(f"Waiting for {self._queue.qsize()} queued screenshots", "green"))
+        try:
+            await self._queue.join()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            for driver in self._drivers:
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, driver.quit)
+                except Exception:
+                    pass
+            self._executor.shutdown(wait=False)
+            if self._drivers and not self.silent:
+                logger.info(colored("Closed Selenium WebDriver", "green"))
+
+    def summary(self) -> str:
+        return f"{self.captured} screenshots, {self.deduplicated} duplicates skipped"
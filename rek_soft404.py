@@ -0,0 +1,142 @@
+"""
+REK Soft-404 Detection
+Calibrates directory brute forcing against catch-all servers. Before a
+directory's wordlist is requested, a few random paths that cannot exist are
+fetched under it; their responses become the directory's "not found"
+baseline. A wordlist hit whose response matches the baseline (same status
+and redirect target, a length within LENGTH_TOLERANCE, and the same word
+count or a near-identical body simhash) is a soft 404: it is suppressed and
+never recursed into.
+
+The requested URL and its path, when echoed back in the body or the Location
+header, are masked before fingerprinting, so "/foo not found" and "/bar not
+found" look the same; so is the echo with a trailing slash, the usual
+catch-all redirect or canonical link from /foo to /foo/. Only those echoes are masked; the bare word is left
+alone, since short words like "app" also occur naturally in the page.
+"""
+import asyncio
+import random
+import re
+import string
+from typing import Dict, List
+from urllib.parse import unquote, urlparse
+import logging
+
+import httpx
+
+from rek_cluster import MAX_DISTANCE, SAMPLE_BYTES, hamming, simhash
+from rek_parse import parse_body
+from rek_scheduler import HostScheduler
+
+logger = logging.getLogger(__name__)
+
+# Random path shapes requested per directory: plain, with an extension and
+# dotfile, since servers often route these three differently.
+PROBE_TEMPLATES = ('{}', '{}.php', '.{}')
+# Bodies whose lengths differ by at most this fraction count as the same size.
+LENGTH_TOLERANCE = 0.05
+
+
+def random_token(length: int = 12) -> str:
+    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+
+
+def echo_pattern(url: str, binary: bool = False):
+    """Regex for `url` echoed back whole: the URL or its path (raw or decoded), optionally with a
+    trailing slash, but not as part of a longer path."""
+    path = urlparse(url).path
+    forms = sorted({form for form in (url, path, unquote(path)) if len(form) > 1}, key=len, reverse=True)
+    if not forms:
+        return None
+    pattern = r'(?<![\w.-])(?:' + '|'.join(re.escape(form) for form in forms) + r')/?(?![\w/-]|\.\w)'
+    return re.compile(pattern.encode() if binary else pattern)
+
+
+def _mask(text, pattern):
+    return pattern.sub(text[:0], text) if pattern is not None else text
+
+
+def _body_features(text: str) -> Dict:
+    return {'words': len(text.split()), 'simhash': simhash(text)}
+
+
+async def response_fingerprint(response: httpx.Response, url: str) -> Dict:
+    """Status, redirect target, length, word count and simhash of a read response, with echoes of `url` masked."""
+    body = _mask(response.content, echo_pattern(url, binary=True))
+    features = await parse_body(_body_features, body[:SAMPLE_BYTES], response.encoding or 'utf-8')
+    return {
+        'status': response.status_code,
+        'location': _mask(response.headers.get('location', ''), echo_pattern(url)),
+        'length': len(body),
+        'words': features['words'],
+        'simhash': features['simhash'],
+    }
+
+
+def matches(fingerprint: Dict, baseline: Dict) -> bool:
+    """Whether `fingerprint` looks like the not-found response `baseline`."""
+    if fingerprint['status'] != baseline['status']:
+        return False
+    if fingerprint['location'] or baseline['location']:
+        return fingerprint['location'] == baseline['location']
+    # A size match alone is too weak: real pages of a fixed-size template
+    # share it. The body has to agree as well.
+    if abs(fingerprint['length'] - baseline['length']) > LENGTH_TOLERANCE * max(baseline['length'], 1):
+        return False
+    return (fingerprint['words'] == baseline['words']
+            or hamming(fingerprint['simhash'], baseline['simhash']) <= MAX_DISTANCE)
+
+
+class SoftNotFoundDetector:
+    """Per-directory not-found baselines shared by one scan.
+
+    Baselines are computed once per directory URL; concurrent callers wait
+    for the same calibration.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, scheduler: HostScheduler, silent: bool = False):
+        self.client = client
+        self.scheduler = scheduler
+        self.silent = silent
+        self.suppressed = 0
+        self.calibrations = 0
+        self._baselines: Dict[str, asyncio.Task] = {}
+
+    async def _calibrate(self, directory: str) -> List[Dict]:
+        self.calibrations += 1
+        baselines = []
+        for template in PROBE_TEMPLATES:
+            url = f"{directory.rstrip('/')}/{template.format(random_token())}"
+            try:
+                response = await self.scheduler.request(self.client, 'GET', url)
+                baselines.append(await response_fingerprint(response, url))
+            except Exception as e:
+                logger.debug(f"Calibration request under {directory} failed: {e}")
+        # A real 404 baseline can never match a reported hit.
+        return [b for b in baselines if b['status'] != 404]
+
+    async def baseline(self, directory: str) -> List[Dict]:
+        """Not-found fingerprints for `directory` (empty when it answers real 404s)."""
+        task = self._baselines.get(directory)
+        if task is None:
+            task = self._baselines[directory] = asyncio.ensure_future(self._calibrate(directory))
+        return await asyncio.shield(task)
+
+    async def is_soft_404(self, directory: str, response: httpx.Response, path: str) -> bool:
+        """Whether a response for `path` under `directory` matches its baseline; counts suppressions."""
+        baselines = await self.baseline(directory)
+        if not baselines:
+            return False
+        fingerprint = await response_fingerprint(response, f"{directory.rstrip('/')}/{path.lstrip('/')}")
+        if any(matches(fingerprint, baseline) for baseline in baselines):
+            self.suppressed += 1
+            return True
+        return False
+
+    def catch_all_directories(self) -> int:
+        return sum(1 for task in self._baselines.values() if task.done() and not task.cancelled()
+                   and not task.exception() and task.result())
+
+    def summary(self) -> str:
+        return (f"{self.suppressed} soft-404 hits suppressed, {self.catch_all_directories()} catch-all "
+                f"directories out of {self.calibrations} calibrated")
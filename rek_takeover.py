@@ -4,14 +4,15 @@ Checks subdomains for dangling CNAME records pointing to unclaimed cloud service
 Covers: GitHub Pages, Heroku, S3, Azure, Shopify, Fastly, Tumblr, WordPress, Pantheon, etc.
 """
 import asyncio
-import dns.resolver
-import dns.exception
 import httpx
 import csv
 import os
 import json
 from typing import List, Dict, Optional
 from termcolor import colored
+from rek_dns import AsyncDNSResolver, host_records_path, load_host_records
+from rek_dns_cache import DNS_CACHE_FILE, open_cache
+from rek_http import CACHEABLE, create_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -86,27 +87,36 @@ TAKEOVER_FINGERPRINTS = {
 }
 
 class TakeoverDetector:
-    def __init__(self, timeout: int = 10, concurrency: int = 50, silent: bool = False):
+    def __init__(self, timeout: int = 10, concurrency: int = 50, silent: bool = False,
+                 dns_cache_file: str = DNS_CACHE_FILE):
         self.timeout = timeout
         self.concurrency = concurrency
         self.silent = silent
+        self.dns_cache_file = dns_cache_file
         self.findings: List[Dict] = []
+        self.resolver: Optional[AsyncDNSResolver] = None
+        # Host records from the subdomain scan (name -> A/AAAA/CNAME record);
+        # hosts missing here are resolved on demand.
+        self.host_records: Dict[str, Dict] = {}
 
-    def get_cname(self, hostname: str) -> Optional[str]:
-        """Get CNAME record for a hostname."""
-        try:
-            resolver = dns.resolver.Resolver()
-            resolver.nameservers = ['8.8.8.8', '1.1.1.1']
-            resolver.timeout = 5
-            resolver.lifetime = 5
-            answers = resolver.resolve(hostname, 'CNAME')
-            for rdata in answers:
-                return str(rdata.target).rstrip('.')
-        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout):
-            pass
-        except Exception:
-            pass
-        return None
+    async def get_record(self, hostname: str) -> Dict:
+        """Return the host record for `hostname`, resolving it if not known yet."""
+        record = self.host_records.get(hostname)
+        if record is None:
+            if self.resolver is None:
+                self.resolver = AsyncDNSResolver.from_files(
+                    max_in_flight=max(self.concurrency, 100),
+                    query_timeout=5,
+                    cache=open_cache(self.dns_cache_file)
+                )
+            record = await self.resolver.resolve_host(hostname)
+            self.host_records[hostname] = record
+        return record
+
+    async def get_cname(self, hostname: str) -> Optional[str]:
+        """Get the first CNAME target for a hostname."""
+        record = await self.get_record(hostname)
+        return record['cnames'][0] if record['cnames'] else None
 
     def match_service(self, cname: str) -> Optional[tuple]:
         """Match a CNAME against known takeover-vulnerable services."""
@@ -123,7 +133,7 @@ class TakeoverDetector:
         if not fingerprint:
             return True  # No body check needed, CNAME match is sufficient
         try:
-            r = await client.get(url, timeout=self.timeout, follow_redirects=True)
+            r = await client.get(url, timeout=self.timeout, follow_redirects=True, extensions=CACHEABLE)
             return fingerprint.lower() in r.text.lower()
         except Exception:
             return False
@@ -131,11 +141,17 @@ class TakeoverDetector:
     async def check_subdomain(self, client: httpx.AsyncClient, subdomain: str, semaphore: asyncio.Semaphore) -> Optional[Dict]:
         """Check a single subdomain for takeover vulnerability."""
         async with semaphore:
-            cname = self.get_cname(subdomain)
-            if not cname:
+            record = await self.get_record(subdomain)
+            if not record['cnames']:
                 return None
 
-            match = self.match_service(cname)
+            # Any hop of the chain can point at the unclaimed service.
+            cname, match = None, None
+            for hop in record['cnames']:
+                match = self.match_service(hop)
+                if match:
+                    cname = hop
+                    break
             if not match:
                 return None
 
@@ -179,7 +195,7 @@ class TakeoverDetector:
         semaphore = asyncio.Semaphore(self.concurrency)
         findings = []
         headers = {'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'}
-        async with httpx.AsyncClient(verify=False, headers=headers, timeout=self.timeout) as client:
+        async with create_client(self.concurrency, timeout=self.timeout, verify=False, headers=headers, cache=True) as client:
             tasks = [self.check_subdomain(client, sub, semaphore) for sub in subdomains]
             results = await asyncio.gather(*tasks, return_exceptions=True)
             for r in results:
@@ -187,8 +203,18 @@ class TakeoverDetector:
                     findings.append(r)
         return findings
 
-    def run(self, subdomains: List[str] = None, input_file: str = None, output_file: str = 'takeover.csv') -> List[Dict]:
-        """Run takeover detection."""
+    def run(self, subdomains: List[str] = None, input_file: str = None, output_file: str = 'takeover.csv',
+            host_records: Dict[str, Dict] = None) -> List[Dict]:
+        """Run takeover detection.
+
+        Host records passed in (or found next to `input_file`) are used as-is
+        instead of resolving those hosts again.
+        """
+        if host_records:
+            self.host_records.update(host_records)
+        elif input_file:
+            self.host_records.update(load_host_records(host_records_path(input_file)))
+
         if input_file and not subdomains:
             try:
                 with open(input_file) as f:
@@ -216,6 +242,8 @@ class TakeoverDetector:
 
         findings = asyncio.run(self.scan_all(subdomains))
         self.findings = findings
+        if self.resolver is not None and self.resolver.cache is not None:
+            self.resolver.cache.flush()
 
         vuln = [f for f in findings if f.get('status') == 'VULNERABLE']
         if not self.silent:
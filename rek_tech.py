@@ -0,0 +1,36 @@
+"""
+REK Technology Detection
+Wappalyzer matching for pages that were already fetched with the async
+client. The fingerprint ruleset is loaded once per process and reused, and
+`analyze_page` is a plain module-level function so it can run in the
+rek_parse process pool. Matching costs milliseconds even on small pages and
+loading the ruleset about half a second, so both always run off the loop.
+"""
+import functools
+import warnings
+from typing import Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def wappalyzer():
+    """The Wappalyzer instance for this process, built on first use."""
+    from Wappalyzer import Wappalyzer
+    with warnings.catch_warnings():
+        # The bundled ruleset has a few regexes Python cannot compile.
+        warnings.simplefilter('ignore', UserWarning)
+        return Wappalyzer.latest()
+
+
+def analyze_page(html: str, url: str, headers: Dict[str, str]) -> Dict[str, Dict]:
+    """Technologies detected on a page: name -> {'versions': [...], 'categories': [...]}."""
+    from Wappalyzer import WebPage
+    return wappalyzer().analyze_with_versions_and_categories(WebPage(url, html, headers))
+
+
+def warm_ruleset():
+    """Load the ruleset in the calling process ahead of the first page
+    (registered with rek_parse.warm_workers)."""
+    wappalyzer()
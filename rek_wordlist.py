@@ -0,0 +1,136 @@
+"""
+REK Wordlist Loader
+Memory-mapped, deduplicated wordlists shared by every module in a process.
+A wordlist file is indexed once: the offset and length of each distinct,
+stripped, non-empty line are stored in a compact index next to the file
+(<file>.rekidx) and reused until the file changes. Words are then read
+lazily from the mapping, so a 1M-line list costs two small arrays instead
+of a million Python strings, and opening it again for the next target or
+module is a dictionary lookup.
+"""
+import mmap
+import os
+import struct
+import threading
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = '.rekidx'
+_INDEX_MAGIC = b'REKWL001'
+# magic, source size, source mtime_ns, entry count
+_INDEX_HEADER = struct.Struct('<8sQqQ')
+
+_cache: Dict[str, 'Wordlist'] = {}
+_cache_lock = threading.Lock()
+
+
+def _build_index(mm) -> tuple:
+    """Offsets and lengths of the first occurrence of each stripped line."""
+    starts, lengths = array('Q'), array('I')
+    seen = set()
+    pos = 0
+    for raw in iter(mm.readline, b''):
+        word = raw.strip()
+        if word and word not in seen:
+            seen.add(word)
+            starts.append(pos + len(raw) - len(raw.lstrip()))
+            lengths.append(len(word))
+        pos += len(raw)
+    return starts, lengths
+
+
+class Wordlist(Sequence):
+    """Read-only sequence of the distinct words in a wordlist file.
+
+    Iteration and indexing decode words from the memory mapping on demand;
+    slicing returns a list.
+    """
+
+    def __init__(self, path: str, encoding: str = 'utf-8'):
+        self.path = path
+        self.encoding = encoding
+        stat = os.stat(path)
+        self.signature = (stat.st_size, stat.st_mtime_ns)
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        loaded = self._load_index()
+        if loaded is None:
+            loaded = _build_index(self._mm) if stat.st_size else (array('Q'), array('I'))
+            self._save_index(*loaded)
+        self._starts, self._lengths = loaded
+
+    @property
+    def index_path(self) -> str:
+        return self.path + INDEX_SUFFIX
+
+    def _load_index(self) -> Optional[tuple]:
+        try:
+            with open(self.index_path, 'rb') as f:
+                magic, size, mtime_ns, count = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+                if magic != _INDEX_MAGIC or (size, mtime_ns) != self.signature:
+                    return None
+                starts, lengths = array('Q'), array('I')
+                starts.fromfile(f, count)
+                lengths.fromfile(f, count)
+                return starts, lengths
+        except (OSError, EOFError, struct.error):
+            return None
+
+    def _save_index(self, starts: array, lengths: array):
+        """Write the index atomically; an unwritable directory just means no cache."""
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, *self.signature, len(starts)))
+                starts.tofile(f)
+                lengths.tofile(f)
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            logger.debug(f"Could not write wordlist index {self.index_path}: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _word(self, i: int) -> str:
+        start = self._starts[i]
+        return self._mm[start:start + self._lengths[i]].decode(self.encoding, errors='ignore')
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._word(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('wordlist index out of range')
+        return self._word(i)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self._starts)):
+            yield self._word(i)
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+
+def open_wordlist(path: str) -> Wordlist:
+    """The shared Wordlist for `path`, reindexed only when the file has changed.
+
+    Raises OSError if the file cannot be read.
+    """
+    key = os.path.realpath(path)
+    stat = os.stat(key)
+    with _cache_lock:
+        wordlist = _cache.get(key)
+        if wordlist is None or wordlist.signature != (stat.st_size, stat.st_mtime_ns):
+            wordlist = _cache[key] = Wordlist(key)
+        return wordlist
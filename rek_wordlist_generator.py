@@ -21,6 +21,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
 from collections import defaultdict
 from termcolor import colored
+from rek_wordlist import open_wordlist
 
 class REKWordlistGenerator:
     def __init__(self, silent: bool = False, domain: str = None):
@@ -337,18 +338,17 @@ class REKWordlistGenerator:
         """Process a wordlist file and add to appropriate set"""
         try:
             count = 0
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    word = line.strip()
-                    if word and not word.startswith('#') and len(word) > 0:
-                        if wordlist_type == "subdomain":
-                            self.subdomain_wordlist.add(word)
-                        elif wordlist_type == "directory":
-                            self.directory_wordlist.add(word)
-                        
-                        # Add to global wordlist
-                        self.global_wordlist.add(word)
-                        count += 1
+            # Indexed and deduplicated once, then shared with the scanners
+            for word in open_wordlist(str(file_path)):
+                if not word.startswith('#'):
+                    if wordlist_type == "subdomain":
+                        self.subdomain_wordlist.add(word)
+                    elif wordlist_type == "directory":
+                        self.directory_wordlist.add(word)
+                    
+                    # Add to global wordlist
+                    self.global_wordlist.add(word)
+                    count += 1
             
             return count
         except Exception as e: